@@ -0,0 +1,113 @@
+"""
+Compares the time and memory cost of the mutable and frozen color types.
+
+Run from the project root with:
+
+    python benchmarks/frozen_colors.py [count]
+
+The color modules are loaded as plain Python modules, outside of Ren'Py.  Only
+`to_renpy_color` needs Ren'Py, and it is not measured here, so when Ren'Py is
+not importable an empty `renpy` module is put in its place.
+"""
+
+import os
+import sys
+import timeit
+import tracemalloc
+import types
+
+COLOR_PICKER = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    '..', 'game', 'lib', 'fxcpds', 'sprite_customizer', 'color_picker',
+)
+
+sys.path.insert(0, COLOR_PICKER)
+
+try:
+    import renpy  # type: ignore
+except ImportError:
+    sys.modules['renpy'] = types.SimpleNamespace(Color=None)
+
+from fox_color_ren import FoxFrozenRGB, FoxRGB  # noqa: E402
+from palette_ren import FoxPalette  # noqa: E402
+
+
+def time_ns(stmt, number: int) -> float:
+    """Returns the best time per call of `stmt` in nanoseconds."""
+    best = min(timeit.repeat(stmt, number=number, repeat=5))
+    return best / number * 1e9
+
+
+def bytes_each(factory, count: int) -> float:
+    """Returns the memory held per object made by `factory`, in bytes."""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    kept = [factory(i) for i in range(count)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    size = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    # The list holding the objects is not part of their cost.
+    size -= sys.getsizeof(kept)
+
+    return size / count
+
+
+def main(count: int) -> None:
+    # Distinct colors so interning cannot share the measured instances.
+    channels = lambda i: (i % 256, (i // 256) % 256, (i // 65536) % 256)
+
+    FoxFrozenRGB.intern(10, 20, 30)
+
+    palette = FoxPalette(['#%02x%02x%02x' % channels(i * 97) for i in range(64)])
+    entry = palette.entries[7]
+    thawed = entry.thaw()
+
+    rows = [
+        (
+            'FoxRGB(10, 20, 30)',
+            time_ns(lambda: FoxRGB(10, 20, 30), count),
+            bytes_each(lambda i: FoxRGB(*channels(i)), count),
+        ),
+        (
+            'FoxFrozenRGB(10, 20, 30)',
+            time_ns(lambda: FoxFrozenRGB(10, 20, 30), count),
+            bytes_each(lambda i: FoxFrozenRGB(*channels(i)), count),
+        ),
+        (
+            'FoxFrozenRGB.intern(10, 20, 30)',
+            time_ns(lambda: FoxFrozenRGB.intern(10, 20, 30), count),
+            None,
+        ),
+        (
+            'FoxRGB.clone().set_red(...)',
+            time_ns(lambda: thawed.clone().set_red(40), count),
+            None,
+        ),
+        (
+            'FoxFrozenRGB.with_red(...)',
+            time_ns(lambda: entry.with_red(40), count),
+            None,
+        ),
+        (
+            'FoxPalette.nearest(FoxRGB)',
+            time_ns(lambda: palette.nearest(thawed), count),
+            None,
+        ),
+        (
+            'FoxPalette.nearest(interned entry)',
+            time_ns(lambda: palette.nearest(entry), count),
+            None,
+        ),
+    ]
+
+    print('%d iterations per timing, best of 5' % count)
+    print()
+    print('%-36s %10s %12s' % ('', 'ns/call', 'bytes/each'))
+
+    for name, ns, size in rows:
+        print('%-36s %10.0f %12s' % (name, ns, '-' if size is None else '%.0f' % size))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
@@ -1,8 +1,10 @@
-from renpy import At, Fixed, Image, InputValue, Transform  # type: ignore
+from renpy import At, Image, InputValue, Transform  # type: ignore
 import renpy  # type: ignore
 from fox_requirement_ren import fox_require_str
 from fox_hex_utils_ren import fox_hex_is_valid
-from fox_color_ren import FoxColor, FoxHSV, hex_to_fox_rgb
+from fox_color_ren import FoxColor, FoxFrozenColor, FoxFrozenHSL, FoxFrozenHSV, FoxFrozenRGB, FoxHSV, hex_to_fox_rgb
+from swatch_ren import ColorSwatch
+from color_memory_ren import ColorMemory
 from screens import _color_picker_square  # type: ignore
 from ..options.color_option_ren import SCColorOption
 
@@ -11,6 +13,89 @@ init python:
 """
 
 import pygame
+from typing import Callable
+
+
+class LazyColor(object):
+    """
+    Lazy Multi-Space Color
+    ======================
+
+    Holds a color in the space it was given in, and converts it to other color
+    spaces only when they are asked for.  Each conversion is kept until the
+    color is next changed.
+
+    Colors are held as frozen colors, so the conversions handed out can be
+    shared freely: changing the color means setting a new one, usually made
+    with one of the `with_*` methods of a conversion.
+
+    Instance Properties
+    -------------------
+    source : FoxFrozenColor
+        The color as it was given.
+    hsl : FoxFrozenHSL
+        The color in HSL.
+    hsv : FoxFrozenHSV
+        The color in HSV.
+    rgb : FoxFrozenRGB
+        The color in RGB.
+    hex : str
+        The color as a hex string.
+    """
+
+    def __init__(self, color: FoxColor) -> None:
+        self.set(color)
+
+    @property
+    def source(self) -> FoxFrozenColor:
+        return self._source
+
+    def set(self, color: FoxColor) -> None:
+        """
+        Replaces the held color, dropping every cached conversion.  Mutable
+        colors are frozen first.
+        """
+        if not isinstance(color, FoxFrozenColor):
+            color = color.freeze()
+
+        self._source = color
+        self._spaces: dict[type, FoxFrozenColor] = {type(color): color}
+        self._hex: str | None = None
+
+    @property
+    def hsl(self) -> FoxFrozenHSL:
+        return self._in(FoxFrozenHSL)
+
+    @property
+    def hsv(self) -> FoxFrozenHSV:
+        return self._in(FoxFrozenHSV)
+
+    @property
+    def rgb(self) -> FoxFrozenRGB:
+        return self._in(FoxFrozenRGB)
+
+    @property
+    def hex(self) -> str:
+        if self._hex is None:
+            self._hex = self._source.hex
+
+        return self._hex
+
+    def _in(self, space: type) -> FoxFrozenColor:
+        try:
+            return self._spaces[space]
+        except KeyError:
+            pass
+
+        if space is FoxFrozenHSL:
+            out = self._source.to_hsl()
+        elif space is FoxFrozenHSV:
+            out = self._source.to_hsv()
+        else:
+            out = self._source.to_rgb()
+
+        self._spaces[space] = out
+        return out
 
 
 class ColorPicker(renpy.Displayable):
@@ -29,24 +114,36 @@ class ColorPicker(renpy.Displayable):
         shader transform.
     SELECT : Image
         Selector image.
-    HI_SPD : float
-        High speed rerender interval in seconds.
+    SQUARE_CACHE_SIZE : int
+        Maximum number of shaded picker squares kept, one per hue.
 
     Instance Properties
     -------------------
-    hsl : FoxHSL
+    hsl : FoxFrozenHSL
         Currently selected color in HSL.
-    hsv : FoxHSV
+    hsv : FoxFrozenHSV
         Currently selected color in HSV.
-    rgb : FoxRGB
+    rgb : FoxFrozenRGB
         Currently selected color in RGB.
+
+    Each of these is only converted to when it is first read after the color
+    changes.  They are immutable, so the picker changes its color by setting
+    a new one made with their `with_*` methods rather than by changing them
+    in place.
     """
 
     WHITE  = FoxHSV.white()
     BLACK  = FoxHSV.black()
     RED    = FoxHSV(0, 1.0, 1.0)
     SELECT = Image("lib/fxcpds/sprite_customizer/color_picker/selector.png")
-    HI_SPD = 0.01
+    SQUARE_CACHE_SIZE = 360
+
+    # Shaded picker squares keyed by hue, shared by all pickers of the same
+    # size.
+    _squares: dict[tuple[int, int, int | float], renpy.Displayable] = {}
+
+    # Pickers handed out by `pooled`, keyed by size.
+    _pool: dict[tuple[int, int], 'ColorPicker'] = {}
 
     def __init__(
         self,
@@ -68,43 +165,210 @@ class ColorPicker(renpy.Displayable):
         """
         super(ColorPicker, self).__init__(**kwargs)
 
-        start = start.clone()
-
-        self.hsl = start.to_hsl()
-        self.hsv = start.to_hsv()
-        self.rgb = start.to_rgb()
-
-        self._color = self.hsv
+        self._color = LazyColor(start)
         self._width = width
         self._height = height
         self._picker = Transform('#fff', xysize=(width, height))
         self._option = option
+        self._preview: ColorSwatch | None = None
+        self._hex_input: HexInputValue | None = None
+        self._slider_tab: StringContainer | None = None
+        self._setters: dict[tuple[str, str], Callable] = {}
 
         self._dragged = False
 
-        self._last_updated = 0.0
+        # Whether a drag position is waiting to be committed, and whether a
+        # color has already been committed since the last frame was drawn.
+        self._pending = False
+        self._frame_committed = False
+
+    @staticmethod
+    def pooled(width: int, height: int, option: SCColorOption, start: FoxColor | str) -> 'ColorPicker':
+        """
+        Returns the shared ColorPicker of the given size, creating it on first
+        use, bound to the given option and start color.
+
+        Only one color picker is shown at a time, so reusing the same picker
+        for every color option avoids rebuilding the picker, its hex input,
+        slider setters and preview each time a picker is opened.
+
+        Arguments
+        ---------
+        width : int
+            Width of the color picker displayable.
+        height : int
+            Height of the color picker displayable.
+        option : SCColorOption
+            Option the picker should edit.
+        start : FoxColor | str
+            Color, or hex color string, to start the picker on.
+        """
+        key = (width, height)
+
+        try:
+            picker = ColorPicker._pool[key]
+        except KeyError:
+            picker = ColorPicker._pool[key] = ColorPicker(width, height, option)
+
+        picker.bind(option, start)
+
+        return picker
+
+    def bind(self, option: SCColorOption, start: FoxColor | str) -> None:
+        """
+        Points this picker at a different option and start color, dropping any
+        drag in progress.
+
+        Arguments
+        ---------
+        option : SCColorOption
+            Option the picker should edit.
+        start : FoxColor | str
+            Color, or hex color string, to start the picker on.
+        """
+        if not isinstance(start, FoxColor):
+            start = hex_to_fox_rgb(start)
+
+        self._option = option
+        self._color.set(start)
+        self._dragged = False
+        self._pending = False
+        self._frame_committed = False
+        renpy.redraw(self, 0)
 
     @property
     def color(self) -> FoxColor:
-        return self._color
+        return self._color.source
+
+    @property
+    def hex(self) -> str:
+        return self._color.hex
 
-    def set_color(self, color: FoxColor) -> None:
-        self._color = color
-        self.hsl = color.to_hsl()
-        self.hsv = color.to_hsv()
-        self.rgb = color.to_rgb()
-        self._option.set_selection(self.rgb.hex)
+    @property
+    def preview(self) -> ColorSwatch:
+        """
+        Swatch showing the currently selected color.
+        """
+        if self._preview is None:
+            self._preview = ColorSwatch(self._preview_color)
+
+        return self._preview
+
+    def _preview_color(self) -> str:
+        # Options restricted to a palette preview the color they would store.
+        return self._option.snap(self._color.hex)
 
     @property
-    def rotation(self) -> int:
-        return self._color.hsv[0]
+    def hex_input(self) -> 'HexInputValue':
+        """
+        Input value for editing the selected color as a hex string.
+        """
+        if self._hex_input is None:
+            self._hex_input = HexInputValue(self)
+
+        return self._hex_input
+
+    @property
+    def slider_tab(self) -> 'StringContainer':
+        """
+        Name of the slider tab currently shown alongside the picker.
+        """
+        if self._slider_tab is None:
+            self._slider_tab = StringContainer("RGB")
+
+        return self._slider_tab
+
+    def _setter(self, key: tuple[str, str], build: Callable[..., Callable], channel: str) -> Callable:
+        try:
+            return self._setters[key]
+        except KeyError:
+            out = self._setters[key] = build(self, channel)
+            return out
+
+    @property
+    def hsl(self) -> FoxFrozenHSL:
+        return self._color.hsl
+
+    @property
+    def hsv(self) -> FoxFrozenHSV:
+        return self._color.hsv
+
+    @property
+    def rgb(self) -> FoxFrozenRGB:
+        return self._color.rgb
+
+    def set_color(self, color: FoxColor, continuous: bool = False) -> None:
+        """
+        Selects the given color.
+
+        Arguments
+        ---------
+        color : FoxColor
+            Color to select.
+        continuous : bool
+            Whether the change is part of a drag, in which case it is folded
+            into the same undo step as the rest of the drag until `end_drag`
+            is called, and only remembered among the recent colors then.
+        """
+        self._color.set(color)
+
+        history = self._option._req_state().history
+
+        if continuous and history is not None:
+            with history.merging():
+                self._option.set_selection(self._color.hex)
+        else:
+            self._option.set_selection(self._color.hex)
 
-    def set_rotation(self, rotation: int) -> None:
-        self.hsv.set_hue(rotation)
-        self.set_color(self.hsv)
+        if not continuous:
+            self.remember_color()
+
+        renpy.redraw(self, 0)
+
+    def end_drag(self) -> None:
+        """
+        Ends the drag of the picker or one of its bars, so the next change
+        is recorded as a new undo step, and remembers the color the drag
+        ended on.
+        """
+        self._end_merge()
+        self.remember_color()
+
+    def _end_merge(self) -> None:
+        history = self._option._req_state().history
+
+        if history is not None:
+            history.end_merge()
+
+    @property
+    def rotation(self) -> int | float:
+        return self.hsv.hue
+
+    def apply_hex(self, hex: str) -> None:
+        """
+        Selects the given hex color string, as when a remembered color swatch
+        is clicked.
+        """
+        self.set_color(hex_to_fox_rgb(hex))
+        renpy.restart_interaction()
+
+    def remember_color(self) -> None:
+        """
+        Records the color committed to the option among the recently used
+        colors.
+        """
+        ColorMemory.remember(self._option.selection_value)
+
+    def set_rotation(self, rotation: int | float) -> None:
+        self.set_color(self.hsv.with_hue(rotation), True)
         renpy.restart_interaction()
 
     def event(self, ev: pygame.event.Event, x: float, y: float, st: float) -> None:
+        # Commit a drag position left over from the previous frame.  The
+        # timeout requested by render ensures an event arrives to do so.
+        if self._pending and not self._frame_committed:
+            self._commit()
+
         # Is it a primary mouse button click event?
         click = ev.type == pygame.MOUSEBUTTONDOWN and ev.button == 1
 
@@ -133,66 +397,91 @@ class ColorPicker(renpy.Displayable):
         # If the user has clicked down the primary mouse button while the mouse
         # cursor is in the picker square.
         if click and hovered:
+            self._end_merge()
             self._dragged = True
-            self.hsv.set_saturation(self._clamp(x_percent))
-            self.hsv.set_value(self._clamp(y_percent))
-            self.set_color(self.hsv)
-            renpy.restart_interaction()
+            self._color.set(self.hsv.with_values(saturation=self._clamp(x_percent), value=self._clamp(y_percent)))
+            self._commit()
 
         # If the mouse is still clicked and is being moved, or "dragged" around
         # the screen.
         elif move and self._dragged:
             # Keep tracking even when we aren't in the square range because the
             # UX gets weird around the edges otherwise.
-            self.hsv.set_saturation(self._clamp(x_percent))
-            self.hsv.set_value(self._clamp(y_percent))
+            self._color.set(self.hsv.with_values(saturation=self._clamp(x_percent), value=self._clamp(y_percent)))
+            renpy.redraw(self, 0)
 
-            if st - self._last_updated >= self.HI_SPD:
-                self._last_updated = st
-                self.set_color(self.hsv)
-                renpy.restart_interaction()
+            # Commit at most one color per frame, using the latest position.
+            if self._frame_committed:
+                self._pending = True
+            else:
+                self._commit()
 
         # If the mouse button was just released, end the dragging and set the
         # final color selection.
-        elif release:
+        elif release and self._dragged:
             self._dragged = False
-            self.set_color(self.hsv)
-            renpy.restart_interaction()
+            self._commit()
+            self.end_drag()
+
+    def _commit(self) -> None:
+        self._pending = False
+        self._frame_committed = True
+        self.set_color(self.hsv, True)
+        renpy.restart_interaction()
 
     def render(self, width, height, st, at) -> renpy.Render:
         view = renpy.Render(self._width, self._height)
 
-        # Apply the shader to our picker square to get a new, transformed
-        # displayable.
-        picker = At(self._picker, _color_picker_square(self.RED.rotate_hue_by_degrees(self.rotation)))
+        # Put the shaded picker square for the current hue into our view.
+        view.blit(renpy.render(self._square(), self._width, self._height, st, at), (0, 0))
 
-        # Move the color selector around the screen by using the HSV values as
-        # the position values.
-        select = Transform(
-            self.SELECT,
-            anchor=(0.5, 0.5),
-            xpos=self.hsv.saturation,
-            ypos=1.0 - self.hsv.value,
-        )
+        # Move the color selector around the square by using the HSV values as
+        # the position values, centering it on the selected point.
+        select = renpy.render(self.SELECT, self._width, self._height, st, at)
 
-        # Assemble the picker pane.
-        pane = Fixed(picker, select, xysize=(self._width, self._height))
+        view.blit(select, (
+            int(self.hsv.saturation * self._width - select.width / 2),
+            int((1.0 - self.hsv.value) * self._height - select.height / 2),
+        ))
 
-        # RENDER THAT THING
-        rend = renpy.render(pane, self._width, self._height, st, at)
+        # A new frame may commit a new color.  If a drag position is still
+        # waiting, ask for an event to commit it with once this frame is up.
+        self._frame_committed = False
 
-        # Put that render into our view.
-        view.blit(rend, (0, 0))
+        if self._pending:
+            renpy.timeout(0)
 
-        renpy.redraw(self, self.HI_SPD)
+        # No redraw is scheduled here: changes to the color and drags of the
+        # selector request their own redraws, so an idle picker is not drawn
+        # again.
 
         return view
 
     def visit(self) -> list[renpy.Displayable]:
-        return [self._picker, self.SELECT]
+        return [self._square(), self.SELECT]
+
+    def _square(self) -> renpy.Displayable:
+        # The square is only drawn to the nearest degree of hue.
+        rotation = int(round(self.rotation)) % 360
+        key = (self._width, self._height, rotation)
+
+        try:
+            return ColorPicker._squares[key]
+        except KeyError:
+            pass
+
+        if len(ColorPicker._squares) >= self.SQUARE_CACHE_SIZE:
+            del ColorPicker._squares[next(iter(ColorPicker._squares))]
+
+        # Apply the shader to our picker square to get a new, transformed
+        # displayable.
+        out = At(self._picker, _color_picker_square(self.RED.rotate_hue_by_degrees(rotation)))
+        ColorPicker._squares[key] = out
+
+        return out
 
     def update_position(self):
-        h, s, v = self._color.hsv
+        h, s, v = self.color.hsv
         self.rotation = h
         self._xpos = s
         self._ypos = 1.0 - v
@@ -211,11 +500,11 @@ class HexInputValue(InputValue):
     def __init__(self, picker: ColorPicker):
         self.default = False
         self._picker = picker
-        self._last   = picker._color.hex[1:]
+        self._last   = picker.hex[1:]
         self._value  = self._last
 
     def get_text(self) -> str:
-        hex = self._picker._color.hex[1:]
+        hex = self._picker.hex[1:]
 
         if hex == self._last:
             return self._value
@@ -0,0 +1,190 @@
+import renpy  # type: ignore
+from renpy.store import persistent  # type: ignore
+from fox_hex_utils_ren import fox_hex_is_valid
+
+"""renpy
+init -2 python:
+"""
+
+
+class ColorMemory(object):
+    """
+    Color Picker Memory
+    ===================
+
+    Remembers the colors most recently committed from the color picker, and
+    the colors the player has pinned as favorites, across game sessions.
+
+    Colors are kept in `persistent` as packed `0xRRGGBBAA` ints rather than
+    hex strings.  Recent colors are held in a fixed size ring buffer, so
+    remembering a color does not shift the others, and a set of the held
+    colors is kept alongside it so checking for duplicates does not scan the
+    buffer.
+
+    Class Properties
+    ----------------
+    RECENT_KEY : str
+        Name of the persistent field holding the recent color ring buffer.
+    HEAD_KEY : str
+        Name of the persistent field holding the index the next recent color
+        will be written to.
+    FAVORITES_KEY : str
+        Name of the persistent field holding the favorite colors.
+    """
+
+    RECENT_KEY    = "_fox_color_picker_recent"
+    HEAD_KEY      = "_fox_color_picker_recent_head"
+    FAVORITES_KEY = "_fox_color_picker_favorites"
+
+    # Colors currently held in the recent ring buffer.  Built from persistent
+    # on first use, and never saved itself.
+    _index: set[int] | None = None
+
+    @staticmethod
+    def pack(hex: str) -> int:
+        """
+        Packs the given `#rrggbb` or `#rrggbbaa` hex color string into a single
+        `0xRRGGBBAA` int.
+        """
+        if not fox_hex_is_valid(hex[1:]) or len(hex) not in (7, 9):
+            raise Exception('"{}" is not a 6 or 8 digit hex color string'.format(hex))
+
+        if len(hex) == 7:
+            return (int(hex[1:], 16) << 8) | 0xFF
+
+        return int(hex[1:], 16)
+
+    @staticmethod
+    def unpack(color: int) -> str:
+        """
+        Unpacks the given `0xRRGGBBAA` int into a hex color string.  The alpha
+        channel is left out when the color is fully opaque.
+        """
+        if color & 0xFF == 0xFF:
+            return "#{:06x}".format(color >> 8)
+
+        return "#{:08x}".format(color)
+
+    @staticmethod
+    def recent() -> list[str]:
+        """
+        Returns the remembered recent colors as hex strings, most recent first.
+        """
+        ring, head = ColorMemory._ring()
+
+        return [
+            ColorMemory.unpack(ring[(head - i) % len(ring)])
+            for i in range(1, len(ring) + 1)
+        ]
+
+    @staticmethod
+    def favorites() -> list[str]:
+        """
+        Returns the pinned favorite colors as hex strings, in the order they
+        were pinned.
+        """
+        return [ColorMemory.unpack(color) for color in ColorMemory._favorites()]
+
+    @staticmethod
+    def remember(hex: str):
+        """
+        Records the given hex color string as the most recently committed
+        color.
+
+        If the color is already among the recent colors it is moved to the
+        front rather than being recorded twice.
+        """
+        color = ColorMemory.pack(hex)
+        capacity = sc.color_picker_recent_count
+
+        # A count of zero turns the recent colors off.
+        if capacity < 1:
+            return
+
+        ring, head = ColorMemory._ring()
+        index = ColorMemory._index
+
+        if color in index:
+            newest = ring[(head - 1) % len(ring)]
+
+            if newest == color:
+                return
+
+            # Rebuild the buffer, oldest first, without the repeated color.
+            ordered = [ring[(head + i) % len(ring)] for i in range(len(ring))]
+            ordered.remove(color)
+            ring[:] = ordered
+            head = len(ring)
+
+        if len(ring) < capacity:
+            ring.insert(head, color)
+            head += 1
+        else:
+            index.discard(ring[head])
+            ring[head] = color
+            head += 1
+
+        index.add(color)
+        setattr(persistent, ColorMemory.HEAD_KEY, head % capacity)
+
+    @staticmethod
+    def is_favorite(hex: str) -> bool:
+        """
+        Whether the given hex color string is pinned as a favorite.
+        """
+        return ColorMemory.pack(hex) in ColorMemory._favorites()
+
+    @staticmethod
+    def toggle_favorite(hex: str):
+        """
+        Pins the given hex color string as a favorite, or unpins it if it
+        already is one.  When the favorite limit is reached, the earliest
+        pinned favorite is unpinned to make room.
+        """
+        color = ColorMemory.pack(hex)
+        favorites = ColorMemory._favorites()
+
+        if color in favorites:
+            favorites.remove(color)
+        else:
+            favorites.append(color)
+
+            while len(favorites) > sc.color_picker_favorite_count:
+                favorites.pop(0)
+
+        renpy.restart_interaction()
+
+    @staticmethod
+    def _ring() -> tuple[list[int], int]:
+        ring = getattr(persistent, ColorMemory.RECENT_KEY)
+        head = getattr(persistent, ColorMemory.HEAD_KEY) or 0
+
+        if ring is None:
+            ring = []
+            head = 0
+            setattr(persistent, ColorMemory.RECENT_KEY, ring)
+        elif len(ring) > sc.color_picker_recent_count:
+            # The configured count has shrunk, keep only the newest colors.
+            keep = sc.color_picker_recent_count
+            ring[:] = [ring[(head - i) % len(ring)] for i in range(keep, 0, -1)]
+            head = 0
+            setattr(persistent, ColorMemory.HEAD_KEY, head)
+            ColorMemory._index = None
+
+        if len(ring) == 0:
+            head = 0
+
+        if ColorMemory._index is None:
+            ColorMemory._index = set(ring)
+
+        return ring, head
+
+    @staticmethod
+    def _favorites() -> list[int]:
+        favorites = getattr(persistent, ColorMemory.FAVORITES_KEY)
+
+        if favorites is None:
+            favorites = []
+            setattr(persistent, ColorMemory.FAVORITES_KEY, favorites)
+
+        return favorites
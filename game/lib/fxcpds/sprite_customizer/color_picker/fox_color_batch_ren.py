@@ -0,0 +1,834 @@
+from fox_color_ren import FoxColor, FoxRGB, fox_rgb_to_lab, fox_rgb_to_oklab, _fox_delta_e_2000
+
+"""renpy
+init -2 python:
+"""
+
+import math
+
+# NumPy is not shipped with Ren'Py, so it is only used when the game or the
+# developer's environment provides it.
+try:
+    import numpy as _fox_numpy
+except ImportError:
+    _fox_numpy = None
+
+
+# Smallest batch that is converted with NumPy, below this the pure Python
+# conversions are quicker than building the arrays.
+_fox_batch_numpy_min = 64
+
+
+################################################################################
+#
+#   Public Functions
+#
+################################################################################
+
+
+def fox_batch_rgb_to_hsv(colors) -> list[tuple[float, float, float]]:
+    """
+    Batch RGB to HSV.  Converts the given `(red, green, blue)` tuples to
+    `(hue, saturation, value)` tuples.
+
+    The results are equal to those of `FoxRGB(r, g, b).hsv` for each color.
+
+    :param colors: List of `(red, green, blue)` tuples, or an N×3 NumPy array,
+    with each channel as an int between 0 and 255 (inclusive).
+
+    :return: List of `(hue, saturation, value)` tuples, in the same order as the
+    given colors.
+    """
+    return _fox_batch_run(colors, _fox_batch_rgb_to_hsv_py, _fox_batch_rgb_to_hsv_np)
+
+
+def fox_batch_rgb_to_hsl(colors) -> list[tuple[float, float, float]]:
+    """
+    Batch RGB to HSL.  Converts the given `(red, green, blue)` tuples to
+    `(hue, saturation, lightness)` tuples.
+
+    The results are equal to those of `FoxRGB(r, g, b).hsl` for each color.
+
+    :param colors: List of `(red, green, blue)` tuples, or an N×3 NumPy array,
+    with each channel as an int between 0 and 255 (inclusive).
+
+    :return: List of `(hue, saturation, lightness)` tuples, in the same order as
+    the given colors.
+    """
+    return _fox_batch_run(colors, _fox_batch_rgb_to_hsl_py, _fox_batch_rgb_to_hsl_np)
+
+
+def fox_batch_hsv_to_rgb(colors) -> list[tuple[int, int, int]]:
+    """
+    Batch HSV to RGB.  Converts the given `(hue, saturation, value)` tuples to
+    `(red, green, blue)` tuples.
+
+    The results are equal to those of `FoxHSV(h, s, v).rgb` for each color,
+    including the correction of hues outside of `[0, 360)` and the clamping of
+    saturation and value.
+
+    :param colors: List of `(hue, saturation, value)` tuples, or an N×3 NumPy
+    array.
+
+    :return: List of `(red, green, blue)` tuples, in the same order as the given
+    colors.
+    """
+    return _fox_batch_run(colors, _fox_batch_hsv_to_rgb_py, _fox_batch_hsv_to_rgb_np)
+
+
+def fox_batch_hsv_to_hsl(colors) -> list[tuple[float, float, float]]:
+    """
+    Batch HSV to HSL.  Converts the given `(hue, saturation, value)` tuples to
+    `(hue, saturation, lightness)` tuples.
+
+    The results are equal to those of `FoxHSV(h, s, v).hsl` for each color.
+
+    :param colors: List of `(hue, saturation, value)` tuples, or an N×3 NumPy
+    array.
+
+    :return: List of `(hue, saturation, lightness)` tuples, in the same order as
+    the given colors.
+    """
+    return _fox_batch_run(colors, _fox_batch_hsv_to_hsl_py, _fox_batch_hsv_to_hsl_np)
+
+
+def fox_batch_hsl_to_rgb(colors) -> list[tuple[int, int, int]]:
+    """
+    Batch HSL to RGB.  Converts the given `(hue, saturation, lightness)` tuples
+    to `(red, green, blue)` tuples.
+
+    The results are equal to those of `FoxHSL(h, s, l).rgb` for each color,
+    including the correction of hues outside of `[0, 360)` and the clamping of
+    saturation and lightness.
+
+    :param colors: List of `(hue, saturation, lightness)` tuples, or an N×3
+    NumPy array.
+
+    :return: List of `(red, green, blue)` tuples, in the same order as the given
+    colors.
+    """
+    return _fox_batch_run(colors, _fox_batch_hsl_to_rgb_py, _fox_batch_hsl_to_rgb_np)
+
+
+def fox_batch_hsl_to_hsv(colors) -> list[tuple[float, float, float]]:
+    """
+    Batch HSL to HSV.  Converts the given `(hue, saturation, lightness)` tuples
+    to `(hue, saturation, value)` tuples.
+
+    The results are equal to those of `FoxHSL(h, s, l).hsv` for each color.
+
+    :param colors: List of `(hue, saturation, lightness)` tuples, or an N×3
+    NumPy array.
+
+    :return: List of `(hue, saturation, value)` tuples, in the same order as the
+    given colors.
+    """
+    return _fox_batch_run(colors, _fox_batch_hsl_to_hsv_py, _fox_batch_hsl_to_hsv_np)
+
+
+def fox_batch_rgb_to_hex(colors) -> list[str]:
+    """
+    Batch RGB to Hex.  Converts the given `(red, green, blue)` or
+    `(red, green, blue, alpha)` tuples to hex color strings.
+
+    The results are equal to those of `FoxRGB(r, g, b, a).hex` for each color,
+    meaning that the alpha channel is only included for colors with an alpha
+    below `1.0`.
+
+    :param colors: List of `(red, green, blue)` and/or
+    `(red, green, blue, alpha)` tuples, with each channel as an int between 0
+    and 255 (inclusive), and alpha as a percent float between 0.0 and 1.0
+    (inclusive).
+
+    :return: List of `#rrggbb` and/or `#rrggbbaa` hex color strings, in the same
+    order as the given colors.
+    """
+    out = []
+
+    for color in colors:
+        if len(color) == 4 and color[3] < 1.0:
+            r, g, b, a = color
+            data = (int(r), int(g), int(b), int(a * 255))
+        else:
+            data = (int(color[0]), int(color[1]), int(color[2]))
+
+        try:
+            out.append('#' + bytes(data).hex())
+        except ValueError:
+            raise Exception(f'rgb color values must be between 0 and 255, got {tuple(color)}')
+
+    return out
+
+
+def fox_batch_hex_to_rgb(hexes: list[str]) -> list[tuple[int, int, int, float]]:
+    """
+    Batch Hex to RGB.  Parses the given hex color strings into
+    `(red, green, blue, alpha)` tuples.
+
+    The results are equal to those of `hex_to_fox_rgb(hex).rgba` for each hex
+    string, and the same hex formats are accepted: `#rgb`, `#rgba`, `#rrggbb`,
+    and `#rrggbbaa`.
+
+    :param hexes: List of hex color strings to parse.
+
+    :return: List of `(red, green, blue, alpha)` tuples, in the same order as the
+    given hex strings.
+    """
+    out = []
+
+    for value in hexes:
+        if not isinstance(value, str) or not value.startswith('#'):
+            raise Exception(f'"{value}" is not a valid hex color string as it did not start with a "#" character')
+
+        digits = value[1:]
+
+        if len(digits) == 3 or len(digits) == 4:
+            digits = ''.join(c + c for c in digits)
+        elif len(digits) != 6 and len(digits) != 8:
+            raise Exception(f'"{value}" is not a valid hex color string as it was not 3, 4, 6, or 8 hex characters')
+
+        try:
+            data = bytes.fromhex(digits)
+        except ValueError:
+            data = b''
+
+        # bytes.fromhex skips whitespace, so a short result means the string
+        # held something other than hex digits.
+        if len(data) * 2 != len(digits):
+            raise Exception(f'"{value}" is not a valid hex color string')
+
+        if len(data) == 3:
+            out.append((data[0], data[1], data[2], 1.0))
+        else:
+            out.append((data[0], data[1], data[2], data[3] / 255))
+
+    return out
+
+
+def fox_batch_rgb_to_oklab(colors) -> list[tuple[float, float, float]]:
+    """
+    Batch RGB to OKLab.  Converts the given `(red, green, blue)` tuples to
+    OKLab `(lightness, a, b)` tuples.
+
+    The results match those of `FoxRGB(r, g, b).oklab` for each color, to
+    within float rounding.
+
+    :param colors: List of `(red, green, blue)` tuples, or an N×3 NumPy array,
+    with each channel as an int between 0 and 255 (inclusive).
+
+    :return: List of `(lightness, a, b)` tuples, in the same order as the given
+    colors.
+    """
+    return _fox_batch_run(colors, _fox_batch_rgb_to_oklab_py, _fox_batch_rgb_to_oklab_np)
+
+
+def fox_batch_rgb_to_lab(colors) -> list[tuple[float, float, float]]:
+    """
+    Batch RGB to CIELAB.  Converts the given `(red, green, blue)` tuples to
+    CIELAB (D65) `(lightness, a, b)` tuples.
+
+    The results match those of `FoxRGB(r, g, b).lab` for each color, to within
+    float rounding.
+
+    :param colors: List of `(red, green, blue)` tuples, or an N×3 NumPy array,
+    with each channel as an int between 0 and 255 (inclusive).
+
+    :return: List of `(lightness, a, b)` tuples, in the same order as the given
+    colors.
+    """
+    return _fox_batch_run(colors, _fox_batch_rgb_to_lab_py, _fox_batch_rgb_to_lab_np)
+
+
+def fox_batch_delta_e_ok(colors, others) -> list[float]:
+    """
+    Batch OKLab Delta E.  Measures how different each of the given colors looks
+    from its matching other color, as the distance between the two in OKLab.
+
+    The results match those of `FoxColor.delta_e_ok` for each pair, to within
+    float rounding.
+
+    :param colors: List of `(red, green, blue)` tuples, or an N×3 NumPy array.
+
+    :param others: List of `(red, green, blue)` tuples of the same length as
+    `colors`, or a single `(red, green, blue)` tuple to compare every color
+    against.
+
+    :return: List of OKLab distances, in the same order as the given colors.
+    """
+    return _fox_batch_compare(
+        colors,
+        others,
+        _fox_batch_rgb_to_oklab_py,
+        _fox_batch_rgb_to_oklab_np,
+        _fox_batch_delta_e_ok_py,
+        _fox_batch_delta_e_ok_np,
+    )
+
+
+def fox_batch_delta_e_2000(colors, others) -> list[float]:
+    """
+    Batch CIEDE2000 Delta E.  Measures how different each of the given colors
+    looks from its matching other color, using the CIEDE2000 formula.
+
+    The results match those of `FoxColor.delta_e_2000` for each pair, to within
+    float rounding.
+
+    :param colors: List of `(red, green, blue)` tuples, or an N×3 NumPy array.
+
+    :param others: List of `(red, green, blue)` tuples of the same length as
+    `colors`, or a single `(red, green, blue)` tuple to compare every color
+    against.
+
+    :return: List of CIEDE2000 differences, in the same order as the given
+    colors.
+    """
+    return _fox_batch_compare(
+        colors,
+        others,
+        _fox_batch_rgb_to_lab_py,
+        _fox_batch_rgb_to_lab_np,
+        _fox_delta_e_2000,
+        _fox_batch_delta_e_2000_np,
+    )
+
+
+def fox_batch_farthest_point_sample(colors, n: int) -> list[int]:
+    """
+    Batch Farthest Point Sample.  Picks `n` colors from the given colors that
+    look as different from each other as possible.
+
+    The first color is always picked first, after which each pick is the color
+    that is furthest, in OKLab, from every color picked before it.  Putting a
+    color that must be included at the front of the list therefore builds the
+    rest of the picks around it.
+
+    :param colors: List of `(red, green, blue)` tuples, or an N×3 NumPy array,
+    to pick from.
+
+    :param n: Number of colors to pick.  If this is more than the number of
+    given colors, every color is picked.
+
+    :return: List of the indices of the picked colors, in the order they were
+    picked.
+    """
+    return _fox_batch_sample(fox_batch_rgb_to_oklab(colors), n)
+
+
+################################################################################
+#
+#   Internal Functions
+#
+################################################################################
+
+
+def _fox_batch_run(colors, python, vectorized) -> list[tuple]:
+    if _fox_numpy is not None and len(colors) >= _fox_batch_numpy_min:
+        data = _fox_numpy.asarray(colors, dtype=_fox_numpy.float64)
+
+        if data.ndim != 2 or data.shape[1] != 3:
+            raise Exception('colors must be a list of 3 value tuples')
+
+        with _fox_numpy.errstate(divide='ignore', invalid='ignore'):
+            columns = vectorized(data[:, 0], data[:, 1], data[:, 2])
+
+        return list(zip(*(column.tolist() for column in columns)))
+
+    if hasattr(colors, 'tolist'):
+        colors = colors.tolist()
+
+    return [python(*color) for color in colors]
+
+
+def _fox_batch_compare(colors, others, space, vectorized_space, python, vectorized) -> list[float]:
+    single = isinstance(others, tuple)
+
+    if not single and len(others) != len(colors):
+        raise Exception('others must be a single color or a list of the same length as colors')
+
+    if _fox_numpy is not None and len(colors) >= _fox_batch_numpy_min:
+        this = _fox_batch_columns(colors)
+        that = _fox_batch_columns([others] if single else others)
+
+        with _fox_numpy.errstate(divide='ignore', invalid='ignore'):
+            return vectorized(vectorized_space(*this), vectorized_space(*that)).tolist()
+
+    if hasattr(colors, 'tolist'):
+        colors = colors.tolist()
+
+    if single:
+        that = space(*others)
+        return [python(space(*color), that) for color in colors]
+
+    if hasattr(others, 'tolist'):
+        others = others.tolist()
+
+    return [python(space(*x), space(*y)) for x, y in zip(colors, others)]
+
+
+def _fox_batch_sample(points, n: int) -> list[int]:
+    if not isinstance(n, int) or n < 1:
+        raise Exception('n must be an int greater than 0')
+
+    n = min(n, len(points))
+
+    if n == 0:
+        return []
+
+    if _fox_numpy is not None and len(points) >= _fox_batch_numpy_min:
+        return _fox_batch_sample_np(points, n)
+
+    l, a, b = points[0]
+    nearest = [(l - x) ** 2 + (a - y) ** 2 + (b - z) ** 2 for x, y, z in points]
+    nearest[0] = -1.0
+    out = [0]
+
+    while len(out) < n:
+        pick = max(range(len(nearest)), key=nearest.__getitem__)
+        out.append(pick)
+
+        l, a, b = points[pick]
+        for i, (x, y, z) in enumerate(points):
+            d = (l - x) ** 2 + (a - y) ** 2 + (b - z) ** 2
+            if d < nearest[i]:
+                nearest[i] = d
+
+        # A picked color is at distance 0 from itself, so it is marked below
+        # that to never be picked again, even over an unpicked duplicate.
+        nearest[pick] = -1.0
+
+    return out
+
+
+def _fox_batch_columns(colors):
+    data = _fox_numpy.asarray(colors, dtype=_fox_numpy.float64)
+
+    if data.ndim != 2 or data.shape[1] != 3:
+        raise Exception('colors must be a list of 3 value tuples')
+
+    return data[:, 0], data[:, 1], data[:, 2]
+
+
+def _fox_batch_hue(hue: int | float) -> int | float:
+    FoxColor._require_numeric('hue', hue)
+    return hue % 360
+
+
+def _fox_batch_clamp(value: float) -> float:
+    if value > 1.0:
+        return 1.0
+    elif value < 0.0:
+        return 0.0
+    else:
+        return value
+
+
+def _fox_batch_require_rgb(red, green, blue):
+    return (
+        FoxRGB._require_rgb('red', red),
+        FoxRGB._require_rgb('green', green),
+        FoxRGB._require_rgb('blue', blue),
+    )
+
+
+def _fox_batch_require_rgb_np(red, green, blue):
+    np = _fox_numpy
+
+    if (
+        np.any(red < 0) or np.any(green < 0) or np.any(blue < 0)
+        or np.any(red > 255) or np.any(green > 255) or np.any(blue > 255)
+    ):
+        raise Exception('rgb color values must be between 0 and 255')
+
+    return np.trunc(red), np.trunc(green), np.trunc(blue)
+
+
+#   Pure Python  ###############################################################
+#
+#   Each of these follows the matching FoxRGB, FoxHSV, or FoxHSL method step by
+#   step, so that the results are exactly the same.
+
+
+def _fox_batch_rgb_to_hsv_py(red, green, blue) -> tuple[float, float, float]:
+    red, green, blue = _fox_batch_require_rgb(red, green, blue)
+
+    r = red / 255
+    g = green / 255
+    b = blue / 255
+
+    v = max(r, g, b)
+    c = v - min(r, g, b)
+
+    if c == 0:
+        h = 0
+    elif v == r:
+        h = (g - b) / c
+    elif v == g:
+        h = 2 + (b - r) / c
+    else:
+        h = 4 + (r - g) / c
+
+    h = 60 * ((h + 6) if h < 0 else h)
+    s = c / v if v != 0 else 0
+
+    return h, s, v
+
+
+def _fox_batch_rgb_to_hsl_py(red, green, blue) -> tuple[float, float, float]:
+    red, green, blue = _fox_batch_require_rgb(red, green, blue)
+
+    r = red / 255
+    g = green / 255
+    b = blue / 255
+
+    a = max(r, g, b)
+    i = min(r, g, b)
+
+    l = (a + i) / 2
+    d = a - i
+
+    s = d / (1 - abs(2 * l - 1)) if d != 0 else 0.0
+
+    if d <= 0:
+        h = 0.0
+    elif a == r:
+        h = ((g - b) / d) % 6
+    elif a == g:
+        h = 2 + (b - r) / d
+    else:
+        h = 4 + (r - g) / d
+
+    return h * 60, s, l
+
+
+def _fox_batch_hsv_to_rgb_py(hue, saturation, value) -> tuple[int, int, int]:
+    h = _fox_batch_hue(hue)
+    s = _fox_batch_clamp(saturation)
+    v = _fox_batch_clamp(value)
+
+    def f(n):
+        k = (n + h / 60) % 6
+        return int(round(255 * (v - v * s * max(0, min(k, 4 - k, 1)))))
+
+    return f(5), f(3), f(1)
+
+
+def _fox_batch_hsv_to_hsl_py(hue, saturation, value) -> tuple[float, float, float]:
+    h = _fox_batch_hue(hue)
+    s = _fox_batch_clamp(saturation)
+    v = _fox_batch_clamp(value)
+
+    l = _fox_batch_clamp(v - v * s / 2)
+    m = min(l, 1 - l)
+
+    return h, _fox_batch_clamp((v - l) / m if m else 0.0), l
+
+
+def _fox_batch_hsl_to_rgb_py(hue, saturation, lightness) -> tuple[int, int, int]:
+    h = _fox_batch_hue(hue)
+    s = _fox_batch_clamp(saturation)
+    l = _fox_batch_clamp(lightness)
+
+    if s == 0:
+        tmp = int(l * 255)
+        return tmp, tmp, tmp
+
+    c = (1 - abs(2 * l - 1)) * s
+    x = c * (1 - abs(((h / 60) % 2) - 1))
+    m = l - c / 2
+
+    if h < 60:
+        r, g, b = c, x, 0.0
+    elif h < 120:
+        r, g, b = x, c, 0.0
+    elif h < 180:
+        r, g, b = 0.0, c, x
+    elif h < 240:
+        r, g, b = 0.0, x, c
+    elif h < 300:
+        r, g, b = x, 0.0, c
+    elif h < 360:
+        r, g, b = c, 0.0, x
+    else:
+        r, g, b = 0.0, 0.0, 0.0
+
+    return int(round((r + m) * 255)), int(round((g + m) * 255)), int(round((b + m) * 255))
+
+
+def _fox_batch_hsl_to_hsv_py(hue, saturation, lightness) -> tuple[float, float, float]:
+    h = _fox_batch_hue(hue)
+    s = _fox_batch_clamp(saturation)
+    l = _fox_batch_clamp(lightness)
+
+    v = _fox_batch_clamp(s * min(l, 1 - l) + l)
+
+    return h, _fox_batch_clamp(2 - 2 * l / v if v else 0.0), v
+
+
+def _fox_batch_rgb_to_oklab_py(red, green, blue) -> tuple[float, float, float]:
+    return fox_rgb_to_oklab(_fox_batch_require_rgb(red, green, blue))
+
+
+def _fox_batch_rgb_to_lab_py(red, green, blue) -> tuple[float, float, float]:
+    return fox_rgb_to_lab(_fox_batch_require_rgb(red, green, blue))
+
+
+def _fox_batch_delta_e_ok_py(lab1, lab2) -> float:
+    return math.sqrt((lab1[0] - lab2[0]) ** 2 + (lab1[1] - lab2[1]) ** 2 + (lab1[2] - lab2[2]) ** 2)
+
+
+#   NumPy  #####################################################################
+#
+#   Vectorized versions of the functions above.  Every branch is computed for
+#   every color and the matching result picked afterwards, using the same
+#   float operations in the same order as the pure Python versions.
+
+
+def _fox_batch_rgb_to_hsv_np(red, green, blue):
+    np = _fox_numpy
+    red, green, blue = _fox_batch_require_rgb_np(red, green, blue)
+
+    r = red / 255
+    g = green / 255
+    b = blue / 255
+
+    v = np.maximum(np.maximum(r, g), b)
+    c = v - np.minimum(np.minimum(r, g), b)
+
+    h = np.where(
+        c == 0,
+        0.0,
+        np.where(v == r, (g - b) / c, np.where(v == g, 2 + (b - r) / c, 4 + (r - g) / c)),
+    )
+
+    h = 60 * np.where(h < 0, h + 6, h)
+    s = np.where(v != 0, c / v, 0.0)
+
+    return h, s, v
+
+
+def _fox_batch_rgb_to_hsl_np(red, green, blue):
+    np = _fox_numpy
+    red, green, blue = _fox_batch_require_rgb_np(red, green, blue)
+
+    r = red / 255
+    g = green / 255
+    b = blue / 255
+
+    a = np.maximum(np.maximum(r, g), b)
+    i = np.minimum(np.minimum(r, g), b)
+
+    l = (a + i) / 2
+    d = a - i
+
+    s = np.where(d != 0, d / (1 - np.abs(2 * l - 1)), 0.0)
+
+    h = np.where(
+        d <= 0,
+        0.0,
+        np.where(a == r, np.remainder((g - b) / d, 6), np.where(a == g, 2 + (b - r) / d, 4 + (r - g) / d)),
+    )
+
+    return h * 60, s, l
+
+
+def _fox_batch_hsv_to_rgb_np(hue, saturation, value):
+    np = _fox_numpy
+
+    h = np.remainder(hue, 360)
+    s = np.clip(saturation, 0.0, 1.0)
+    v = np.clip(value, 0.0, 1.0)
+
+    def f(n):
+        k = np.remainder(n + h / 60, 6)
+        return np.rint(255 * (v - v * s * np.maximum(0, np.minimum(np.minimum(k, 4 - k), 1)))).astype(np.int64)
+
+    return f(5), f(3), f(1)
+
+
+def _fox_batch_hsv_to_hsl_np(hue, saturation, value):
+    np = _fox_numpy
+
+    h = np.remainder(hue, 360)
+    s = np.clip(saturation, 0.0, 1.0)
+    v = np.clip(value, 0.0, 1.0)
+
+    l = np.clip(v - v * s / 2, 0.0, 1.0)
+    m = np.minimum(l, 1 - l)
+
+    return h, np.clip(np.where(m != 0, (v - l) / m, 0.0), 0.0, 1.0), l
+
+
+def _fox_batch_hsl_to_rgb_np(hue, saturation, lightness):
+    np = _fox_numpy
+
+    h = np.remainder(hue, 360)
+    s = np.clip(saturation, 0.0, 1.0)
+    l = np.clip(lightness, 0.0, 1.0)
+
+    c = (1 - np.abs(2 * l - 1)) * s
+    x = c * (1 - np.abs(np.remainder(h / 60, 2) - 1))
+    m = l - c / 2
+
+    sectors = [h < 60, h < 120, h < 180, h < 240, h < 300, h < 360]
+
+    r = np.select(sectors, [c, x, 0.0, 0.0, x, c], 0.0)
+    g = np.select(sectors, [x, c, c, x, 0.0, 0.0], 0.0)
+    b = np.select(sectors, [0.0, 0.0, x, c, c, x], 0.0)
+
+    grey = np.trunc(l * 255)
+
+    return (
+        np.where(s == 0, grey, np.rint((r + m) * 255)).astype(np.int64),
+        np.where(s == 0, grey, np.rint((g + m) * 255)).astype(np.int64),
+        np.where(s == 0, grey, np.rint((b + m) * 255)).astype(np.int64),
+    )
+
+
+def _fox_batch_hsl_to_hsv_np(hue, saturation, lightness):
+    np = _fox_numpy
+
+    h = np.remainder(hue, 360)
+    s = np.clip(saturation, 0.0, 1.0)
+    l = np.clip(lightness, 0.0, 1.0)
+
+    v = np.clip(s * np.minimum(l, 1 - l) + l, 0.0, 1.0)
+
+    return h, np.clip(np.where(v != 0, 2 - 2 * l / v, 0.0), 0.0, 1.0), v
+
+
+def _fox_batch_linear_np(channel):
+    np = _fox_numpy
+    c = channel / 255
+
+    return np.where(c <= 0.04045, c / 12.92, ((c + 0.055) / 1.055) ** 2.4)
+
+
+def _fox_batch_rgb_to_oklab_np(red, green, blue):
+    red, green, blue = _fox_batch_require_rgb_np(red, green, blue)
+
+    r = _fox_batch_linear_np(red)
+    g = _fox_batch_linear_np(green)
+    b = _fox_batch_linear_np(blue)
+
+    l = (0.4122214708 * r + 0.5363325363 * g + 0.0514459929 * b) ** (1 / 3)
+    m = (0.2119034982 * r + 0.6806995451 * g + 0.1073969566 * b) ** (1 / 3)
+    s = (0.0883024619 * r + 0.2817188376 * g + 0.6299787005 * b) ** (1 / 3)
+
+    return (
+        0.2104542553 * l + 0.7936177850 * m - 0.0040720468 * s,
+        1.9779984951 * l - 2.4285922050 * m + 0.4505937099 * s,
+        0.0259040371 * l + 0.7827717662 * m - 0.8086757660 * s,
+    )
+
+
+def _fox_batch_rgb_to_lab_np(red, green, blue):
+    np = _fox_numpy
+    red, green, blue = _fox_batch_require_rgb_np(red, green, blue)
+
+    r = _fox_batch_linear_np(red)
+    g = _fox_batch_linear_np(green)
+    b = _fox_batch_linear_np(blue)
+
+    def f(t):
+        return np.where(t > 216 / 24389, t ** (1 / 3), (24389 / 27 * t + 16) / 116)
+
+    x = f((0.4124564 * r + 0.3575761 * g + 0.1804375 * b) / 0.95047)
+    y = f(0.2126729 * r + 0.7151522 * g + 0.0721750 * b)
+    z = f((0.0193339 * r + 0.1191920 * g + 0.9503041 * b) / 1.08883)
+
+    return 116 * y - 16, 500 * (x - y), 200 * (y - z)
+
+
+def _fox_batch_delta_e_ok_np(lab1, lab2):
+    np = _fox_numpy
+
+    return np.sqrt((lab1[0] - lab2[0]) ** 2 + (lab1[1] - lab2[1]) ** 2 + (lab1[2] - lab2[2]) ** 2)
+
+
+def _fox_batch_delta_e_2000_np(lab1, lab2):
+    np = _fox_numpy
+
+    L1, a1, b1 = lab1
+    L2, a2, b2 = lab2
+
+    c = (np.hypot(a1, b1) + np.hypot(a2, b2)) / 2
+    g = 0.5 * (1 - np.sqrt(c ** 7 / (c ** 7 + 25 ** 7)))
+
+    a1 = (1 + g) * a1
+    a2 = (1 + g) * a2
+
+    c1 = np.hypot(a1, b1)
+    c2 = np.hypot(a2, b2)
+
+    h1 = np.remainder(np.degrees(np.arctan2(b1, a1)), 360)
+    h2 = np.remainder(np.degrees(np.arctan2(b2, a2)), 360)
+
+    dl = L2 - L1
+    dc = c2 - c1
+
+    neutral = c1 * c2 == 0
+    diff = h2 - h1
+
+    dh = np.where(
+        neutral,
+        0.0,
+        np.where(np.abs(diff) <= 180, diff, np.where(diff > 180, diff - 360, diff + 360)),
+    )
+
+    dh = 2 * np.sqrt(c1 * c2) * np.sin(np.radians(dh / 2))
+
+    l = (L1 + L2) / 2
+    c = (c1 + c2) / 2
+    total = h1 + h2
+
+    h = np.where(
+        neutral,
+        total,
+        np.where(
+            np.abs(h1 - h2) <= 180,
+            total / 2,
+            np.where(total < 360, (total + 360) / 2, (total - 360) / 2),
+        ),
+    )
+
+    t = (
+        1
+        - 0.17 * np.cos(np.radians(h - 30))
+        + 0.24 * np.cos(np.radians(2 * h))
+        + 0.32 * np.cos(np.radians(3 * h + 6))
+        - 0.20 * np.cos(np.radians(4 * h - 63))
+    )
+
+    sl = 1 + 0.015 * (l - 50) ** 2 / np.sqrt(20 + (l - 50) ** 2)
+    sc = 1 + 0.045 * c
+    sh = 1 + 0.015 * c * t
+
+    rt = (
+        -np.sin(np.radians(60 * np.exp(-(((h - 275) / 25) ** 2))))
+        * 2 * np.sqrt(c ** 7 / (c ** 7 + 25 ** 7))
+    )
+
+    dl = dl / sl
+    dc = dc / sc
+    dh = dh / sh
+
+    return np.sqrt(dl ** 2 + dc ** 2 + dh ** 2 + rt * dc * dh)
+
+
+def _fox_batch_sample_np(points, n: int) -> list[int]:
+    np = _fox_numpy
+
+    l, a, b = _fox_batch_columns(points)
+
+    nearest = (l[0] - l) ** 2 + (a[0] - a) ** 2 + (b[0] - b) ** 2
+    nearest[0] = -1.0
+    out = [0]
+
+    while len(out) < n:
+        pick = int(np.argmax(nearest))
+        out.append(pick)
+
+        np.minimum(nearest, (l[pick] - l) ** 2 + (a[pick] - a) ** 2 + (b[pick] - b) ** 2, out=nearest)
+        nearest[pick] = -1.0
+
+    return out
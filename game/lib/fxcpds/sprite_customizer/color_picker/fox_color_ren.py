@@ -29,6 +29,8 @@ from renpy import Color  # type: ignore
 init -2 python:
 """
 
+import math
+
 
 ################################################################################
 #
@@ -45,6 +47,10 @@ class FoxColor(object):
     raise an exception.
     """
 
+    # Kept empty so that the frozen color classes below can be fully slotted.
+    # The mutable color classes still have an instance dict.
+    __slots__ = ()
+
     def __init__(self, alpha: float):
         if self.__class__.__name__ == 'FoxColor':
             raise Exception('FoxColor cannot be constructed directly.')
@@ -127,6 +133,57 @@ class FoxColor(object):
             r, g, b, a = self.rgba
             return fox_ubytes_to_hex((r, g, b, int(a * 255)), '#')
 
+    #  PERCEPTUAL  #############################################################
+
+    @property
+    def oklab(self) -> tuple[float, float, float]:
+        """
+        :return: Tuple of this color's OKLab lightness, a, and b values.  The
+        alpha channel is ignored.
+        """
+        return fox_rgb_to_oklab(self.rgb)
+
+    @property
+    def lab(self) -> tuple[float, float, float]:
+        """
+        :return: Tuple of this color's CIELAB (D65) lightness, a, and b values.
+        The alpha channel is ignored.
+        """
+        return fox_rgb_to_lab(self.rgb)
+
+    def delta_e_ok(self, other: 'FoxColor') -> float:
+        """
+        Measures how different this color looks from the given `other` color as
+        the straight line distance between the two in OKLab.
+
+        :param other: Color to measure the difference to.
+
+        :return: The OKLab distance, where `0.0` means the colors are the same
+        and about `0.02` is just noticeable.
+        """
+        if not isinstance(other, FoxColor):
+            raise Exception('Cannot measure the difference between a FoxColor and non FoxColor value.')
+
+        l1, a1, b1 = self.oklab
+        l2, a2, b2 = other.oklab
+
+        return math.sqrt((l1 - l2) ** 2 + (a1 - a2) ** 2 + (b1 - b2) ** 2)
+
+    def delta_e_2000(self, other: 'FoxColor') -> float:
+        """
+        Measures how different this color looks from the given `other` color
+        using the CIEDE2000 formula over CIELAB.
+
+        :param other: Color to measure the difference to.
+
+        :return: The CIEDE2000 difference, where `0.0` means the colors are the
+        same and about `1.0` is just noticeable.
+        """
+        if not isinstance(other, FoxColor):
+            raise Exception('Cannot measure the difference between a FoxColor and non FoxColor value.')
+
+        return _fox_delta_e_2000(self.lab, other.lab)
+
     #  ALPHA  ##################################################################
 
     @property
@@ -404,7 +461,7 @@ class FoxHSL(FoxColor):
         """
         Initializes the new FoxHSL instance with the given arguments.
 
-        :param hue: Hue value as an int between 0 and 360 (inclusive).  If the
+        :param hue: Hue value as a number between 0 and 360 (inclusive).  If the
         given value falls outside of that range it will be 'corrected' to a
         value in that range to allow for negative rotations or over rotations.
 
@@ -622,6 +679,15 @@ class FoxHSL(FoxColor):
     def clone(self) -> 'FoxHSL':
         return FoxHSL(self._h, self._s, self._l, self._a)
 
+    def freeze(self) -> 'FoxFrozenHSL':
+        """
+        Creates an immutable copy of this FoxHSL instance.
+
+        :return: A new FoxFrozenHSL instance with the same values as this
+        FoxHSL instance.
+        """
+        return FoxFrozenHSL(self._h, self._s, self._l, self._a)
+
     def with_hue(self, hue: int) -> 'FoxHSL':
         """
         Creates a new FoxHSL value with the given hue.
@@ -763,19 +829,12 @@ class FoxHSL(FoxColor):
 
         return r, g, b
 
-    def _fix_hue(self, hue: int) -> int:
+    def _fix_hue(self, hue: int | float) -> int | float:
         self._require_numeric('hue', hue)
 
-        while hue < 0:
-            hue += 360
-
-        while hue > 360:
-            hue -= 360
-
-        if hue == 360:
-            hue = 0
-
-        return int(hue)
+        # Fractional hues are kept so that converting between color spaces
+        # does not drift.
+        return hue % 360
 
 
 ################################################################################
@@ -800,7 +859,7 @@ class FoxHSV(FoxColor):
         """
         Initializes the new FoxHSV instance with the given arguments.
 
-        :param hue: Hue value as an int between 0 and 360 (inclusive).  If the
+        :param hue: Hue value as a number between 0 and 360 (inclusive).  If the
         given value falls outside of that range it will be 'corrected' to a
         value in that range to allow for negative rotations or over rotations.
 
@@ -1020,6 +1079,15 @@ class FoxHSV(FoxColor):
     def clone(self) -> 'FoxHSV':
         return FoxHSV(self._h, self._s, self._v, self._a)
 
+    def freeze(self) -> 'FoxFrozenHSV':
+        """
+        Creates an immutable copy of this FoxHSV instance.
+
+        :return: A new FoxFrozenHSV instance with the same values as this
+        FoxHSV instance.
+        """
+        return FoxFrozenHSV(self._h, self._s, self._v, self._a)
+
     def with_hue(self, hue: int) -> 'FoxHSV':
         """
         Creates a new FoxHSV value with the given hue.
@@ -1124,19 +1192,12 @@ class FoxHSV(FoxColor):
             return int(round(255 * (self._v - self._v * self._s * max(0, min(k, 4 - k, 1)))))
         return f(5), f(3), f(1)
 
-    def _fix_hue(self, hue: int) -> int:
+    def _fix_hue(self, hue: int | float) -> int | float:
         self._require_numeric('hue', hue)
 
-        while hue < 0:
-            hue += 360
-
-        while hue > 360:
-            hue -= 360
-
-        if hue == 360:
-            hue = 0
-
-        return int(hue)
+        # Fractional hues are kept so that converting between color spaces
+        # does not drift.
+        return hue % 360
 
 
 ################################################################################
@@ -1367,11 +1428,38 @@ class FoxRGB(FoxColor):
         r, g, b = color.rgb
         return FoxRGB(r, g, b, color.alpha)
 
+    @staticmethod
+    def from_oklab(lightness: float, a: float, b: float, alpha: float = 1.0) -> 'FoxRGB':
+        """
+        Creates a new FoxRGB instance from the given OKLab values.  Colors that
+        fall outside of the RGB range are clamped into it.
+        """
+        r, g, b = fox_oklab_to_rgb((lightness, a, b))
+        return FoxRGB(r, g, b, alpha)
+
+    @staticmethod
+    def from_lab(lightness: float, a: float, b: float, alpha: float = 1.0) -> 'FoxRGB':
+        """
+        Creates a new FoxRGB instance from the given CIELAB (D65) values.
+        Colors that fall outside of the RGB range are clamped into it.
+        """
+        r, g, b = fox_lab_to_rgb((lightness, a, b))
+        return FoxRGB(r, g, b, alpha)
+
     # Creation Methods #########################################################
 
     def clone(self) -> 'FoxRGB':
         return FoxRGB(self._r, self._g, self._b, self._a)
 
+    def freeze(self) -> 'FoxFrozenRGB':
+        """
+        Creates an immutable copy of this FoxRGB instance.
+
+        :return: A new FoxFrozenRGB instance with the same values as this
+        FoxRGB instance.
+        """
+        return FoxFrozenRGB(self._r, self._g, self._b, self._a)
+
     def with_red(self, red: int) -> 'FoxRGB':
         """
         Creates a new FoxRGB instance with the given red value.
@@ -1496,7 +1584,7 @@ class FoxRGB(FoxColor):
         h = 60 * ((h + 6) if h < 0 else h)
         s = c / v if v != 0 else 0
 
-        return int(round(h)), s, v
+        return h, s, v
 
     def _to_hsl(self) -> tuple[int, float, float]:
         r = self._r / 255
@@ -1525,7 +1613,7 @@ class FoxRGB(FoxColor):
                 raise Exception("illegal state")
         h *= 60
 
-        return int(round(h)), s, l
+        return h, s, l
 
     @staticmethod
     def _require_rgb(name: str, color: int) -> int:
@@ -1538,6 +1626,427 @@ class FoxRGB(FoxColor):
             return int(color)
 
 
+################################################################################
+#
+#   Frozen Classes
+#
+################################################################################
+
+
+class FoxFrozenColor(FoxColor):
+    """
+    Base type for the immutable color classes.
+
+    Frozen colors have no methods that change them, so they can be hashed and
+    used as dict keys or set members.  Their values are held in `__slots__`
+    rather than an instance dict, which makes them smaller and quicker to
+    create than the mutable color classes.
+
+    Each frozen color class keeps an intern table, see `intern`, through which
+    equal colors can share a single instance.
+
+    This type should not be instantiated directly, and attempting to do so will
+    raise an exception.
+    """
+
+    __slots__ = ()
+
+    # Most colors to keep in the intern table of each frozen color class.
+    INTERN_SIZE = 4096
+
+    def __init__(self, *args, **kwargs):
+        raise Exception('FoxFrozenColor cannot be constructed directly.')
+
+    def __eq__(self, other) -> bool:
+        return other is self or (type(other) is type(self) and other._key() == self._key())
+
+    def __hash__(self) -> int:
+        return hash((type(self), self._key()))
+
+    def __reduce__(self):
+        return type(self), self._key()
+
+    @classmethod
+    def intern(cls, *values) -> 'FoxFrozenColor':
+        """
+        Returns the shared instance of this class for the given values,
+        creating it if no equal instance has been interned yet.
+
+        When the intern table reaches `INTERN_SIZE` colors it is emptied, after
+        which newly interned colors are equal, but not identical, to the ones
+        interned before.
+
+        :param values: The values to construct the color from, in the same
+        order as the class constructor takes them.
+
+        :return: The shared frozen color instance equal to the given values.
+        """
+        table = cls._interned
+
+        try:
+            return table[values]
+        except KeyError:
+            pass
+
+        if len(table) >= cls.INTERN_SIZE:
+            table.clear()
+
+        color = cls(*values)
+
+        # The given values may not be in their stored form (hues over 360,
+        # ints for floats, etc.), so the instance is also looked up by its own
+        # values to find an equal color interned from different arguments.
+        out = table.setdefault(color._key(), color)
+        table[values] = out
+
+        return out
+
+    def set_alpha(self, alpha: float):
+        raise Exception(f'{self.__class__.__name__} instances cannot be modified')
+
+    def clone(self) -> FoxColor:
+        """
+        Creates a mutable copy of this color, the same as `thaw`.
+
+        :return: A new mutable color instance with the same values as this
+        color.
+        """
+        return self.thaw()
+
+    def thaw(self) -> FoxColor:
+        """
+        Creates a mutable copy of this color.
+
+        :return: A new mutable color instance of the matching type with the
+        same values as this color.  For example, calling this method on a
+        FoxFrozenRGB instance returns a FoxRGB instance.
+        """
+        raise Exception('thaw not yet implemented')
+
+    def rotate_hue_by_percent(self, percent: float) -> 'FoxFrozenColor':
+        return self.thaw().rotate_hue_by_percent(percent).freeze()
+
+    def rotate_hue_by_degrees(self, degrees: int) -> 'FoxFrozenColor':
+        return self.thaw().rotate_hue_by_degrees(degrees).freeze()
+
+    def shade(self, fraction: float) -> 'FoxFrozenColor':
+        return self.thaw().shade(fraction).freeze()
+
+    def tint(self, fraction: float) -> 'FoxFrozenColor':
+        return self.thaw().tint(fraction).freeze()
+
+    def _key(self) -> tuple:
+        raise Exception('_key not yet implemented')
+
+
+class FoxFrozenHSL(FoxFrozenColor):
+    """
+    Immutable color stored as hue, saturation, and lightness values.
+
+    See FoxHSL for the meaning and valid ranges of each value.
+    """
+
+    __slots__ = ('_h', '_s', '_l', '_a')
+
+    _interned: dict[tuple, 'FoxFrozenColor'] = {}
+
+    def __init__(
+        self,
+        hue: int | float,
+        saturation: float,
+        lightness: float,
+        alpha: float = 1.0
+    ) -> None:
+        self._h = self._fix_hue(hue)
+        self._s = self._clamp_percent(saturation)
+        self._l = self._clamp_percent(lightness)
+        self._a = self._require_percent('alpha', alpha)
+
+    hue = FoxHSL.hue
+    saturation = FoxHSL.saturation
+    lightness = FoxHSL.lightness
+    hsl = FoxHSL.hsl
+    hsla = FoxHSL.hsla
+    hsv = FoxHSL.hsv
+    hsva = FoxHSL.hsva
+    rgb = FoxHSL.rgb
+    rgba = FoxHSL.rgba
+
+    to_renpy_color = FoxHSL.to_renpy_color
+
+    def to_rgb(self) -> 'FoxFrozenRGB':
+        r, g, b = self._to_rgb()
+        return FoxFrozenRGB(r, g, b, self._a)
+
+    def to_hsl(self) -> 'FoxFrozenHSL':
+        return self
+
+    def to_hsv(self) -> 'FoxFrozenHSV':
+        h, s, v = self._to_hsv()
+        return FoxFrozenHSV(h, s, v, self._a)
+
+    def thaw(self) -> FoxHSL:
+        return FoxHSL(self._h, self._s, self._l, self._a)
+
+    def with_hue(self, hue: int | float) -> 'FoxFrozenHSL':
+        """
+        :return: A new FoxFrozenHSL value with the given hue, and this value's
+        saturation, lightness, and alpha.
+        """
+        return FoxFrozenHSL(hue, self._s, self._l, self._a)
+
+    def with_saturation(self, saturation: float) -> 'FoxFrozenHSL':
+        """
+        :return: A new FoxFrozenHSL value with the given saturation, and this
+        value's hue, lightness, and alpha.
+        """
+        return FoxFrozenHSL(self._h, saturation, self._l, self._a)
+
+    def with_lightness(self, lightness: float) -> 'FoxFrozenHSL':
+        """
+        :return: A new FoxFrozenHSL value with the given lightness, and this
+        value's hue, saturation, and alpha.
+        """
+        return FoxFrozenHSL(self._h, self._s, lightness, self._a)
+
+    def with_alpha(self, alpha: float) -> 'FoxFrozenHSL':
+        """
+        :return: A new FoxFrozenHSL value with the given alpha, and this value's
+        hue, saturation, and lightness.
+        """
+        return FoxFrozenHSL(self._h, self._s, self._l, alpha)
+
+    def with_values(
+        self,
+        hue: int | float = None,
+        saturation: float = None,
+        lightness: float = None,
+        alpha: float = None
+    ) -> 'FoxFrozenHSL':
+        """
+        :return: A new FoxFrozenHSL value with the given values, defaulting any
+        values that are unset or None to this value's values.
+        """
+        return FoxFrozenHSL(
+            hue if hue is not None else self._h,
+            saturation if saturation is not None else self._s,
+            lightness if lightness is not None else self._l,
+            alpha if alpha is not None else self._a,
+        )
+
+    _to_hsv = FoxHSL._to_hsv
+    _to_rgb = FoxHSL._to_rgb
+    _fix_hue = FoxHSL._fix_hue
+
+    def _key(self) -> tuple[int | float, float, float, float]:
+        return self._h, self._s, self._l, self._a
+
+
+class FoxFrozenHSV(FoxFrozenColor):
+    """
+    Immutable color stored as hue, saturation, and value values.
+
+    See FoxHSV for the meaning and valid ranges of each value.
+    """
+
+    __slots__ = ('_h', '_s', '_v', '_a')
+
+    _interned: dict[tuple, 'FoxFrozenColor'] = {}
+
+    def __init__(
+        self,
+        hue: int | float,
+        saturation: float,
+        value: float,
+        alpha: float = 1.0
+    ) -> None:
+        self._h = self._fix_hue(hue)
+        self._s = self._clamp_percent(saturation)
+        self._v = self._clamp_percent(value)
+        self._a = self._require_percent('alpha', alpha)
+
+    hue = FoxHSV.hue
+    saturation = FoxHSV.saturation
+    value = FoxHSV.value
+    hsl = FoxHSV.hsl
+    hsla = FoxHSV.hsla
+    hsv = FoxHSV.hsv
+    hsva = FoxHSV.hsva
+    rgb = FoxHSV.rgb
+    rgba = FoxHSV.rgba
+
+    to_renpy_color = FoxHSV.to_renpy_color
+
+    def to_rgb(self) -> 'FoxFrozenRGB':
+        r, g, b = self._to_rgb()
+        return FoxFrozenRGB(r, g, b, self._a)
+
+    def to_hsl(self) -> FoxFrozenHSL:
+        h, s, l = self._to_hsl()
+        return FoxFrozenHSL(h, s, l, self._a)
+
+    def to_hsv(self) -> 'FoxFrozenHSV':
+        return self
+
+    def thaw(self) -> FoxHSV:
+        return FoxHSV(self._h, self._s, self._v, self._a)
+
+    def with_hue(self, hue: int | float) -> 'FoxFrozenHSV':
+        """
+        :return: A new FoxFrozenHSV value with the given hue, and this value's
+        saturation, value, and alpha.
+        """
+        return FoxFrozenHSV(hue, self._s, self._v, self._a)
+
+    def with_saturation(self, saturation: float) -> 'FoxFrozenHSV':
+        """
+        :return: A new FoxFrozenHSV value with the given saturation, and this
+        value's hue, value, and alpha.
+        """
+        return FoxFrozenHSV(self._h, saturation, self._v, self._a)
+
+    def with_value(self, value: float) -> 'FoxFrozenHSV':
+        """
+        :return: A new FoxFrozenHSV value with the given value, and this value's
+        hue, saturation, and alpha.
+        """
+        return FoxFrozenHSV(self._h, self._s, value, self._a)
+
+    def with_alpha(self, alpha: float) -> 'FoxFrozenHSV':
+        """
+        :return: A new FoxFrozenHSV value with the given alpha, and this value's
+        hue, saturation, and value.
+        """
+        return FoxFrozenHSV(self._h, self._s, self._v, alpha)
+
+    def with_values(
+        self,
+        hue: int | float = None,
+        saturation: float = None,
+        value: float = None,
+        alpha: float = None
+    ) -> 'FoxFrozenHSV':
+        """
+        :return: A new FoxFrozenHSV value with the given values, defaulting any
+        values that are unset or None to this value's values.
+        """
+        return FoxFrozenHSV(
+            hue if hue is not None else self._h,
+            saturation if saturation is not None else self._s,
+            value if value is not None else self._v,
+            alpha if alpha is not None else self._a,
+        )
+
+    _to_hsl = FoxHSV._to_hsl
+    _to_rgb = FoxHSV._to_rgb
+    _fix_hue = FoxHSV._fix_hue
+
+    def _key(self) -> tuple[int | float, float, float, float]:
+        return self._h, self._s, self._v, self._a
+
+
+class FoxFrozenRGB(FoxFrozenColor):
+    """
+    Immutable color stored as red, green, and blue channel values.
+
+    See FoxRGB for the meaning and valid ranges of each value.
+    """
+
+    __slots__ = ('_r', '_g', '_b', '_a')
+
+    _interned: dict[tuple, 'FoxFrozenColor'] = {}
+
+    def __init__(
+        self,
+        red: int,
+        green: int,
+        blue: int,
+        alpha: float = 1.0
+    ) -> None:
+        self._r = FoxRGB._require_rgb('red', red)
+        self._g = FoxRGB._require_rgb('green', green)
+        self._b = FoxRGB._require_rgb('blue', blue)
+        self._a = self._require_percent('alpha', alpha)
+
+    red = FoxRGB.red
+    green = FoxRGB.green
+    blue = FoxRGB.blue
+    rgb = FoxRGB.rgb
+    rgba = FoxRGB.rgba
+    hsl = FoxRGB.hsl
+    hsla = FoxRGB.hsla
+    hsv = FoxRGB.hsv
+    hsva = FoxRGB.hsva
+
+    to_renpy_color = FoxRGB.to_renpy_color
+
+    def to_rgb(self) -> 'FoxFrozenRGB':
+        return self
+
+    def to_hsl(self) -> FoxFrozenHSL:
+        h, s, l = self._to_hsl()
+        return FoxFrozenHSL(h, s, l, self._a)
+
+    def to_hsv(self) -> FoxFrozenHSV:
+        h, s, v = self._to_hsv()
+        return FoxFrozenHSV(h, s, v, self._a)
+
+    def thaw(self) -> FoxRGB:
+        return FoxRGB(self._r, self._g, self._b, self._a)
+
+    def with_red(self, red: int) -> 'FoxFrozenRGB':
+        """
+        :return: A new FoxFrozenRGB value with the given red value, and this
+        value's green, blue, and alpha.
+        """
+        return FoxFrozenRGB(red, self._g, self._b, self._a)
+
+    def with_green(self, green: int) -> 'FoxFrozenRGB':
+        """
+        :return: A new FoxFrozenRGB value with the given green value, and this
+        value's red, blue, and alpha.
+        """
+        return FoxFrozenRGB(self._r, green, self._b, self._a)
+
+    def with_blue(self, blue: int) -> 'FoxFrozenRGB':
+        """
+        :return: A new FoxFrozenRGB value with the given blue value, and this
+        value's red, green, and alpha.
+        """
+        return FoxFrozenRGB(self._r, self._g, blue, self._a)
+
+    def with_alpha(self, alpha: float) -> 'FoxFrozenRGB':
+        """
+        :return: A new FoxFrozenRGB value with the given alpha, and this value's
+        red, green, and blue.
+        """
+        return FoxFrozenRGB(self._r, self._g, self._b, alpha)
+
+    def with_values(
+        self,
+        red: int = None,
+        green: int = None,
+        blue: int = None,
+        alpha: float = None
+    ) -> 'FoxFrozenRGB':
+        """
+        :return: A new FoxFrozenRGB value with the given values, defaulting any
+        values that are unset or None to this value's values.
+        """
+        return FoxFrozenRGB(
+            red if red is not None else self._r,
+            green if green is not None else self._g,
+            blue if blue is not None else self._b,
+            alpha if alpha is not None else self._a,
+        )
+
+    _to_hsv = FoxRGB._to_hsv
+    _to_hsl = FoxRGB._to_hsl
+
+    def _key(self) -> tuple[int, int, int, float]:
+        return self._r, self._g, self._b, self._a
+
+
 ################################################################################
 #
 #   Public Functions
@@ -1601,6 +2110,93 @@ def hex_to_fox_rgb(rgb_hex: str) -> FoxRGB:
         raise Exception('illegal state')
 
 
+def fox_rgb_to_oklab(rgb: tuple[int, int, int]) -> tuple[float, float, float]:
+    """
+    RGB to OKLab.  Converts the given sRGB color to the OKLab color space, in
+    which the distance between two colors follows how different they look.
+
+    :param rgb: Tuple of red, green, and blue channel values, each as an int
+    between 0 and 255 (inclusive).
+
+    :return: Tuple of the OKLab lightness (`0.0` to `1.0`), a, and b values.
+    """
+    r, g, b = (_fox_srgb_to_linear(c) for c in rgb)
+
+    l = (0.4122214708 * r + 0.5363325363 * g + 0.0514459929 * b) ** (1 / 3)
+    m = (0.2119034982 * r + 0.6806995451 * g + 0.1073969566 * b) ** (1 / 3)
+    s = (0.0883024619 * r + 0.2817188376 * g + 0.6299787005 * b) ** (1 / 3)
+
+    return (
+        0.2104542553 * l + 0.7936177850 * m - 0.0040720468 * s,
+        1.9779984951 * l - 2.4285922050 * m + 0.4505937099 * s,
+        0.0259040371 * l + 0.7827717662 * m - 0.8086757660 * s,
+    )
+
+
+def fox_oklab_to_rgb(lab: tuple[float, float, float]) -> tuple[int, int, int]:
+    """
+    OKLab to RGB.  Converts the given OKLab color to sRGB.  Colors that fall
+    outside of the sRGB range are clamped into it.
+
+    :param lab: Tuple of the OKLab lightness, a, and b values.
+
+    :return: Tuple of red, green, and blue channel values.
+    """
+    L, a, b = lab
+
+    l = (L + 0.3963377774 * a + 0.2158037573 * b) ** 3
+    m = (L - 0.1055613458 * a - 0.0638541728 * b) ** 3
+    s = (L - 0.0894841775 * a - 1.2914855480 * b) ** 3
+
+    return (
+        _fox_linear_to_srgb(4.0767416621 * l - 3.3077115913 * m + 0.2309699292 * s),
+        _fox_linear_to_srgb(-1.2684380046 * l + 2.6097574011 * m - 0.3413193965 * s),
+        _fox_linear_to_srgb(-0.0041960863 * l - 0.7034186147 * m + 1.7076147010 * s),
+    )
+
+
+def fox_rgb_to_lab(rgb: tuple[int, int, int]) -> tuple[float, float, float]:
+    """
+    RGB to CIELAB.  Converts the given sRGB color to the CIELAB color space
+    using the D65 white point.
+
+    :param rgb: Tuple of red, green, and blue channel values, each as an int
+    between 0 and 255 (inclusive).
+
+    :return: Tuple of the CIELAB lightness (`0.0` to `100.0`), a, and b values.
+    """
+    r, g, b = (_fox_srgb_to_linear(c) for c in rgb)
+
+    x = _fox_lab_f((0.4124564 * r + 0.3575761 * g + 0.1804375 * b) / 0.95047)
+    y = _fox_lab_f(0.2126729 * r + 0.7151522 * g + 0.0721750 * b)
+    z = _fox_lab_f((0.0193339 * r + 0.1191920 * g + 0.9503041 * b) / 1.08883)
+
+    return 116 * y - 16, 500 * (x - y), 200 * (y - z)
+
+
+def fox_lab_to_rgb(lab: tuple[float, float, float]) -> tuple[int, int, int]:
+    """
+    CIELAB to RGB.  Converts the given CIELAB (D65) color to sRGB.  Colors that
+    fall outside of the sRGB range are clamped into it.
+
+    :param lab: Tuple of the CIELAB lightness, a, and b values.
+
+    :return: Tuple of red, green, and blue channel values.
+    """
+    L, a, b = lab
+
+    fy = (L + 16) / 116
+    x = _fox_lab_f_inverse(fy + a / 500) * 0.95047
+    y = _fox_lab_f_inverse(fy)
+    z = _fox_lab_f_inverse(fy - b / 200) * 1.08883
+
+    return (
+        _fox_linear_to_srgb(3.2404542 * x - 1.5371385 * y - 0.4985314 * z),
+        _fox_linear_to_srgb(-0.9692660 * x + 1.8760108 * y + 0.0415560 * z),
+        _fox_linear_to_srgb(0.0556434 * x - 0.2040259 * y + 1.0572252 * z),
+    )
+
+
 ################################################################################
 #
 #   Internal Functions
@@ -1615,3 +2211,93 @@ def __fox_expand_hex_color(rgb_hex: str) -> str:
         out += c + c
 
     return out
+
+
+def _fox_srgb_to_linear(channel: int) -> float:
+    c = channel / 255
+
+    return c / 12.92 if c <= 0.04045 else ((c + 0.055) / 1.055) ** 2.4
+
+
+def _fox_linear_to_srgb(value: float) -> int:
+    c = 12.92 * value if value <= 0.0031308 else 1.055 * value ** (1 / 2.4) - 0.055
+
+    return int(round(min(max(c, 0.0), 1.0) * 255))
+
+
+def _fox_lab_f(t: float) -> float:
+    return t ** (1 / 3) if t > 216 / 24389 else (24389 / 27 * t + 16) / 116
+
+
+def _fox_lab_f_inverse(t: float) -> float:
+    return t ** 3 if t > 6 / 29 else (116 * t - 16) * 27 / 24389
+
+
+def _fox_delta_e_2000(lab1: tuple[float, float, float], lab2: tuple[float, float, float]) -> float:
+    L1, a1, b1 = lab1
+    L2, a2, b2 = lab2
+
+    # Chroma, with the a axis stretched for near neutral colors.
+    c = (math.hypot(a1, b1) + math.hypot(a2, b2)) / 2
+    g = 0.5 * (1 - math.sqrt(c ** 7 / (c ** 7 + 25 ** 7)))
+
+    a1 = (1 + g) * a1
+    a2 = (1 + g) * a2
+
+    c1 = math.hypot(a1, b1)
+    c2 = math.hypot(a2, b2)
+
+    h1 = math.degrees(math.atan2(b1, a1)) % 360
+    h2 = math.degrees(math.atan2(b2, a2)) % 360
+
+    # Differences.
+    dl = L2 - L1
+    dc = c2 - c1
+
+    if c1 * c2 == 0:
+        dh = 0.0
+    elif abs(h2 - h1) <= 180:
+        dh = h2 - h1
+    elif h2 - h1 > 180:
+        dh = h2 - h1 - 360
+    else:
+        dh = h2 - h1 + 360
+
+    dh = 2 * math.sqrt(c1 * c2) * math.sin(math.radians(dh / 2))
+
+    # Means.
+    l = (L1 + L2) / 2
+    c = (c1 + c2) / 2
+
+    if c1 * c2 == 0:
+        h = h1 + h2
+    elif abs(h1 - h2) <= 180:
+        h = (h1 + h2) / 2
+    elif h1 + h2 < 360:
+        h = (h1 + h2 + 360) / 2
+    else:
+        h = (h1 + h2 - 360) / 2
+
+    # Weighting.
+    t = (
+        1
+        - 0.17 * math.cos(math.radians(h - 30))
+        + 0.24 * math.cos(math.radians(2 * h))
+        + 0.32 * math.cos(math.radians(3 * h + 6))
+        - 0.20 * math.cos(math.radians(4 * h - 63))
+    )
+
+    sl = 1 + 0.015 * (l - 50) ** 2 / math.sqrt(20 + (l - 50) ** 2)
+    sc = 1 + 0.045 * c
+    sh = 1 + 0.015 * c * t
+
+    rt = (
+        -math.sin(math.radians(60 * math.exp(-(((h - 275) / 25) ** 2))))
+        * 2 * math.sqrt(c ** 7 / (c ** 7 + 25 ** 7))
+    )
+
+    dl /= sl
+    dc /= sc
+    dh /= sh
+
+    return math.sqrt(dl ** 2 + dc ** 2 + dh ** 2 + rt * dc * dh)
@@ -5,57 +5,66 @@ from classes_ren import ColorPicker
 init -2 python:
 """
 
-def _color_picker_preview_cb(st: float, at: float, picker: ColorPicker):
-    return (picker.color.hex, 0.01)
-
 def _color_picker_normalize_rgb(rgb: tuple[int, int, int]) -> tuple[float, float, float]:
     return (rgb[0]/255, rgb[1]/255, rgb[2]/255)
 
+# The bar setters are built once per picker and channel, and handed back on
+# every following screen update.
+
 def _color_picker_rgb_bar_setter(picker: ColorPicker, channel: str):
+    return picker._setter(('rgb', channel), _color_picker_make_rgb_bar_setter, channel)
+
+def _color_picker_hsv_bar_setter(picker: ColorPicker, channel: str):
+    return picker._setter(('hsv', channel), _color_picker_make_hsv_bar_setter, channel)
+
+def _color_picker_hsl_bar_setter(picker: ColorPicker, channel: str):
+    return picker._setter(('hsl', channel), _color_picker_make_hsl_bar_setter, channel)
+
+def _color_picker_make_rgb_bar_setter(picker: ColorPicker, channel: str):
     def setter(value: int):
         if channel == 'r':
-            picker.rgb.set_red(value)
+            color = picker.rgb.with_red(value)
         elif channel == 'g':
-            picker.rgb.set_green(value)
+            color = picker.rgb.with_green(value)
         elif channel == 'b':
-            picker.rgb.set_blue(value)
+            color = picker.rgb.with_blue(value)
         else:
             raise Exception('illegal state')
 
-        picker.set_color(picker.rgb)
+        picker.set_color(color, True)
         renpy.restart_interaction()
 
 
     return setter
 
-def _color_picker_hsv_bar_setter(picker: ColorPicker, channel: str):
+def _color_picker_make_hsv_bar_setter(picker: ColorPicker, channel: str):
     def setter(value: int | float):
         if channel == 'h':
-            picker.hsv.set_hue(value)
+            color = picker.hsv.with_hue(value)
         elif channel == 's':
-            picker.hsv.set_saturation(value)
+            color = picker.hsv.with_saturation(value)
         elif channel == 'v':
-            picker.hsv.set_value(value)
+            color = picker.hsv.with_value(value)
         else:
             raise Exception('illegal state')
 
-        picker.set_color(picker.hsv)
+        picker.set_color(color, True)
         renpy.restart_interaction()
 
     return setter
 
-def _color_picker_hsl_bar_setter(picker: ColorPicker, channel: str):
+def _color_picker_make_hsl_bar_setter(picker: ColorPicker, channel: str):
     def setter(value: int | float):
         if channel == 'h':
-            picker.hsl.set_hue(value)
+            color = picker.hsl.with_hue(value)
         elif channel == 's':
-            picker.hsl.set_saturation(value)
+            color = picker.hsl.with_saturation(value)
         elif channel == 'l':
-            picker.hsl.set_lightness(value)
+            color = picker.hsl.with_lightness(value)
         else:
             raise Exception('illegal state')
 
-        picker.set_color(picker.hsl)
+        picker.set_color(color, True)
         renpy.restart_interaction()
 
     return setter
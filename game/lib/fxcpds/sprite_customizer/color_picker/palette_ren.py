@@ -0,0 +1,193 @@
+from fox_color_ren import FoxColor, FoxFrozenColor, FoxFrozenRGB, hex_to_fox_rgb
+from fox_color_batch_ren import fox_batch_hex_to_rgb, fox_batch_rgb_to_oklab, _fox_batch_sample
+
+"""renpy
+init -2 python:
+"""
+
+
+class FoxPalette(object):
+    """
+    Represents a fixed set of colors that free color picks may be snapped to.
+
+    The palette is indexed once, when it is created, in a k-d tree over the
+    OKLab color space, where the distance between two colors follows how
+    different they look.  Finding the palette color nearest to another color
+    then only visits a handful of palette entries instead of every one.
+    """
+
+    # Most snapped colors to remember.
+    MEMO_SIZE = 1024
+
+    def __init__(self, colors: list[str | FoxColor]) -> None:
+        """
+        Initializes the new FoxPalette instance with the given colors.
+
+        :param colors: List of hex color strings and/or FoxColor instances.
+        Alpha channels are ignored, and repeated colors are only kept once.
+        """
+        if not isinstance(colors, (list, tuple)) or len(colors) < 1:
+            raise Exception('"colors" must be a non-empty list of colors')
+
+        hexes = []
+        entries = []
+        seen = set()
+
+        for color in colors:
+            if isinstance(color, str):
+                rgb = hex_to_fox_rgb(color)
+            elif isinstance(color, FoxColor):
+                rgb = color.to_rgb()
+            else:
+                raise Exception('palette colors must be hex strings or FoxColor instances')
+
+            value = rgb.with_alpha(1.0).hex
+
+            if value not in seen:
+                seen.add(value)
+                hexes.append(value)
+                entries.append(FoxFrozenRGB.intern(rgb.red, rgb.green, rgb.blue))
+
+        self._colors = tuple(hexes)
+        self._entries = tuple(entries)
+        self._color_set = frozenset(seen)
+        self._points = fox_batch_rgb_to_oklab([(r, g, b) for r, g, b, _ in fox_batch_hex_to_rgb(hexes)])
+        self._tree = self._build(list(range(len(hexes))), 0)
+        self._memo: dict[str | FoxFrozenColor, str] = {}
+        self._seed_memo()
+
+    def _seed_memo(self) -> None:
+        # Every palette color is its own nearest color, so snapping a color
+        # that is already in the palette never has to search the tree.
+        for value, entry in zip(self._colors, self._entries):
+            self._memo[value] = value
+            self._memo[entry] = value
+
+    def __len__(self) -> int:
+        return len(self._colors)
+
+    def __contains__(self, value: str | FoxColor) -> bool:
+        if isinstance(value, str):
+            if value in self._color_set:
+                return True
+
+            # Compare other spellings of the same color, such as upper case or
+            # short hex strings, in the form the palette colors are kept in.
+            try:
+                value = hex_to_fox_rgb(value)
+            except Exception:
+                return False
+        elif not isinstance(value, FoxColor):
+            return False
+
+        return value.to_rgb().with_alpha(1.0).hex in self._color_set
+
+    @property
+    def entries(self) -> tuple[FoxFrozenRGB, ...]:
+        """
+        :return: The palette colors as interned FoxFrozenRGB instances, in the
+        same order as `colors`.  These are shared with every other palette that
+        holds the same color.
+        """
+        return self._entries
+
+    @property
+    def colors(self) -> tuple[str, ...]:
+        """
+        :return: The palette colors as `#rrggbb` hex strings, in the order
+        they were given.
+        """
+        return self._colors
+
+    def nearest(self, color: str | FoxColor) -> str:
+        """
+        Finds the palette color that looks closest to the given color.
+
+        :param color: Hex color string or FoxColor instance to look up.
+
+        :return: The nearest palette color as a `#rrggbb` hex string.
+        """
+        # Frozen colors are hashable, so they can be looked up as they are
+        # instead of being converted to a hex string first.
+        if isinstance(color, (str, FoxFrozenColor)):
+            key = color
+        else:
+            key = color.to_rgb().with_alpha(1.0).hex
+
+        try:
+            return self._memo[key]
+        except KeyError:
+            pass
+
+        rgb = hex_to_fox_rgb(color) if isinstance(color, str) else color.to_rgb()
+        target = rgb.oklab
+
+        best = [None, float('inf')]
+        self._search(self._tree, target, best)
+        out = self._colors[best[0]]
+
+        if len(self._memo) >= self.MEMO_SIZE + 2 * len(self._colors):
+            self._memo.clear()
+            self._seed_memo()
+
+        self._memo[key] = out
+        return out
+
+    def farthest_point_sample(self, n: int) -> tuple[str, ...]:
+        """
+        Picks the `n` palette colors that look the most different from each
+        other, for example to give a crowd of NPCs clearly distinct colors.
+
+        The first palette color is always picked first, after which each pick
+        is the color that is furthest from every color picked before it.
+
+        :param n: Number of colors to pick.  If this is more than the number of
+        palette colors, every palette color is picked.
+
+        :return: The picked colors as `#rrggbb` hex strings, in the order they
+        were picked.
+        """
+        return tuple(self._colors[i] for i in _fox_batch_sample(self._points, n))
+
+    def _build(self, indices: list[int], depth: int):
+        if len(indices) == 0:
+            return None
+
+        axis = depth % 3
+        indices.sort(key=lambda i: self._points[i][axis])
+        mid = len(indices) // 2
+
+        return (
+            indices[mid],
+            axis,
+            self._build(indices[:mid], depth + 1),
+            self._build(indices[mid + 1:], depth + 1),
+        )
+
+    def _search(self, node, target: tuple[float, float, float], best: list):
+        if node is None:
+            return
+
+        index, axis, left, right = node
+        point = self._points[index]
+
+        d = (
+            (point[0] - target[0]) ** 2
+            + (point[1] - target[1]) ** 2
+            + (point[2] - target[2]) ** 2
+        )
+
+        if d < best[1]:
+            best[0] = index
+            best[1] = d
+
+        diff = target[axis] - point[axis]
+        near, far = (left, right) if diff < 0 else (right, left)
+
+        self._search(near, target, best)
+
+        # Only look on the far side of the split if the nearest color found so
+        # far is further away than the splitting plane.
+        if diff * diff < best[1]:
+            self._search(far, target, best)
+
@@ -0,0 +1,78 @@
+import renpy  # type: ignore
+from renpy.store import Solid  # type: ignore
+
+"""renpy
+init -2 python:
+"""
+
+from collections import OrderedDict
+from typing import Callable
+
+
+class ColorSwatch(renpy.Displayable):
+    """
+    Color Swatch Displayable
+    ========================
+
+    Fills its area with a solid color read from a source function.
+
+    The source is only checked when an interaction starts, which is when the
+    color it reports may have changed, and the swatch is only redrawn when
+    the color actually differs from the one last drawn.  An unchanged swatch
+    costs nothing between interactions.
+
+    Class Properties
+    ----------------
+    CACHE_SIZE : int
+        Maximum number of solids kept, keyed by hex value, shared by all
+        swatches.
+    """
+
+    CACHE_SIZE = 64
+
+    _solids: OrderedDict = OrderedDict()
+
+    def __init__(self, source: Callable[[], str], **kwargs) -> None:
+        """
+        Initializes a new ColorSwatch instance with the given arguments.
+
+        Arguments
+        ---------
+        source : callable
+            Function taking no arguments and returning the hex color string
+            to display.
+        """
+        super(ColorSwatch, self).__init__(**kwargs)
+
+        self._source = source
+        self._hex: str | None = None
+
+    def render(self, width, height, st, at) -> renpy.Render:
+        self._hex = self._source()
+        return renpy.render(self.solid(self._hex), width, height, st, at)
+
+    def per_interact(self) -> None:
+        if self._source() != self._hex:
+            renpy.redraw(self, 0)
+
+    def visit(self) -> list[renpy.Displayable]:
+        return [] if self._hex is None else [self.solid(self._hex)]
+
+    @staticmethod
+    def solid(hex: str) -> renpy.Displayable:
+        """
+        Returns the shared solid for the given hex color string.
+        """
+        try:
+            ColorSwatch._solids.move_to_end(hex)
+            return ColorSwatch._solids[hex]
+        except KeyError:
+            pass
+
+        while len(ColorSwatch._solids) >= ColorSwatch.CACHE_SIZE:
+            ColorSwatch._solids.popitem(last=False)
+
+        out = Solid(hex)
+        ColorSwatch._solids[hex] = out
+
+        return out
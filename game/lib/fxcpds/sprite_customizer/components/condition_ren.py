@@ -0,0 +1,112 @@
+"""renpy
+init -1 python:
+"""
+
+import inspect
+from typing import Callable
+
+
+class SCCondition:
+    """
+    # Sprite Customizer Condition
+
+    A test over the selection values of one or more options, used to decide
+    whether a part of a sprite is currently in use.
+
+    Conditions may be declared either as a dict of option values, where every
+    listed option must have the given value, or as a function taking option
+    values as keyword arguments and returning a boolean.  A `set` of values
+    may be given in a dict to match any of them.
+
+    ```python
+    SCCondition({"has_accessory": True, "clothes": {"plaid", "stripes"}})
+    SCCondition(lambda height, **kwargs: height > 1.0)
+    ```
+
+    The options a condition depends on are worked out once, when it is
+    created, from the dict keys or from the function's parameter names.  A
+    function that accepts `**kwargs` depends on every option.
+    """
+
+    def __init__(self, spec: dict[str, any] | Callable[..., bool]):
+        """
+        Initializes the new SCCondition instance.
+
+        Arguments
+        ---------
+        spec : dict | callable
+            Dict of required option values keyed by option key, or a function
+            taking option values as keyword arguments.
+        """
+        if isinstance(spec, dict):
+            if len(spec) < 1:
+                raise Exception("condition dict must contain at least one option key")
+
+            self._keys: tuple[str, ...] | None = tuple(spec.keys())
+            self._expected = tuple(
+                (key, frozenset(value) if isinstance(value, set) else value)
+                for key, value in spec.items()
+            )
+            self._predicate = None
+        elif callable(spec):
+            self._keys = self._parameter_keys(spec)
+            self._expected = None
+            self._predicate = spec
+        else:
+            raise Exception("condition must be a dict of option values or a callable")
+
+    @property
+    def keys(self) -> tuple[str, ...] | None:
+        """
+        Keys of the options this condition depends on, or `None` if it depends
+        on every option.
+        """
+        return self._keys
+
+    def test(self, values: dict[str, any]) -> bool:
+        """
+        Tests whether the given option values satisfy this condition.
+
+        Arguments
+        ---------
+        values : dict
+            Option values keyed by option key.  Must contain a value for every
+            key this condition depends on.
+
+        Returns
+        -------
+        bool
+            Whether the condition is met.
+        """
+        if self._predicate is None:
+            for key, expected in self._expected:
+                value = values[key]
+
+                if isinstance(expected, frozenset):
+                    if value not in expected:
+                        return False
+                elif value != expected:
+                    return False
+
+            return True
+
+        if self._keys is None:
+            return bool(self._predicate(**values))
+
+        return bool(self._predicate(**{key: values[key] for key in self._keys}))
+
+    @staticmethod
+    def _parameter_keys(func: Callable[..., bool]) -> tuple[str, ...] | None:
+        keys = []
+
+        for param in inspect.signature(func).parameters.values():
+            if param.kind == param.VAR_KEYWORD:
+                return None
+
+            if param.kind in (param.POSITIONAL_OR_KEYWORD, param.KEYWORD_ONLY):
+                keys.append(param.name)
+
+        if len(keys) < 1:
+            raise Exception("condition function must take at least one option value argument")
+
+        return tuple(keys)
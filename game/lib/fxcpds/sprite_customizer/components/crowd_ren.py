@@ -0,0 +1,232 @@
+import renpy  # type: ignore
+from renpy.store import Displayable, Fixed  # type: ignore
+
+from .layer_order_ren import SCLayerOrder
+from .lru_cache_ren import SCLRUCache
+from ..state.state_ren import SCState
+
+"""renpy
+init -1 python:
+"""
+
+from typing import Callable
+
+
+# noinspection PyProtectedMember
+class SCCrowdCache:
+    """
+    # Sprite Customizer Crowd Cache
+
+    Cache of flattened sprite composites shared by every `SCCrowd` created
+    from the same `CustomizedSpriteFactory`.
+
+    A composite is the stack of layer displayables a sprite shows for one
+    combination of selections.  Composites are keyed by the index of each
+    enabled layer and the values its providers receive, so NPCs that look the
+    same share a single composite, and layer displayables that appear in
+    several composites are created only once so their textures are shared as
+    well.  Layer providers are only called when a combination of values is
+    first seen.
+    """
+
+    def __init__(self, layers: list, transform: Callable[[Displayable], Displayable] | None = None):
+        """
+        Initializes the new SCCrowdCache instance.
+
+        Arguments
+        ---------
+        layers : list[SCLayer]
+            Layers to build composites from.  These should be layers that are
+            not used by any sprite, as crowd entries are resolved without
+            binding the layers to their states.
+
+        transform : callable | None
+            Optional transform function applied to every composite.
+        """
+        self._layers = layers
+        self._transform = transform
+
+        options = {}
+        for layer in layers:
+            options.update(layer._options)
+
+        for layer in layers:
+            layer._bind_conditions(options)
+
+        if any(len(layer._z_rules) > 0 or layer._z_index != 0 for layer in layers):
+            self._order: SCLayerOrder | None = SCLayerOrder(layers, options)
+        else:
+            self._order = None
+
+        self._parts = SCLRUCache(sc.crowd_cache_size * max(1, len(layers)))
+        self._composites = SCLRUCache(sc.crowd_cache_size)
+
+    def composite_for(self, state: SCState) -> Displayable:
+        """
+        Looks up or creates the composite of the layers as they appear for the
+        given state.
+
+        Arguments
+        ---------
+        state : SCState
+            State to look option values up in.
+
+        Returns
+        -------
+        Displayable
+            The sprite composite for the state.
+        """
+        order = range(len(self._layers)) if self._order is None else self._order.order_for(state)
+
+        key = []
+        for i in order:
+            layer = self._layers[i]
+
+            if layer._is_enabled_for(state):
+                key.append((i, layer._selection_key(state)))
+
+        key = tuple(key)
+
+        def build() -> Displayable:
+            out = Fixed(*[self._part(part, state) for part in key], fit_first=True)
+            return out if self._transform is None else self._transform(out)
+
+        return self._composites.get(key, build)
+
+    def clear(self):
+        """
+        Removes all composites and layer displayables from the cache.
+        """
+        self._parts.clear()
+        self._composites.clear()
+
+    def _part(self, part: tuple[int, tuple], state: SCState) -> Displayable:
+        def build() -> Displayable:
+            layer = self._layers[part[0]]
+            out = renpy.displayable(layer._displayable_for(state))
+
+            return out if layer._transform is None else layer._transform(out)
+
+        return self._parts.get(part, build)
+
+
+class SCCrowd(renpy.Displayable):
+    """
+    # Sprite Customizer Crowd
+
+    Displayable that draws many sprites built from the same
+    `CustomizedSpriteFactory` into a single render.
+
+    Each entry of the crowd is an `(state, position)` or
+    `(state, position, transform)` tuple.  Positions are `(x, y)` pairs of
+    the top left corner of the sprite, where ints are pixels and floats are
+    fractions of the area the crowd is drawn in.  The optional transform is a
+    function taking the sprite's displayable and returning a displayable.
+
+    ```python
+    crowd = npc_factory.crowd([(SCState(s), (i * 120, 200)) for i, s in enumerate(npcs)])
+    ```
+
+    Sprites are only resolved again when an interaction starts, which is
+    when selections may have changed, and are otherwise drawn from the
+    factory's shared composite cache.
+    """
+
+    def __init__(self, cache: SCCrowdCache, entries: list[tuple] | None = None, **kwargs):
+        super().__init__(**kwargs)
+
+        self._cache = cache
+        self._entries: list[tuple[SCState, tuple, Callable | None]] = []
+        self._children: list[Displayable] | None = None
+        self._composites: list[Displayable] = []
+
+        if entries is not None:
+            self.set_entries(entries)
+
+    @property
+    def entries(self) -> list[tuple]:
+        """
+        The entries of this crowd.
+        """
+        return [*self._entries]
+
+    def set_entries(self, entries: list[tuple]):
+        """
+        Replaces the entries of this crowd.
+
+        Arguments
+        ---------
+        entries : list[tuple]
+            List of `(state, position)` or `(state, position, transform)`
+            tuples.
+        """
+        out = []
+
+        for entry in entries:
+            if not isinstance(entry, tuple) or len(entry) not in (2, 3):
+                raise Exception("SCCrowd entries must be (state, position) or (state, position, transform) tuples.")
+
+            state, pos = entry[0], entry[1]
+            transform = entry[2] if len(entry) == 3 else None
+
+            if not isinstance(state, SCState):
+                raise Exception("SCCrowd entry states must be SCState instances.")
+
+            if not isinstance(pos, tuple) or len(pos) != 2:
+                raise Exception("SCCrowd entry positions must be (x, y) tuples.")
+
+            if transform is not None and not callable(transform):
+                raise Exception("SCCrowd entry transforms must be callable.")
+
+            out.append((state, pos, transform))
+
+        self._entries = out
+        self._children = None
+        self._composites = []
+        renpy.redraw(self, 0)
+
+    def _resolve(self) -> bool:
+        composites = [self._cache.composite_for(state) for state, _, _ in self._entries]
+
+        if self._children is not None and all(a is b for a, b in zip(composites, self._composites)):
+            return False
+
+        children = []
+        for i, (composite, (_, _, transform)) in enumerate(zip(composites, self._entries)):
+            if self._children is not None and i < len(self._composites) and composite is self._composites[i]:
+                children.append(self._children[i])
+            else:
+                children.append(composite if transform is None else transform(composite))
+
+        self._composites = composites
+        self._children = children
+        return True
+
+    def render(self, width, height, st, at):
+        if self._children is None:
+            self._resolve()
+
+        rv = renpy.Render(width, height)
+
+        for child, (_, (x, y), _) in zip(self._children, self._entries):
+            if isinstance(x, float):
+                x = int(x * width)
+            if isinstance(y, float):
+                y = int(y * height)
+
+            rv.blit(renpy.render(child, width, height, st, at), (x, y))
+
+        return rv
+
+    def per_interact(self):
+        if self._resolve():
+            renpy.redraw(self, 0)
+
+    def event(self, ev, x, y, st):
+        return None
+
+    def visit(self):
+        if self._children is None:
+            self._resolve()
+
+        return self._children
@@ -0,0 +1,126 @@
+from ..state.history_ren import SCHistory
+from ..state.state_ren import SCState, SCStagedState
+
+"""renpy
+init -1 python:
+"""
+
+
+# noinspection PyProtectedMember
+class SCEditSession:
+    """
+    # Sprite Customizer Edit Session
+
+    A transactional set of changes to a `CustomizedSprite` instance's
+    selections.
+
+    While a session is open, every change made through the sprite's options
+    is written to a staged state layered over the sprite's real `SCState`
+    instead of to the real state itself.  The sprite's `preview` image
+    displays the staged selections so the changes may be previewed, while the
+    sprite itself and the real state, which is the one held in the game's
+    save data, stay untouched until the session is committed.
+
+    Changes made during the session are recorded in an undo/redo `history`
+    that lives as long as the session does.
+
+    Sessions are created via `CustomizedSprite.begin_edit` and are finished
+    by calling either `commit` or `discard`.
+
+    ```python
+    session = my_sprite.begin_edit()
+    ...
+    session.discard()
+    ```
+    """
+
+    def __init__(self, sprite, state: SCState, history_limit: int = 100):
+        """
+        Initializes the new SCEditSession instance.
+
+        Arguments
+        ---------
+        sprite : CustomizedSprite
+            Sprite the session is editing.
+
+        state : SCState
+            Committed state the session's changes are staged over.
+
+        history_limit : int
+            Maximum number of undo steps to keep for this session.
+        """
+        self._sprite = sprite
+        self._staged = SCStagedState(state)
+        self._staged.start_history(history_limit)
+        self._open = True
+
+    # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+    #
+    #   Properties
+    #
+    # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    @property
+    def is_open(self) -> bool:
+        """
+        Whether this session is still accepting changes.
+        """
+        return self._open
+
+    @property
+    def state(self) -> SCStagedState:
+        """
+        The staged state holding this session's uncommitted changes.
+        """
+        return self._staged
+
+    @property
+    def history(self) -> SCHistory:
+        """
+        Undo/redo history of the changes made during this session.
+        """
+        return self._staged.history
+
+    @property
+    def has_changes(self) -> bool:
+        """
+        Whether any changes have been staged in this session.
+        """
+        return len(self._staged._selections) > 0 or len(self._staged._user_state) > 0
+
+    # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+    #
+    #   Public Methods
+    #
+    # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    def commit(self):
+        """
+        Writes the staged changes to the sprite's real state and closes this
+        session.  Does nothing if the session has already been closed.
+        """
+        if not self._open:
+            return
+
+        self._staged._commit()
+        self._close()
+
+    def discard(self):
+        """
+        Throws away the staged changes and closes this session.  Does nothing
+        if the session has already been closed.
+        """
+        if not self._open:
+            return
+
+        self._close()
+
+    # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+    #
+    #   Internal Methods
+    #
+    # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    def _close(self):
+        self._open = False
+        self._sprite._end_edit(self)
@@ -0,0 +1,206 @@
+import renpy  # type: ignore
+
+from ..options.option_ren import SCOption
+from ..state.state_ren import SCState
+
+"""renpy
+init -1 python:
+"""
+
+from itertools import product
+from typing import Callable
+
+
+# noinspection PyProtectedMember
+class SCLayerOrder:
+    """
+    # Sprite Customizer Layer Order
+
+    Stacking order of a sprite's layers as decided by the layers' `z_rules`.
+
+    Every layer has a base `z_index`, and may declare rules that change it for
+    certain option values.  Layers are stacked by z index, back to front, with
+    layers that share a z index kept in declaration order.
+
+    Only the options referenced by some rule affect the order, and those
+    options must have a finite set of values.  When the number of value
+    combinations of those options is small enough, the order for every
+    combination is worked out once, up front, so that finding the order to
+    draw in is a single dict lookup.  Otherwise orders are worked out as
+    combinations are first seen and then kept.
+    """
+
+    # Most value combinations to work out orders for up front.
+    _PRECOMPUTE_LIMIT = 4096
+
+    def __init__(self, layers: list, options: dict[str, SCOption]):
+        """
+        Initializes the new SCLayerOrder instance.
+
+        Arguments
+        ---------
+        layers : list[SCLayer]
+            The sprite's layers, in declaration order.
+
+        options : dict[str, SCOption]
+            All the options of the sprite, keyed by option key.
+        """
+        self._layers = layers
+
+        keys = []
+        for layer in layers:
+            for condition, _ in layer._z_rules:
+                if condition.keys is None:
+                    raise Exception('z_rules on layer "{}" must name the options they depend on'.format(layer.name))
+
+                for key in condition.keys:
+                    if key not in options:
+                        raise Exception('z_rules on layer "{}" reference unrecognized option "{}"'.format(layer.name, key))
+                    if key not in keys:
+                        keys.append(key)
+
+        self._keys = tuple(keys)
+        self._options = tuple(options[key] for key in keys)
+        self._table: dict[tuple, tuple[int, ...]] = {}
+
+        domains = []
+        for key, option in zip(self._keys, self._options):
+            domain = option._random_domain()
+
+            if domain is None:
+                raise Exception('z_rules may only reference options with a fixed set of values, "{}" does not have one'.format(key))
+
+            domains.append([value for _, value in domain])
+
+        combinations = 1
+        for domain in domains:
+            combinations *= len(domain)
+
+        if combinations <= SCLayerOrder._PRECOMPUTE_LIMIT:
+            for values in product(*domains):
+                try:
+                    self._table[values] = self._compute(values)
+                except TypeError:
+                    # Unhashable values are worked out on every lookup.
+                    pass
+
+    @property
+    def keys(self) -> tuple[str, ...]:
+        """
+        Keys of the options that affect the layer order.
+        """
+        return self._keys
+
+    def order_for(self, state: SCState) -> tuple[int, ...]:
+        """
+        Returns the indices of the sprite's layers in the order they should be
+        drawn, back to front, for the given state.
+
+        Arguments
+        ---------
+        state : SCState
+            State to look option values up in.
+
+        Returns
+        -------
+        tuple[int, ...]
+            Layer indices, back to front.
+        """
+        values = tuple(option._value_for(state) for option in self._options)
+
+        try:
+            out = self._table.get(values)
+        except TypeError:
+            return self._compute(values)
+
+        if out is None:
+            out = self._compute(values)
+            self._table[values] = out
+
+        return out
+
+    def _compute(self, values: tuple) -> tuple[int, ...]:
+        named = dict(zip(self._keys, values))
+        z = [layer._z_index_for(named) for layer in self._layers]
+
+        return tuple(sorted(range(len(self._layers)), key=lambda i: (z[i], i)))
+
+
+# noinspection PyProtectedMember
+class SCLayerStack(renpy.Displayable):
+    """
+    # Sprite Customizer Layer Stack
+
+    Displayable that draws a sprite's layer displayables on top of each other
+    in the order given by an `SCLayerOrder`, leaving out layers whose
+    `enabled_when` condition is not met.
+
+    Used in place of a `LayeredImage` by sprites whose layers declare
+    `z_rules` or `enabled_when` conditions.  Every layer has exactly one
+    displayable, and reordering only changes the order the layer renders are
+    drawn in.  Disabled layers are not visited either, so Ren'Py does not
+    update their displayables at the start of every interaction.
+    """
+
+    def __init__(
+        self,
+        layers: list,
+        children: list,
+        order: SCLayerOrder | None,
+        state: Callable[[], SCState],
+        **kwargs
+    ):
+        super().__init__(**kwargs)
+
+        self._state = state
+        self._children = children
+        self._order = order
+        self._last = None
+
+        self._layers = layers
+        self._conditional = [i for i, layer in enumerate(layers) if layer._enabled_when is not None]
+
+    def _current_order(self) -> tuple[int, ...]:
+        state = self._state()
+        order = tuple(range(len(self._children))) if self._order is None else self._order.order_for(state)
+
+        if len(self._conditional) == 0:
+            return order
+
+        disabled = {i for i in self._conditional if not self._layers[i]._is_enabled_for(state)}
+
+        if len(disabled) == 0:
+            return order
+
+        return tuple(i for i in order if i not in disabled)
+
+    def render(self, width, height, st, at):
+        self._last = self._current_order()
+
+        if len(self._last) == 0:
+            return renpy.Render(0, 0)
+
+        renders = [
+            (self._children[i], renpy.render(self._children[i], width, height, st, at))
+            for i in self._last
+        ]
+
+        w = max(r.width for _, r in renders)
+        h = max(r.height for _, r in renders)
+
+        rv = renpy.Render(w, h)
+
+        for child, r in renders:
+            rv.place(child, 0, 0, w, h, render=r)
+
+        return rv
+
+    def per_interact(self):
+        if self._last is not None and self._current_order() != self._last:
+            renpy.redraw(self, 0)
+
+    def event(self, ev, x, y, st):
+        return None
+
+    def visit(self):
+        return [self._children[i] for i in self._current_order()]
@@ -1,7 +1,9 @@
-from renpy.store import DynamicDisplayable, Attribute, Displayable  # type: ignore
+from renpy.store import Animation, DynamicDisplayable, Attribute, Displayable, Null, Transform  # type: ignore
 
 from ..options.option_ren import SCOption
 from ..state.state_ren import SCState
+from .condition_ren import SCCondition
+from .lru_cache_ren import SCLRUCache
 
 
 """renpy
@@ -22,6 +24,35 @@ class SCLayer:
     construction time via named layer option keyword args.  The user's
     selections of those options are then passed to the given
     `layer_provider` to construct the underlying Displayable for the layer.
+
+    A layer may be given an `enabled_when` condition over the selections of
+    any of the sprite's options.  While the condition is not met the layer
+    displays nothing, and its provider is not called at all.
+
+    ```python
+    SCLayer("accessories", sc_accessory, [...], enabled_when={"has_accessory": True})
+    ```
+
+    Layers are stacked in the order they are given to the sprite unless they
+    declare a `z_index` or `z_rules`, which allow a layer to move in front of
+    or behind other layers depending on option values.
+
+    ```python
+    SCLayer("hair", sc_hair, [...], z_rules=[({"hood": "down"}, 1)])
+    ```
+
+    A layer may also be animated by declaring its `frames` up front, as a
+    list of `(provider, duration)` pairs.  The frame displayables for the
+    current selections are created once, preloaded, and played back by a
+    single Ren'Py animation on the sprite's shown time, so every animated
+    layer of a sprite stays in step and no Python is run between frames.
+
+    ```python
+    SCLayer("eyes", "eyes/{eye_color}.png", [...], frames=[
+        (None, 3.0),
+        ("eyes/{eye_color}_blink.png", 0.15),
+    ])
+    ```
     """
 
     def __init__(
@@ -30,6 +61,10 @@ class SCLayer:
         layer_provider: str | Callable[..., Displayable],
         options: SCOption | list[SCOption] = None,
         transform: Callable[[Displayable], Displayable] = None,
+        enabled_when: dict[str, any] | Callable[..., bool] | None = None,
+        z_index: int = 0,
+        z_rules: list[tuple[dict[str, any] | Callable[..., bool], int]] | None = None,
+        frames: list[tuple[str | Callable[..., Displayable] | None, float]] | None = None,
     ):
         """
         Initializes the new `SCLayer` instance with the given arguments.
@@ -55,6 +90,33 @@ class SCLayer:
             as a single argument and returns a Displayable.  Allows
             performing arbitrary transforms to the whole layer regardless of
             option selections.
+
+        enabled_when : dict | function | None
+            Optional condition that must be met for the layer to be shown.
+            Either a dict of required option values keyed by option key,
+            where a `set` matches any of its values, or a function taking
+            option values as keyword arguments and returning a boolean.  The
+            options may belong to any layer of the sprite.
+
+        z_index : int
+            Stacking position of the layer.  Layers with a higher z index are
+            drawn in front of layers with a lower one, and layers with the
+            same z index are drawn in the order they were given to the
+            sprite.  Defaults to `0`.
+
+        z_rules : list[tuple] | None
+            Optional list of `(condition, z_index)` pairs.  The z index of
+            the first pair whose condition is met is used in place of the
+            layer's `z_index`.  Conditions take the same forms as
+            `enabled_when`, and may only reference options that have a fixed
+            set of values.
+
+        frames : list[tuple] | None
+            Optional list of `(provider, duration)` pairs making the layer an
+            animated layer.  Each provider takes the same forms as
+            `layer_provider`, or is `None` to use `layer_provider` itself, and
+            each duration is the number of seconds the frame is shown for.
+            The frames loop for as long as the layer is shown.
         """
 
         if not isinstance(name, str):
@@ -66,8 +128,57 @@ class SCLayer:
         self._name: str = name
         self._provider: str | Callable[..., Displayable] = layer_provider
         self._state: SCState | None = None
+        self._staged: SCState | None = None
         self._options: dict[str, SCOption] = {}
         self._transform: Callable[[Displayable], Displayable] = transform
+        self._enabled_when: SCCondition | None = None
+        self._condition_options: list[tuple[str, SCOption]] | None = None
+
+        if enabled_when is not None:
+            self._enabled_when = enabled_when if isinstance(enabled_when, SCCondition) else SCCondition(enabled_when)
+
+        if not isinstance(z_index, int):
+            raise Exception("SCLayer z_index must be an int value.")
+
+        self._z_index = z_index
+        self._z_rules: list[tuple[SCCondition, int]] = []
+
+        if z_rules is not None:
+            if not isinstance(z_rules, list):
+                raise Exception("SCLayer z_rules must be a list of (condition, z_index) tuples.")
+
+            for rule in z_rules:
+                if not isinstance(rule, tuple) or len(rule) != 2 or not isinstance(rule[1], int):
+                    raise Exception("SCLayer z_rules must be a list of (condition, z_index) tuples.")
+
+                condition = rule[0] if isinstance(rule[0], SCCondition) else SCCondition(rule[0])
+                self._z_rules.append((condition, rule[1]))
+
+        self._frames: tuple[tuple[str | Callable[..., Displayable], float], ...] | None = None
+        self._animations: SCLRUCache | None = None
+
+        if frames is not None:
+            if not isinstance(frames, list) or len(frames) < 1:
+                raise Exception("SCLayer frames must be a non-empty list of (provider, duration) tuples.")
+
+            compiled = []
+            for frame in frames:
+                if not isinstance(frame, tuple) or len(frame) != 2:
+                    raise Exception("SCLayer frames must be a non-empty list of (provider, duration) tuples.")
+
+                provider, duration = frame
+
+                if provider is None:
+                    provider = layer_provider
+                elif not (callable(provider) or isinstance(provider, str)):
+                    raise Exception("SCLayer frame providers must be callable, a string, or None.")
+
+                if not isinstance(duration, (int, float)) or isinstance(duration, bool) or duration <= 0:
+                    raise Exception("SCLayer frame durations must be greater than zero.")
+
+                compiled.append((provider, duration))
+
+            self._frames = tuple(compiled)
 
         if options is None:
             pass
@@ -85,6 +196,9 @@ class SCLayer:
         else:
             raise Exception('"options" must be an SCOption or a list of SCOptions')
 
+        for opt in self._options.values():
+            opt._set_layer(self)
+
     # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
     #
     #   Properties
@@ -111,6 +225,21 @@ class SCLayer:
         """
         return self._options.copy()
 
+    @property
+    def is_animated(self) -> bool:
+        """
+        Whether this layer was declared with animation `frames`.
+        """
+        return self._frames is not None
+
+    @property
+    def is_enabled(self) -> bool:
+        """
+        Whether this layer's `enabled_when` condition, if any, is currently
+        met.
+        """
+        return self._is_enabled_for(self._state)
+
     # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
     #
     #   Internal Methods
@@ -118,47 +247,258 @@ class SCLayer:
     # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
 
     def _render(self, st: float, at: float, **kwargs: any) -> tuple[any, float]:
-        if callable(self._provider):
-            return self._render_function(st, at, **kwargs)
-        else:
-            return self._render_string(**kwargs)
+        return self._render_for(self._state, st, at, kwargs)
+
+    def _render_preview(self, st: float, at: float, **kwargs: any) -> tuple[any, float]:
+        return self._render_for(self._edit_state(), st, at, kwargs)
+
+    def _render_for(self, state: SCState, st: float, at: float, kwargs: dict) -> tuple[any, float]:
+        if not self._is_enabled_for(state):
+            return Null(), None
+
+        if self._frames is not None:
+            return self._animation(self._selection_values(kwargs, state=state), state), None
+
+        return self._provide(st, at, self._selection_values(kwargs, state=state))
+
+    def _edit_state(self) -> SCState:
+        """
+        The state this layer's options are being edited in: the staged state
+        of the sprite's open edit session, if any, otherwise the sprite's
+        state.
+        """
+        return self._state if self._staged is None else self._staged
+
+    def _animation(self, vals: dict, state: SCState) -> Displayable:
+        """
+        Looks up or creates the animation of this layer's frames for the
+        given selection values.
+
+        The frame providers are only called when a combination of values is
+        first seen.  Recently used animations are kept, with their frames
+        preloaded, so switching back and forth between selections does not
+        rebuild them.  Values that cannot be hashed are keyed by the
+        selections stored in the given state instead.
+        """
+        if self._animations is None:
+            self._animations = SCLRUCache(sc.animation_cache_size)
+
+        def build() -> Displayable:
+            args = []
+
+            for provider, duration in self._frames:
+                args.append(self._provide(0.0, 0.0, vals.copy(), provider)[0])
+                args.append(duration)
+
+            return Animation(*args)
+
+        return self._animations.get(self._selection_key(state, vals), build)
+
+    def _bind_conditions(self, options: dict[str, SCOption]):
+        """
+        Resolves the options this layer's `enabled_when` condition depends on
+        from the given options of the sprite the layer belongs to.
+        """
+        if self._enabled_when is None:
+            return
+
+        keys = self._enabled_when.keys
+
+        if keys is None:
+            keys = options.keys()
+
+        bound = []
+        for key in keys:
+            if key not in options:
+                raise Exception('SCLayer "{}" enabled_when references unrecognized option "{}"'.format(self._name, key))
+
+            bound.append((key, options[key]))
+
+        self._condition_options = bound
+
+    def _z_index_for(self, values: dict[str, any]) -> int:
+        for condition, z_index in self._z_rules:
+            if condition.test(values):
+                return z_index
+
+        return self._z_index
+
+    def _is_enabled_for(self, state: SCState) -> bool:
+        if self._enabled_when is None:
+            return True
+
+        if self._condition_options is None:
+            self._bind_conditions(self._options)
+
+        return self._enabled_when.test({key: option._value_for(state) for key, option in self._condition_options})
+
+    def _selection_values(self, kwargs: dict, overrides: dict | None = None, state: SCState | None = None) -> dict:
+        if state is None:
+            state = self._state
 
-    def _render_string(self, **kwargs: any) -> tuple[str, float]:
-        out = self._provider
         vals = kwargs.copy()
 
-        for key, value in self._state._user_state.items():
+        # Go through user state first to prevent it from overwriting real
+        # option selections.
+        for key, value in state._variables().items():
             vals[key] = value
 
         for key, option in self._options.items():
-            vals[key] = option.selection_value
+            vals[key] = option._value_for(state)
+
+        if overrides is not None:
+            for key, value in overrides.items():
+                vals[key] = value
+
+        return vals
+
+    def _values_for(self, state: SCState) -> dict:
+        vals = state._variables().copy()
+
+        for key, option in self._options.items():
+            vals[key] = option._value_for(state)
+
+        return vals
+
+    def _selection_key(self, state: SCState, vals: dict | None = None) -> tuple:
+        """
+        Returns a hashable key of what this layer shows for the given state.
+
+        The key is built from the option and variable values the layer's
+        providers receive, so states that look the same share a key.  Values
+        that cannot be hashed are replaced by the selection stored in the
+        state for options, and by their `repr` for variables.
+        """
+        if vals is None:
+            vals = self._values_for(state)
+
+        out = []
+        for key, value in sorted(vals.items(), key=lambda item: item[0]):
+            try:
+                hash(value)
+            except TypeError:
+                if key in self._options:
+                    value = ("_sc_selection", repr(state.get_selection(key)) if state.has_selection(key) else None)
+                else:
+                    value = ("_sc_repr", repr(value))
+
+            out.append((key, value))
+
+        return tuple(out)
+
+    def _displayable_for(self, state: SCState) -> any:
+        """
+        Resolves what this layer displays for the given state, without
+        binding the layer to that state.
+
+        Returns
+        -------
+        any
+            The displayable or image name the layer provides, or `None` if
+            the layer is disabled for the given state.
+        """
+        if not self._is_enabled_for(state):
+            return None
+
+        vals = self._values_for(state)
+
+        if self._frames is not None:
+            return self._animation(vals, state)
+
+        return self._provide(0.0, 0.0, vals)[0]
+
+    def _provide(self, st: float, at: float, vals: dict, provider=None) -> tuple[any, float | None]:
+        if provider is None:
+            provider = self._provider
+
+        if callable(provider):
+            return self._render_function(st, at, vals, provider)
+        else:
+            return self._render_string(vals, provider)
+
+    def _render_string(self, vals: dict, template: str) -> tuple[str, None]:
+        out = template
 
         for key, value in vals.items():
-            out = out.replace("{" + key + "}", value)
+            token = "{" + key + "}"
 
-        return out, 0.0
+            if token in out:
+                out = out.replace(token, str(value))
 
-    def _render_function(self, st: float, at: float, **kwargs: any) -> tuple[any, float]:
-        kwargs["st"] = st
-        kwargs["at"] = at
+        # Layers only change when selections do, which happens between
+        # interactions, so there is nothing to redraw on a timer.
+        return out, None
 
-        # Go through user state first to prevent it from overwriting real
-        # option selections.
-        for key, value in self._state._user_state.items():
-            kwargs[key] = value
+    def _render_function(self, st: float, at: float, vals: dict, func: Callable[..., Displayable]) -> tuple[any, float | None]:
+        vals["st"] = st
+        vals["at"] = at
 
-        for key, option in self._options.items():
-            kwargs[key] = option.selection_value
+        out = func(**vals)
+
+        return out if isinstance(out, tuple) else (out, None)
 
-        out = self._provider(**kwargs)
+    def _thumbnail(self, option_key: str, index: int, value: any) -> Displayable:
+        """
+        Looks up or creates a thumbnail of this layer as it would appear with
+        the given option value selected, keeping the current selections of
+        all the other options on this layer.
+
+        Arguments
+        ---------
+        option_key : str
+            Key of the option the thumbnail is being rendered for.
+
+        index : int
+            Index of the option value being rendered.
+
+        value : any
+            Option value being rendered.
+
+        Returns
+        -------
+        Displayable
+            Thumbnail sized to the `sc.thumbnail_size` setting.
+        """
+        state = self._edit_state()
+
+        deps = tuple(
+            option._value_for(state)
+            for key, option in self._options.items()
+            if key != option_key
+        )
+
+        # User variables are passed to the providers too, so thumbnails must
+        # be rebuilt when they change.
+        variables = tuple(sorted(state._variables().items(), key=lambda item: item[0]))
+
+        key = (self._name, self._provider, self._transform, option_key, index, deps, variables)
+
+        def build() -> Displayable:
+            out = self._provide(0.0, 0.0, self._selection_values({}, {option_key: value}, state))[0]
+
+            if self._transform is not None:
+                out = self._transform(out)
 
-        return out if isinstance(out, tuple) else (out, 0.0)
+            return Transform(out, fit="contain", xysize=sc.thumbnail_size)
+
+        return SCLRUCache.thumbnails().get(key, build)
 
     def _set_state(self, state: SCState):
         self._state = state
+        self._staged = None
         for opt in self._options.values():
             opt._set_state(state)
 
+    def _set_staged(self, state: SCState | None):
+        """
+        Points this layer's options, and its preview image, at the given
+        staged state, or back at the layer's state if `None` is given.  What
+        the layer's main image displays is not affected.
+        """
+        self._staged = state
+        for opt in self._options.values():
+            opt._set_state(self._edit_state())
+
     def _append_options_to_dict(self, d: dict[str, SCOption]):
         for key, opt in self._options.values():
             d[key] = opt
@@ -178,32 +518,52 @@ class SCLayer:
 
         for option in self._options.values():
             tmp = option._clone()
+            tmp._visible_when = option._visible_when
+            tmp._enabled_when = option._enabled_when
             tmp._post_clone()
             options.append(tmp)
 
-        return SCLayer(self._name, self._provider, options, self._transform)
+        out = SCLayer(self._name, self._provider, options, self._transform, self._enabled_when, self._z_index)
+        out._z_rules = self._z_rules
+        out._frames = self._frames
+        return out
 
-    def _build_image(self):
+    def _build_image(self, preview: bool = False):
         """
         Builds the DynamicDisplayable that represents this `SCLayer`
         instance.
 
+        Arguments
+        ---------
+
+        preview : bool
+            Whether to build the image for the sprite's edit preview, which
+            displays the staged selections of an open edit session.
+
         Returns
         -------
 
         DynamicDisplayable
             The DynamicDisplayable that represents this `SCLayer` instance.
         """
+        image = DynamicDisplayable(self._render_preview if preview else self._render)
+
         if self._transform is None:
-            return DynamicDisplayable(self._render)
+            return image
 
-        return self._transform(DynamicDisplayable(self._render))
+        return self._transform(image)
 
-    def _build_attribute(self):
+    def _build_attribute(self, preview: bool = False):
         """
         Builds a LayeredImage Attribute instance to represent this `SCLayer`
         instance.
 
+        Arguments
+        ---------
+
+        preview : bool
+            Whether to build the attribute for the sprite's edit preview.
+
         Returns
         -------
 
@@ -211,4 +571,4 @@ class SCLayer:
             A LayeredImage Attribute instance to represent this `SCLayer`
             instance.
         """
-        return Attribute(None, self._name, image=self._build_image(), default=True)
+        return Attribute(None, self._name, image=self._build_image(preview), default=True)
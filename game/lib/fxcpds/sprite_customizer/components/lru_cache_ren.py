@@ -0,0 +1,107 @@
+import renpy  # type: ignore
+from renpy.store import Displayable  # type: ignore
+
+"""renpy
+init -1 python:
+"""
+
+from collections import OrderedDict
+
+
+class SCLRUCache:
+    """
+    # Sprite Customizer LRU Cache
+
+    Least-recently-used cache of displayables, used for option value
+    thumbnails, animated layer frames, and crowd composites.
+
+    Newly created displayables are handed to Ren'Py's image predictor so
+    their images are loaded in the background before they are first drawn,
+    and evicted displayables are released from prediction again.
+    """
+
+    _shared = None
+
+    def __init__(self, max_size: int):
+        """
+        Initializes the new SCLRUCache instance.
+
+        Arguments
+        ---------
+        max_size : int
+            Maximum number of displayables to hold before the least recently
+            used entries are evicted.
+        """
+        if not isinstance(max_size, int) or max_size < 1:
+            raise Exception('"max_size" must be an int value greater than zero')
+
+        self._max_size = max_size
+        self._entries: OrderedDict = OrderedDict()
+
+    @staticmethod
+    def thumbnails() -> 'SCLRUCache':
+        """
+        Returns the thumbnail cache shared by all sprites, creating it on
+        first use with the `sc.thumbnail_cache_size` setting.
+
+        Thumbnails are keyed by the layer that rendered them, the option value
+        they represent, and the selections and variables that the rendered
+        image depends on.
+
+        The shared instance is held on the class rather than in a store
+        variable so that it is never written into save files.
+        """
+        if SCLRUCache._shared is None:
+            SCLRUCache._shared = SCLRUCache(sc.thumbnail_cache_size)
+
+        return SCLRUCache._shared
+
+    @property
+    def size(self) -> int:
+        """
+        Number of displayables currently held by the cache.
+        """
+        return len(self._entries)
+
+    def get(self, key: tuple, factory) -> Displayable:
+        """
+        Looks up the displayable for the given key, calling the given factory
+        to create it if it is not already cached.
+
+        Arguments
+        ---------
+        key : tuple
+            Hashable cache key for the displayable.
+
+        factory : callable
+            Function taking no arguments and returning the displayable.
+
+        Returns
+        -------
+        Displayable
+            The cached or newly created displayable.
+        """
+        try:
+            out = self._entries.pop(key)
+        except TypeError:
+            # Unhashable keys cannot be cached.
+            return factory()
+        except KeyError:
+            out = factory()
+            renpy.start_predict(out)
+
+            while len(self._entries) >= self._max_size:
+                renpy.stop_predict(self._entries.popitem(last=False)[1])
+
+        self._entries[key] = out
+        return out
+
+    def clear(self):
+        """
+        Removes all displayables from the cache.
+        """
+        for out in self._entries.values():
+            renpy.stop_predict(out)
+
+        self._entries.clear()
+
@@ -0,0 +1,226 @@
+from ..options.option_ren import SCOption
+from ..state.state_ren import SCState
+
+"""renpy
+init -1 python:
+"""
+
+
+# noinspection PyProtectedMember
+class SCOptionGraph:
+    """
+    # Sprite Customizer Option Graph
+
+    Dependency graph of the `visible_when` and `enabled_when` rules declared
+    on the options of a `CustomizedSprite`.
+
+    Each option with rules depends on the options its rules reference.  The
+    graph is built once, when the sprite is created, and is checked for
+    cycles and sorted so that every option comes after the options it depends
+    on.
+
+    Rule results are cached.  When they are asked for, only the selections of
+    options that some rule references are read, and only the options
+    downstream of a selection that changed since the last check are
+    re-evaluated.  An option whose rules depend on a hidden or disabled option
+    is itself hidden or disabled.
+    """
+
+    def __init__(self, options: dict[str, SCOption]):
+        """
+        Initializes the new SCOptionGraph instance.
+
+        Arguments
+        ---------
+        options : dict[str, SCOption]
+            All the options of a sprite, keyed by option key, in declaration
+            order.
+        """
+        self._options = options
+
+        # Dependencies of every option that declares rules.
+        self._deps: dict[str, tuple[str, ...]] = {}
+
+        for key, option in options.items():
+            deps = []
+
+            for condition in (option._visible_when, option._enabled_when):
+                if condition is None:
+                    continue
+
+                if condition.keys is None:
+                    raise Exception('rules on option "{}" must name the options they depend on'.format(key))
+
+                for dep in condition.keys:
+                    if dep == key:
+                        raise Exception('rules on option "{}" may not depend on the option itself'.format(key))
+                    if dep not in options:
+                        raise Exception('rules on option "{}" reference unrecognized option "{}"'.format(key, dep))
+                    if dep not in deps:
+                        deps.append(dep)
+
+            if len(deps) > 0:
+                self._deps[key] = tuple(deps)
+
+        self._order = self._sort()
+        self._ruled = [key for key in self._order if key in self._deps]
+
+        # Options whose rules must be re-evaluated when a given option's
+        # selection changes, in evaluation order.
+        dependents: dict[str, set[str]] = {}
+        for key, deps in self._deps.items():
+            for dep in deps:
+                dependents.setdefault(dep, set()).add(key)
+
+        self._downstream: dict[str, list[str]] = {}
+        for source in dependents.keys():
+            reached = set()
+            pending = [source]
+
+            while len(pending) > 0:
+                for key in dependents.get(pending.pop(), ()):
+                    if key not in reached:
+                        reached.add(key)
+                        pending.append(key)
+
+            self._downstream[source] = [key for key in self._ruled if key in reached]
+
+        self._state: SCState | None = None
+        self._seen: dict[str, any] = {}
+        self._visible: dict[str, bool] = {}
+        self._enabled: dict[str, bool] = {}
+
+    # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+    #
+    #   Properties
+    #
+    # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    @property
+    def order(self) -> list[str]:
+        """
+        Keys of all the options in the graph, sorted so that every option
+        comes after the options its rules depend on.
+        """
+        return self._order.copy()
+
+    @property
+    def has_rules(self) -> bool:
+        """
+        Whether any option in the graph declares rules.
+        """
+        return len(self._deps) > 0
+
+    # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+    #
+    #   Public Methods
+    #
+    # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    def is_visible(self, key: str, state: SCState) -> bool:
+        """
+        Whether the option with the given key should be shown for the given
+        state.
+        """
+        if key not in self._deps:
+            return True
+
+        self._refresh(state)
+        return self._visible[key]
+
+    def is_enabled(self, key: str, state: SCState) -> bool:
+        """
+        Whether the option with the given key may be changed for the given
+        state.
+        """
+        if key not in self._deps:
+            return True
+
+        self._refresh(state)
+        return self._enabled[key]
+
+    def is_active(self, key: str, state: SCState) -> bool:
+        """
+        Whether the option with the given key is both visible and enabled for
+        the given state.
+        """
+        return self.is_visible(key, state) and self.is_enabled(key, state)
+
+    # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+    #
+    #   Internal Methods
+    #
+    # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    def _sort(self) -> list[str]:
+        # Kahn's algorithm, keeping declaration order between options that
+        # don't depend on each other.
+        remaining = {key: len(self._deps.get(key, ())) for key in self._options.keys()}
+        out = []
+
+        while len(out) < len(remaining):
+            ready = [key for key, count in remaining.items() if count == 0 and key not in out]
+
+            if len(ready) == 0:
+                cycle = sorted(key for key, count in remaining.items() if count > 0)
+                raise Exception("option rules form a cycle between options: {}".format(", ".join(cycle)))
+
+            for key in ready:
+                out.append(key)
+
+                for other, deps in self._deps.items():
+                    if key in deps:
+                        remaining[other] -= 1
+
+        return out
+
+    def _refresh(self, state: SCState):
+        if state is not self._state:
+            self._state = state
+            self._seen = {source: self._options[source]._value_for(state) for source in self._downstream.keys()}
+            dirty = self._ruled
+        else:
+            changed = set()
+
+            for source in self._downstream.keys():
+                value = self._options[source]._value_for(state)
+
+                if not self._same(value, self._seen[source]):
+                    self._seen[source] = value
+                    changed.update(self._downstream[source])
+
+            if len(changed) == 0:
+                return
+
+            dirty = [key for key in self._ruled if key in changed]
+
+        for key in dirty:
+            self._evaluate(key)
+
+    def _evaluate(self, key: str):
+        option = self._options[key]
+        deps = self._deps[key]
+
+        values = {dep: self._seen[dep] for dep in deps}
+
+        visible = all(self._visible.get(dep, True) for dep in deps)
+        enabled = all(self._enabled.get(dep, True) for dep in deps)
+
+        if visible and option._visible_when is not None:
+            visible = option._visible_when.test(values)
+
+        if enabled and option._enabled_when is not None:
+            enabled = option._enabled_when.test(values)
+
+        self._visible[key] = visible
+        self._enabled[key] = enabled
+
+    @staticmethod
+    def _same(a: any, b: any) -> bool:
+        if a is b:
+            return True
+
+        try:
+            return bool(a == b)
+        except Exception:
+            return False
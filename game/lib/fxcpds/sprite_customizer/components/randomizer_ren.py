@@ -0,0 +1,572 @@
+import renpy  # type: ignore
+
+from ..options.option_ren import SCOption
+from ..state.state_ren import SCState
+
+"""renpy
+init -1 python:
+"""
+
+import random
+from typing import Callable
+
+
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+#
+#   Constraints
+#
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+
+class SCConstraint:
+    """
+    # Sprite Customizer Randomizer Constraint
+
+    A rule over the selection values of one or more options that every
+    configuration generated by an `SCRandomizer` must satisfy.
+
+    Constraints are checked against the option *values*, meaning the values
+    that layer providers receive, rather than against selection indices.
+
+    ```python
+    SCConstraint(["skin_color", "eye_color"], lambda skin_color, eye_color: skin_color != eye_color)
+    ```
+    """
+
+    def __init__(self, keys: list[str], predicate: Callable[..., bool]):
+        """
+        Initializes the new SCConstraint instance with the given arguments.
+
+        Arguments
+        ---------
+        keys : list[str]
+            Keys of the options the constraint depends on.
+
+        predicate : callable
+            Function that takes the values of the options named by `keys` as
+            keyword arguments and returns whether the combination is allowed.
+        """
+        if not isinstance(keys, (list, tuple)) or len(keys) < 1:
+            raise Exception('"keys" must be a non-empty list of option keys')
+
+        if not callable(predicate):
+            raise Exception('"predicate" must be callable')
+
+        self._keys = tuple(keys)
+        self._predicate = predicate
+
+    @property
+    def keys(self) -> tuple[str, ...]:
+        """
+        Keys of the options this constraint depends on.
+        """
+        return self._keys
+
+    def test(self, values: dict) -> bool:
+        """
+        Tests whether the given option values satisfy this constraint.
+
+        Arguments
+        ---------
+        values : dict
+            Option values keyed by option key.  Must contain a value for
+            every key this constraint depends on.
+
+        Returns
+        -------
+        bool
+            Whether the values are allowed.
+        """
+        return bool(self._predicate(**{key: values[key] for key in self._keys}))
+
+    @staticmethod
+    def _matches(value: any, expected: any) -> bool:
+        if isinstance(expected, (set, frozenset)):
+            return value in expected
+
+        return value == expected
+
+
+class SCExclude(SCConstraint):
+    """
+    Forbids a combination of option values from being generated together.
+
+    A `set` of values may be given for an option to match any of them.
+
+    ```python
+    SCExclude({"skin_color": "#513021", "clothes": {"plaid", "stripes"}})
+    ```
+    """
+
+    def __init__(self, combination: dict[str, any]):
+        """
+        Initializes the new SCExclude instance.
+
+        Arguments
+        ---------
+        combination : dict
+            Option values keyed by option key that may not all be selected at
+            the same time.
+        """
+        if not isinstance(combination, dict) or len(combination) < 1:
+            raise Exception('"combination" must be a non-empty dict')
+
+        self._combination = combination.copy()
+        super().__init__(list(combination.keys()), self._allowed)
+
+    def _allowed(self, **values) -> bool:
+        for key, expected in self._combination.items():
+            if not self._matches(values[key], expected):
+                return True
+
+        return False
+
+
+class SCRequire(SCConstraint):
+    """
+    Requires that whenever a set of option values is generated, another set of
+    option values is generated along with it.
+
+    A `set` of values may be given for an option to match any of them.
+
+    ```python
+    SCRequire({"accessory": {"plaid_bow", "plaid_clips"}}, {"clothes": "plaid"})
+    ```
+    """
+
+    def __init__(self, when: dict[str, any], then: dict[str, any]):
+        """
+        Initializes the new SCRequire instance.
+
+        Arguments
+        ---------
+        when : dict
+            Option values keyed by option key that trigger the requirement
+            when all of them are selected.
+
+        then : dict
+            Option values keyed by option key that must all be selected when
+            the requirement is triggered.
+        """
+        if not isinstance(when, dict) or len(when) < 1:
+            raise Exception('"when" must be a non-empty dict')
+
+        if not isinstance(then, dict) or len(then) < 1:
+            raise Exception('"then" must be a non-empty dict')
+
+        self._when = when.copy()
+        self._then = then.copy()
+
+        keys = list(when.keys())
+        for key in then.keys():
+            if key not in when:
+                keys.append(key)
+
+        super().__init__(keys, self._allowed)
+
+    def _allowed(self, **values) -> bool:
+        for key, expected in self._when.items():
+            if not self._matches(values[key], expected):
+                return True
+
+        for key, expected in self._then.items():
+            if not self._matches(values[key], expected):
+                return False
+
+        return True
+
+
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+#
+#   Randomizer
+#
+# # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+
+# noinspection PyProtectedMember
+class SCRandomizer:
+    """
+    # Sprite Customizer Randomizer
+
+    Generates random option selections that satisfy a set of declared
+    constraints.
+
+    Options whose selections can be enumerated (list and boolean options) are
+    treated as variables of a constraint satisfaction problem.  Constraints
+    that only depend on a single option are applied once when the randomizer
+    is created, and constraints between two options are made arc consistent
+    at the same time.  While generating, options are assigned one at a time,
+    most constrained first, with each value drawn by weighted sampling, and
+    every assignment immediately prunes the candidate values of the options
+    sharing a constraint with it.  Dead ends are backtracked out of rather
+    than retried from scratch.
+
+    Options that cannot be enumerated, such as color options, are randomized
+    independently and may not be referenced by constraints.
+
+    ```python
+    randomizer = SCRandomizer(
+        my_sprite,
+        SCExclude({"eye_color": "grey", "clothes": "plaid"}),
+        seed=42,
+    )
+
+    randomizer.randomize()
+    npc_selections = randomizer.generate(20)
+    ```
+    """
+
+    def __init__(
+        self,
+        options,
+        *constraints: SCConstraint,
+        seed: any = None,
+        weights: dict[str, dict[any, float]] | None = None,
+        tags: dict[str, list[str]] | None = None,
+    ):
+        """
+        Initializes the new SCRandomizer instance with the given arguments.
+
+        Arguments
+        ---------
+        options : CustomizedSprite | list[SCOption]
+            Sprite whose options should be randomized, or a list of options.
+
+        constraints : SCConstraint[]
+            Zero or more constraints that generated selections must satisfy.
+
+        seed : any
+            Optional seed for the random number generator.  When set, the
+            same seed will always generate the same selections.  When unset,
+            Ren'Py's rollback-safe `renpy.random` is used.
+
+        weights : dict
+            Optional relative weights for option values, keyed by option key
+            then by option value.  Values without a weight here default to
+            the weight given to them by their option, or `1.0`.
+
+        tags : dict
+            Optional tag filters keyed by option key.  Only values having all
+            the listed tags may be generated for the option.
+        """
+        if hasattr(options, "get_options"):
+            self._sprite = options
+            options = options.get_options()
+        else:
+            self._sprite = None
+
+        if not isinstance(options, list):
+            raise Exception('"options" must be a CustomizedSprite or a list of SCOptions')
+
+        self._options: dict[str, SCOption] = {}
+        for option in options:
+            if not isinstance(option, SCOption):
+                raise Exception("SCRandomizer options must all be SCOption instances")
+            self._options[option.key] = option
+
+        self._rng = random.Random(seed) if seed is not None else None
+        self._declared = constraints
+
+        # Candidate (selection, value) pairs for every enumerable option.
+        self._domains: dict[str, list[tuple[any, any]]] = {}
+        for key, option in self._options.items():
+            domain = option._random_domain()
+            if domain is not None:
+                self._domains[key] = domain
+
+        self._weights: dict[str, list[float] | None] = {}
+        for key, domain in self._domains.items():
+            self._weights[key] = self._compile_weights(key, domain, weights)
+
+        self._constraints: dict[str, list[SCConstraint]] = {key: [] for key in self._domains}
+        self._candidates: dict[str, list[int]] = {
+            key: [i for i in range(len(domain)) if self._weights[key] is None or self._weights[key][i] > 0]
+            for key, domain in self._domains.items()
+        }
+
+        if tags is not None:
+            self._apply_tags(tags)
+
+        for constraint in constraints:
+            if not isinstance(constraint, SCConstraint):
+                raise Exception("SCRandomizer constraints must all be SCConstraint instances")
+
+            for key in constraint.keys:
+                if key not in self._options:
+                    raise Exception('constraint references unrecognized option "{}"'.format(key))
+                if key not in self._domains:
+                    raise Exception('constraint references option "{}" which cannot be enumerated'.format(key))
+
+            if len(constraint.keys) == 1:
+                self._apply_unary(constraint)
+            else:
+                for key in constraint.keys:
+                    self._constraints[key].append(constraint)
+
+        self._make_arc_consistent()
+
+        for key, candidates in self._candidates.items():
+            if len(candidates) == 0:
+                raise Exception('constraints leave no possible values for option "{}"'.format(key))
+
+    # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+    #
+    #   Public Methods
+    #
+    # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    def generate(self, count: int = 1) -> list[dict[str, any]]:
+        """
+        Generates the given number of random configurations.
+
+        Arguments
+        ---------
+        count : int
+            Number of configurations to generate.
+
+        Returns
+        -------
+        list[dict]
+            List of selection dicts keyed by option key, suitable for passing
+            to the `SCState` constructor.
+        """
+        if not isinstance(count, int) or count < 0:
+            raise Exception('"count" must be a non-negative int value')
+
+        return [self._generate_one() for _ in range(count)]
+
+    def randomize(self, state: SCState | None = None):
+        """
+        Generates a random configuration and records it in the given state.
+
+        Arguments
+        ---------
+        state : SCState
+            State to record the selections in.  Defaults to the state the
+            randomizer's sprite is currently displaying.  Required if the
+            randomizer was created from a list of options.
+        """
+        if state is None:
+            if self._sprite is None:
+                raise Exception("SCRandomizer created from a list of options requires a state to randomize")
+            state = self._sprite._bound_state()
+
+        selections = self._generate_one()
+        graph = self._sprite._graph if self._sprite is not None else None
+        history = state._history
+
+        if history is not None:
+            history.begin_batch()
+
+        try:
+            if graph is None:
+                for key, selection in selections.items():
+                    state.set_selection(key, selection)
+            else:
+                # Options are written in dependency order so that each
+                # option's rules see the new selections of the options they
+                # depend on, and options those rules rule out are skipped.
+                for key in graph.order:
+                    if key in selections and graph.is_active(key, state):
+                        state.set_selection(key, selections[key])
+        finally:
+            if history is not None:
+                history.end_batch()
+
+    # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+    #
+    #   Internal Methods
+    #
+    # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    def _random(self):
+        return self._rng if self._rng is not None else renpy.random
+
+    def _compile_weights(self, key: str, domain: list, weights: dict | None) -> list[float] | None:
+        defaults = self._options[key]._random_weights()
+
+        if weights is None or key not in weights:
+            return defaults
+
+        table = weights[key]
+        if not isinstance(table, dict):
+            raise Exception('weights for option "{}" must be a dict'.format(key))
+
+        out = []
+        for i, (_, value) in enumerate(domain):
+            default = 1.0 if defaults is None else defaults[i]
+
+            try:
+                weight = table.get(value, default)
+            except TypeError:
+                weight = default
+
+            if not isinstance(weight, (int, float)) or weight < 0:
+                raise Exception('weights for option "{}" must be non-negative numbers'.format(key))
+
+            out.append(float(weight))
+
+        return out
+
+    def _apply_tags(self, tags: dict):
+        for key, required in tags.items():
+            option = self._options.get(key)
+
+            if option is None or not hasattr(option, "indices_with_tags"):
+                raise Exception('tags given for option "{}" which does not support tags'.format(key))
+
+            if isinstance(required, str):
+                required = [required]
+
+            # List option domains are ordered by selection index.
+            tagged = set(option.indices_with_tags(*required))
+            self._candidates[key] = [i for i in self._candidates[key] if i in tagged]
+
+    def _apply_unary(self, constraint: SCConstraint):
+        key = constraint.keys[0]
+        domain = self._domains[key]
+        self._candidates[key] = [i for i in self._candidates[key] if constraint.test({key: domain[i][1]})]
+
+    def _make_arc_consistent(self):
+        # AC-3 over the constraints between exactly two options.
+        queue = [
+            (key, constraint)
+            for key, constraints in self._constraints.items()
+            for constraint in constraints
+            if len(constraint.keys) == 2
+        ]
+
+        while len(queue) > 0:
+            key, constraint = queue.pop()
+            other = constraint.keys[1] if constraint.keys[0] == key else constraint.keys[0]
+
+            if self._revise(key, other, constraint):
+                for neighbor in self._constraints[key]:
+                    if neighbor is not constraint and len(neighbor.keys) == 2:
+                        queue.append((neighbor.keys[1] if neighbor.keys[0] == key else neighbor.keys[0], neighbor))
+
+    def _revise(self, key: str, other: str, constraint: SCConstraint) -> bool:
+        domain = self._domains[key]
+        other_domain = self._domains[other]
+        kept = []
+
+        for i in self._candidates[key]:
+            for j in self._candidates[other]:
+                if constraint.test({key: domain[i][1], other: other_domain[j][1]}):
+                    kept.append(i)
+                    break
+
+        if len(kept) == len(self._candidates[key]):
+            return False
+
+        self._candidates[key] = kept
+        return True
+
+    def _generate_one(self) -> dict[str, any]:
+        rng = self._random()
+        candidates = {key: list(values) for key, values in self._candidates.items()}
+        assignment = self._search(candidates, {}, rng)
+
+        if assignment is None:
+            raise Exception("SCRandomizer constraints cannot all be satisfied")
+
+        out = {}
+        for key, option in self._options.items():
+            if key in assignment:
+                out[key] = self._domains[key][assignment[key]][0]
+            else:
+                selection = option._random_selection(rng)
+                if selection is not None:
+                    out[key] = selection
+
+        return out
+
+    def _search(self, candidates: dict, assignment: dict, rng) -> dict | None:
+        if len(assignment) == len(candidates):
+            return assignment
+
+        # Most constrained option first.
+        key = None
+        for k in candidates:
+            if k not in assignment and (key is None or len(candidates[k]) < len(candidates[key])):
+                key = k
+
+        remaining = list(candidates[key])
+
+        while len(remaining) > 0:
+            index = self._pick(key, remaining, rng)
+            remaining.remove(index)
+            assignment[key] = index
+
+            pruned = self._forward_check(key, candidates, assignment)
+
+            if pruned is not None:
+                if self._search(candidates, assignment, rng) is not None:
+                    return assignment
+
+                for other, values in reversed(pruned):
+                    candidates[other] = values
+
+            del assignment[key]
+
+        return None
+
+    def _pick(self, key: str, remaining: list[int], rng) -> int:
+        weights = self._weights[key]
+
+        if weights is None:
+            return remaining[rng.randint(0, len(remaining) - 1)]
+
+        total = 0.0
+        for i in remaining:
+            total += weights[i]
+
+        if total <= 0.0:
+            return remaining[rng.randint(0, len(remaining) - 1)]
+
+        target = rng.random() * total
+        for i in remaining:
+            target -= weights[i]
+            if target < 0.0:
+                return i
+
+        return remaining[-1]
+
+    def _forward_check(self, key: str, candidates: dict, assignment: dict) -> list | None:
+        """
+        Prunes the candidates of options that share a constraint with the
+        given, newly assigned option.  Returns the list of replaced candidate
+        lists so they may be restored, or `None` if a constraint is broken.
+        """
+        pruned = []
+
+        for constraint in self._constraints[key]:
+            open_keys = [k for k in constraint.keys if k not in assignment]
+            values = {k: self._domains[k][assignment[k]][1] for k in constraint.keys if k in assignment}
+
+            if len(open_keys) == 0:
+                if not constraint.test(values):
+                    break
+            elif len(open_keys) == 1:
+                other = open_keys[0]
+                domain = self._domains[other]
+                kept = []
+
+                for i in candidates[other]:
+                    values[other] = domain[i][1]
+                    if constraint.test(values):
+                        kept.append(i)
+
+                if len(kept) < len(candidates[other]):
+                    pruned.append((other, candidates[other]))
+                    candidates[other] = kept
+
+                if len(kept) == 0:
+                    break
+        else:
+            return pruned
+
+        for other, values in reversed(pruned):
+            candidates[other] = values
+
+        return None
@@ -1,7 +1,12 @@
-from renpy.store import LayeredImage  # type: ignore
+from renpy.store import Displayable, LayeredImage  # type: ignore
 import renpy.exports as renpy  # type: ignore
 
+from .crowd_ren import SCCrowd, SCCrowdCache
+from .edit_session_ren import SCEditSession
 from .layer_ren import SCLayer
+from .layer_order_ren import SCLayerOrder, SCLayerStack
+from .option_graph_ren import SCOptionGraph
+from .randomizer_ren import SCRandomizer
 from ..state.state_ren import SCState
 from ..options.option_ren import SCOption
 
@@ -88,11 +93,16 @@ class CustomizedSprite:
 
         transform (callable): An optional transform function that will be
         applied to the created image.
+
+        constraints (SCConstraint[]): An optional list of constraints that
+        `randomize` must respect.
         """
         self._layers: list[SCLayer] = [*layers]
         self._options = OrderedDict()
         self._option_to_layer = OrderedDict()
         self._options_by_group = OrderedDict()
+        self._state: SCState | None = None
+        self._session: SCEditSession | None = None
 
         if len(layers) == 0:
             raise Exception("CustomizedSprite needs at least one layer to display!")
@@ -114,6 +124,14 @@ class CustomizedSprite:
                 else:
                     self._options_by_group[option.group] = [option]
 
+        for layer in layers:
+            layer._bind_conditions(self._options)
+
+        self._graph = SCOptionGraph(self._options)
+
+        for option in self._options.values():
+            option._set_graph(self._graph)
+
         if "transform" in kwargs:
             if not callable(kwargs["transform"]):
                 raise Exception("CustomizedSprite transform must be callable.")
@@ -122,20 +140,37 @@ class CustomizedSprite:
         else:
             transform = None
 
-        # Build the layered image
-        attrs = [layers[0]._build_image()]
+        constraints = kwargs.get("constraints", None)
 
-        for i in range(1, len(layers)):
-            attrs.append(layers[i]._build_attribute())
+        if constraints is None:
+            self._randomizer = None
+        elif isinstance(constraints, list):
+            self._randomizer = SCRandomizer(self, *constraints)
+        else:
+            raise Exception("CustomizedSprite constraints must be a list of SCConstraint instances.")
+
+        if any(len(layer._z_rules) > 0 or layer._z_index != 0 for layer in layers):
+            self._layer_order = SCLayerOrder(self._layers, self._options)
+        else:
+            self._layer_order = None
+
+        # The preview is registered as an image of its own, under a tag that
+        # is not the sprite's, so showing it never replaces the sprite.
+        self._preview = "_sc_preview_" + image_name.replace(" ", "_")
 
         if transform is None:
-            renpy.image(image_name, LayeredImage(attrs))
+            renpy.image(image_name, self._build_image(False))
+            renpy.image(self._preview, self._build_image(True))
         else:
             from uuid import uuid4
             tmp_name = str(uuid4())
-            renpy.image(tmp_name, LayeredImage(attrs))
+            renpy.image(tmp_name, self._build_image(False))
             renpy.image(image_name, transform(tmp_name))
 
+            tmp_name = str(uuid4())
+            renpy.image(tmp_name, self._build_image(True))
+            renpy.image(self._preview, transform(tmp_name))
+
     # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
     #
     #   Properties
@@ -164,6 +199,27 @@ class CustomizedSprite:
         """
         return len(self._option_to_layer.keys())
 
+    @property
+    def preview(self) -> str:
+        """
+        Name of an image showing this sprite with the staged selections of its
+        open edit session, or with its state's selections when no session is
+        open.
+
+        The image registered under the sprite's image name always shows the
+        state's selections, so scenes showing the sprite do not see changes
+        until they are committed.
+        """
+        return self._preview
+
+    @property
+    def edit_session(self) -> SCEditSession | None:
+        """
+        The currently open edit session for this CustomizedSprite instance, if
+        any.
+        """
+        return self._session
+
     @property
     def option_groups(self) -> list[str]:
         """
@@ -188,6 +244,44 @@ class CustomizedSprite:
         if option not in self._option_to_layer:
             raise Exception("Unrecognized CustomizedSprite option \"{}\"".format(option))
 
+    def _bound_state(self) -> SCState:
+        if self._session is not None:
+            return self._session.state
+
+        if self._state is None:
+            raise Exception("CustomizedSprite state is not yet set!  Did you forget to call `set_state`?")
+
+        return self._state
+
+    def _committed_state(self) -> SCState:
+        if self._state is None:
+            raise Exception("CustomizedSprite state is not yet set!  Did you forget to call `set_state`?")
+
+        return self._state
+
+    def _build_image(self, preview: bool) -> Displayable:
+        # Sprites whose layers can change order or be disabled draw their
+        # layers through a stack that reorders them and leaves out disabled
+        # layers instead of a layered image.
+        if self._layer_order is not None or any(layer._enabled_when is not None for layer in self._layers):
+            state = self._bound_state if preview else self._committed_state
+            children = [layer._build_image(preview) for layer in self._layers]
+            return SCLayerStack(self._layers, children, self._layer_order, state)
+
+        attrs = [self._layers[0]._build_image(preview)]
+
+        for i in range(1, len(self._layers)):
+            attrs.append(self._layers[i]._build_attribute(preview))
+
+        return LayeredImage(attrs)
+
+    def _end_edit(self, session: SCEditSession):
+        if self._session is session:
+            self._session = None
+
+            for layer in self._layers:
+                layer._set_staged(None)
+
     # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
     #
     #   Public Methods
@@ -219,9 +313,66 @@ class CustomizedSprite:
         if not isinstance(state, SCState):
             raise Exception("Value passed to set_state must be an SCState instance.")
 
+        if self._session is not None:
+            self._session.discard()
+
+        self._state = state
+
         for layer in self._layers:
             layer._set_state(state)
 
+    def begin_edit(self) -> SCEditSession:
+        """
+        Opens a transactional edit session for this CustomizedSprite instance.
+
+        Until the returned session is finished, all changes made through this
+        sprite's options are staged over the sprite's state rather than being
+        written to it.  The staged selections are only displayed by the
+        sprite's `preview`, while the sprite's image keeps showing the state's
+        selections.  Calling `commit` on the session writes the changes to the
+        state, while calling `discard` throws them away.
+
+        Opening a session is O(1) as the sprite's state is not copied.  If a
+        session is already open, that session is returned.
+
+        ```python
+        session = my_sprite.begin_edit()
+        my_sprite.randomize()
+        session.discard()
+        ```
+
+        Returns
+        -------
+        SCEditSession
+            The open edit session.
+        """
+        if self._session is not None:
+            return self._session
+
+        if self._state is None:
+            raise Exception("CustomizedSprite state is not yet set!  Did you forget to call `set_state`?")
+
+        self._session = SCEditSession(self, self._state, sc.edit_history_limit)
+
+        for layer in self._layers:
+            layer._set_staged(self._session.state)
+
+        return self._session
+
+    def commit_edit(self):
+        """
+        Commits the currently open edit session, if any.
+        """
+        if self._session is not None:
+            self._session.commit()
+
+    def discard_edit(self):
+        """
+        Discards the currently open edit session, if any.
+        """
+        if self._session is not None:
+            self._session.discard()
+
     def get_options(self) -> list[SCOption]:
         """
         Gets a list of the options attached to this CustomizedSprite
@@ -321,13 +472,92 @@ class CustomizedSprite:
 
         return out
 
-    def randomize(self):
+    def randomizer(
+        self,
+        *constraints,
+        seed: any = None,
+        weights: dict | None = None,
+        tags: dict | None = None,
+    ) -> SCRandomizer:
+        """
+        Creates a randomizer for the options of this CustomizedSprite
+        instance.
+
+        The returned randomizer may be used to randomize this sprite under
+        constraints other than the sprite's own, or to generate many random
+        configurations at once, for example to create NPC states.
+
+        ```python
+        crowd = my_sprite.randomizer(seed=7).generate(50)
+        states = [SCState(selections) for selections in crowd]
+        ```
+
+        Arguments
+        ---------
+        constraints : SCConstraint[]
+            Constraints the generated selections must satisfy.  When none
+            are given, the sprite's own constraints are used.
+
+        seed : any
+            Optional seed making the generated selections reproducible.
+
+        weights : dict
+            Optional relative weights for option values, keyed by option key
+            then by option value.
+
+        tags : dict
+            Optional tag filters for list options, keyed by option key.
+
+        Returns
+        -------
+        SCRandomizer
+            A new randomizer for this sprite's options.
+        """
+        if len(constraints) == 0 and self._randomizer is not None:
+            constraints = self._randomizer._declared
+
+        return SCRandomizer(self, *constraints, seed=seed, weights=weights, tags=tags)
+
+    def randomize(self, seed: any = None):
         """
         Randomizes the selections for all the options on this
-        CustomizedSprite instance.
+        CustomizedSprite instance, respecting any constraints the sprite was
+        created with.
+
+        Options that are hidden or disabled by their `visible_when` or
+        `enabled_when` rules, once the options they depend on have been
+        randomized, are left unchanged.
+
+        If the state the sprite is currently displaying records an undo
+        history, the whole randomization is recorded as a single step.
+
+        Arguments
+        ---------
+        seed : any
+            Optional seed making the randomized selections reproducible.
         """
-        for option in self._options.values():
-            option.randomize()
+        if seed is not None:
+            self.randomizer(seed=seed).randomize()
+            return
+
+        if self._randomizer is not None:
+            self._randomizer.randomize()
+            return
+
+        history = self._bound_state()._history
+
+        if history is not None:
+            history.begin_batch()
+
+        try:
+            state = self._bound_state()
+
+            for key in self._graph.order:
+                if self._graph.is_active(key, state):
+                    self._options[key].randomize()
+        finally:
+            if history is not None:
+                history.end_batch()
 
 
 class CustomizedSpriteFactory:
@@ -363,6 +593,7 @@ class CustomizedSpriteFactory:
 
         self._layers = layers
         self._kwargs = kwargs
+        self._crowd_cache: SCCrowdCache | None = None
 
     def new_sprite(self, image_name: str, **kwargs: any):
         """
@@ -379,3 +610,22 @@ class CustomizedSpriteFactory:
                 kwargs[key] = self._kwargs[key]
 
         return CustomizedSprite(image_name, *[layer._clone() for layer in self._layers], **kwargs)
+
+    def crowd(self, entries: list[tuple] | None = None) -> SCCrowd:
+        """
+        Constructs a new `SCCrowd` displayable drawing many sprites made from
+        this factory's layers in a single render.
+
+        All the crowds created by the same factory share one cache of sprite
+        composites, so NPCs that look alike are only built once.
+
+        Arguments:
+
+        entries (tuple[]):  An optional list of `(state, position)` or
+        `(state, position, transform)` tuples, one for each sprite in the
+        crowd.
+        """
+        if self._crowd_cache is None:
+            self._crowd_cache = SCCrowdCache([layer._clone() for layer in self._layers], self._kwargs.get("transform", None))
+
+        return SCCrowd(self._crowd_cache, entries)
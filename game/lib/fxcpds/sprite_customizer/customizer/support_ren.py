@@ -1,6 +1,7 @@
 import renpy  # type: ignore
-from renpy import InputValue  # type: ignore
+from renpy import BarValue, InputValue, ui  # type: ignore
 
+from ..options.range_option_ren import SCRangeOption
 from ..options.text_option_ren import SCTextOption
 
 """renpy
@@ -27,3 +28,58 @@ class SCTextInput(InputValue):
         self._option.commit_to_selection()
         renpy.run(self.Disable())
         raise renpy.IgnoreEvent()
+
+
+class SCRangeBarValue(BarValue):
+    def __init__(self, option: SCRangeOption):
+        if not isinstance(option, SCRangeOption):
+            raise Exception("option must be an SCRangeOption instance")
+
+        self._option = option
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, SCRangeBarValue) and other._option is self._option
+
+    def __hash__(self) -> int:
+        return id(self._option)
+
+    def get_adjustment(self):
+        # The bar moves in whole steps, so dragging it can only ever select
+        # one of the option's step indices.
+        self.adjustment = ui.adjustment(
+            range=self._option.step_count - 1,
+            value=self._option.selection_index,
+            step=1,
+            page=1,
+            changed=self.changed,
+            force_step=True,
+        )
+
+        return self.adjustment
+
+    def changed(self, value: float):
+        index = int(round(value))
+
+        if index == self._option.selection_index:
+            return
+
+        # Every position of a drag is folded into a single undo step, which
+        # ends when the bar is released.
+        history = self._option._req_state().history
+
+        if history is None:
+            self._option.set_selection_index(index)
+        else:
+            with history.merging():
+                self._option.set_selection_index(index)
+
+        renpy.restart_interaction()
+
+    def end_drag(self):
+        history = self._option._req_state().history
+
+        if history is not None:
+            history.end_merge()
+
+    def get_style(self):
+        return "slider", "vslider"
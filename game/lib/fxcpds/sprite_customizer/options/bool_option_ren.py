@@ -1,5 +1,6 @@
 import renpy  # type: ignore
 from .option_ren import SCOption, SC_OPTION_TYPE_BOOLEAN
+from ..state.state_ren import SCState
 
 """renpy
 init -1 python:
@@ -73,7 +74,7 @@ class SCBooleanOption(SCOption):
             value is the selection when this option is `False`.  Defaults to
             `(True, False)`.
         """
-        super().__init__(key, name, group, SC_OPTION_TYPE_BOOLEAN)
+        super().__init__(key, name, group, SC_OPTION_TYPE_BOOLEAN, **kwargs)
 
         if not isinstance(default, bool):
             raise Exception('"default" must be a boolean value')
@@ -109,10 +110,7 @@ class SCBooleanOption(SCOption):
         any
             The current selection value for this SCBooleanOption.
         """
-        if not self._req_state().has_selection(self._key):
-            self._state.set_selection(self._key, self._pick_value(self._default))
-
-        return self._state.get_selection(self._key)
+        return self._value_for(self._req_state())
 
     # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
     #
@@ -129,6 +127,18 @@ class SCBooleanOption(SCOption):
             (self._when_true, self._when_false),
         )
 
+    def _value_for(self, state: SCState) -> any:
+        if state.has_selection(self._key):
+            return state.get_selection(self._key)
+
+        return self._pick_value(self._default)
+
+    def _random_domain(self) -> list[tuple[any, any]]:
+        return [(self._when_true, self._when_true), (self._when_false, self._when_false)]
+
+    def _random_selection(self, rng) -> any:
+        return self._pick_value(rng.randint(1, 2) == 1)
+
     def _pick_value(self, tf: bool) -> any:
         return self._when_true if tf else self._when_false
 
@@ -167,7 +177,4 @@ class SCBooleanOption(SCOption):
         Selects a "random" option from either `True` or `False` and sets the
         user selection accordingly.
         """
-        if renpy.random.randint(1, 2) == 1:
-            self.set_selection(True)
-        else:
-            self.set_selection(False)
+        self._req_state().set_selection(self._key, self._random_selection(renpy.random))
@@ -1,8 +1,10 @@
 import renpy  # type: ignore
-from renpy.store import DynamicDisplayable, Solid  # type: ignore
 
 from .option_ren import SCOption, SC_OPTION_TYPE_COLOR
+from ..state.state_ren import SCState
 from ..color_picker.fox_color_ren import FoxColor, hex_to_fox_rgb, FoxRGB
+from ..color_picker.palette_ren import FoxPalette
+from ..color_picker.swatch_ren import ColorSwatch
 
 """renpy
 init -1 python:
@@ -21,6 +23,13 @@ class SCColorOption(SCOption):
     SCColorOption("my_option", "My Option", "My Group", "#ff0000")
     ```
 
+    An option may be restricted to a palette of colors, in which case any
+    color it is set to is snapped to the palette color that looks closest.
+
+    ```python
+    SCColorOption("hair_color", "Color", "Hair", "#3b2219", palette=["#3b2219", "#a56b46", "#e6cea8"])
+    ```
+
     **IMPORTANT**: This option type is state dependent and cannot be used on its
     own, it **MUST** be registered to an SCLayer instance to be in any way
     useful.
@@ -32,6 +41,8 @@ class SCColorOption(SCOption):
         name: str,
         group: str | None,
         default: str | FoxColor,
+        palette: list[str | FoxColor] | FoxPalette | None = None,
+        **kwargs
     ):
         """
         Initializes the new SCColorOption with the given arguments.
@@ -51,9 +62,15 @@ class SCColorOption(SCOption):
         default : str | FoxColor
             Default color value to use when no selection has yet been made by
             the user.
+
+        palette : list[str | FoxColor] | FoxPalette | None
+            Optional list of the only colors this option may take.  Colors
+            picked freely are snapped to the closest palette color.  A
+            `FoxPalette` instance may be given to share one palette between
+            several options.
         """
         from uuid import uuid4
-        super().__init__(key, name, group, SC_OPTION_TYPE_COLOR)
+        super().__init__(key, name, group, SC_OPTION_TYPE_COLOR, **kwargs)
 
         if isinstance(default, str):
             tmp = hex_to_fox_rgb(default)
@@ -64,6 +81,14 @@ class SCColorOption(SCOption):
         else:
             raise Exception('"default" must be a string or a FoxColor instance.')
 
+        if palette is None or isinstance(palette, FoxPalette):
+            self._palette = palette
+        else:
+            self._palette = FoxPalette(palette)
+
+        if self._palette is not None:
+            self._default = self._palette.nearest(self._default)
+
         self._image_name = str(uuid4())
 
     # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
@@ -82,6 +107,14 @@ class SCColorOption(SCOption):
         """
         return self._image_name
 
+    @property
+    def palette(self) -> FoxPalette | None:
+        """
+        FoxPalette | None
+            The palette this option is restricted to, if any.
+        """
+        return self._palette
+
     @property
     def selection_value(self) -> str:
         """
@@ -89,10 +122,7 @@ class SCColorOption(SCOption):
             The current selection value for this SCColorOption instance.  This
             value will be a hex color string.
         """
-        if not self._req_state().has_selection(self._key):
-            self._state.set_selection(self._key, self._default)
-
-        return self._state.get_selection(self._key)
+        return self._value_for(self._req_state())
 
     # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
     #
@@ -101,14 +131,44 @@ class SCColorOption(SCOption):
     # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
 
     def _clone(self):
-        return SCColorOption(self._key, self._name, self._group, self._default)
+        return SCColorOption(self._key, self._name, self._group, self._default, self._palette)
+
+    def _value_for(self, state: SCState) -> str:
+        if not state.has_selection(self._key):
+            return self._default
+
+        value = state.get_selection(self._key)
+
+        # Selections stored before the palette was added or changed are
+        # snapped to it, so the option only ever yields palette colors.
+        # Snapped colors are memoized by the palette, so this is a dict
+        # lookup once a selection has been seen.
+        if self._palette is not None:
+            return self._palette.nearest(value)
+
+        return value
+
+    def _random_domain(self) -> list[tuple[any, any]] | None:
+        if self._palette is None:
+            return None
+
+        return [(color, color) for color in self._palette.colors]
+
+    def _random_selection(self, rng) -> str:
+        if self._palette is not None:
+            return rng.choice(self._palette.colors)
+
+        return FoxRGB(
+            rng.randint(0, 255),
+            rng.randint(0, 255),
+            rng.randint(0, 255),
+        ).hex
 
     def _post_clone(self):
-        renpy.image(self._image_name, DynamicDisplayable(self._color_cb))
+        renpy.image(self._image_name, ColorSwatch(self._swatch_color))
 
-    # noinspection PyUnusedLocal
-    def _color_cb(self, st: float, at: float):
-        return Solid(self.selection_value), 0.0
+    def _swatch_color(self) -> str:
+        return self.selection_value
 
     # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
     #
@@ -116,11 +176,35 @@ class SCColorOption(SCOption):
     #
     # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
 
+    def snap(self, value: str) -> str:
+        """
+        Returns the color this option would store if set to the given hex
+        color string: the closest palette color if the option has a palette,
+        otherwise the given color.
+
+        Arguments
+        ---------
+        value : str
+            Hex color string to snap.
+
+        Returns
+        -------
+        str
+            Hex color string.
+        """
+        if self._palette is None:
+            return value
+
+        return self._palette.nearest(value)
+
     def set_selection(self, value: str):
         """
         Sets the selection to the given value if and only if it is a valid hex
         color string.
 
+        If this option has a palette, the closest palette color is selected
+        instead.
+
         If the given value is _not_ a valid hex color string, this method will
         raise an exception.
 
@@ -132,6 +216,10 @@ class SCColorOption(SCOption):
         if not isinstance(value, str):
             raise Exception('"value" must be a hex string')
 
+        if self._palette is not None:
+            self._req_state().set_selection(self._key, self._palette.nearest(value))
+            return
+
         tmp = hex_to_fox_rgb(value)
         tmp.set_alpha(1.0)
         self._req_state().set_selection(self._key, tmp.hex)
@@ -141,8 +229,4 @@ class SCColorOption(SCOption):
         Selects a "random" color option and sets the user selection to that
         value.
         """
-        self._req_state().set_selection(self._key, FoxRGB(
-            renpy.random.randint(0, 255),
-            renpy.random.randint(0, 255),
-            renpy.random.randint(0, 255),
-        ).hex)
+        self._req_state().set_selection(self._key, self._random_selection(renpy.random))
@@ -0,0 +1,127 @@
+import renpy  # type: ignore
+
+"""renpy
+init -1 python:
+"""
+
+import json
+import os
+import re
+
+
+class SCFileIndex:
+    """
+    # Sprite Customizer File Index
+
+    Builds option value lists from the names of the game's files.
+
+    A pattern is a path relative to the game directory containing a single
+    `*` wildcard, for example `"images/ccp/hair/*.png"`.  The values for a
+    pattern are the parts of the matching file paths that the wildcard stands
+    in for, sorted, so `images/ccp/hair/bob.png` gives the value `"bob"`.
+
+    The game's file list is read once, and the values for each pattern are
+    computed once and shared by every option built from that pattern.  Both
+    are held on the class rather than in store variables so that they are
+    never written into save files.
+
+    For packaged builds, the values may also be written to a JSON manifest
+    file while the game is run in developer mode and then read back from the
+    manifest in distributed builds instead of scanning the archives.
+    """
+
+    _files = None
+    _entries: dict[str, list[str]] = {}
+
+    @staticmethod
+    def values(pattern: str, manifest: str | None = None) -> list[str]:
+        """
+        Returns the values for the given file pattern.
+
+        Arguments
+        ---------
+        pattern : str
+            Game directory relative path containing a single `*` wildcard.
+
+        manifest : str | None
+            Optional game directory relative path of a JSON manifest file.
+            When the game is running in developer mode, the computed values
+            are written to the manifest.  Otherwise, values found in the
+            manifest are used without scanning the game's files.
+
+        Returns
+        -------
+        list[str]
+            Sorted values for the pattern.  The returned list is shared and
+            must not be modified.
+        """
+        if not isinstance(pattern, str) or pattern.count("*") != 1:
+            raise Exception('"pattern" must be a string containing exactly one "*" wildcard')
+
+        out = SCFileIndex._entries.get(pattern)
+
+        if out is not None:
+            return out
+
+        if manifest is not None and not renpy.config.developer:
+            out = SCFileIndex._read_manifest(manifest).get(pattern)
+
+        if out is None:
+            out = SCFileIndex._scan(pattern)
+
+            if manifest is not None and renpy.config.developer:
+                SCFileIndex._write_manifest(manifest, pattern, out)
+
+        SCFileIndex._entries[pattern] = out
+        return out
+
+    @staticmethod
+    def clear():
+        """
+        Forgets the cached file list and pattern values so they are recomputed
+        on next use.
+        """
+        SCFileIndex._files = None
+        SCFileIndex._entries = {}
+
+    @staticmethod
+    def _scan(pattern: str) -> list[str]:
+        if SCFileIndex._files is None:
+            SCFileIndex._files = renpy.list_files()
+
+        prefix, suffix = pattern.split("*")
+        regex = re.compile(re.escape(prefix) + "([^/]+)" + re.escape(suffix) + "$")
+
+        out = set()
+        for file in SCFileIndex._files:
+            match = regex.match(file)
+            if match is not None:
+                out.add(match.group(1))
+
+        return sorted(out)
+
+    @staticmethod
+    def _read_manifest(manifest: str) -> dict[str, list[str]]:
+        if not renpy.loadable(manifest):
+            return {}
+
+        with renpy.open_file(manifest, encoding="utf-8") as f:
+            return json.load(f)
+
+    @staticmethod
+    def _write_manifest(manifest: str, pattern: str, values: list[str]):
+        path = os.path.join(renpy.config.gamedir, manifest)
+
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            entries = {}
+
+        if entries.get(pattern) == values:
+            return
+
+        entries[pattern] = values
+
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(entries, f, indent=2, sort_keys=True)
@@ -1,11 +1,16 @@
 import renpy  # type: ignore
 
+from .file_index_ren import SCFileIndex
 from .option_ren import SCOption, SC_OPTION_TYPE_VALUE_LIST
+from .paged_values_ren import SCPagedValues, SCValuesView
+from ..state.state_ren import SCState
 
 """renpy
 init -1 python:
 """
 
+from bisect import bisect_right
+
 
 class SCListOption(SCOption):
     """
@@ -16,6 +21,19 @@ class SCListOption(SCOption):
     SCListOption("my_option", "My Option", "My Group", [ "some", "choices" ])
     ```
 
+    Values may be given relative weights and tags, which are used when the
+    option is randomized.  Weighted and tag-filtered picks use cumulative
+    weight tables built once when the option is created, so each pick is a
+    binary search regardless of how many values the option has.
+
+    ```python
+    SCListOption(
+        "outfit", "Outfit", "Body", [ "suit", "dress", "parka", "tshirt" ],
+        weights={ "suit": 1, "dress": 1, "parka": 2, "tshirt": 4 },
+        tags={ "suit": [ "formal" ], "dress": [ "formal" ], "parka": [ "winter" ] },
+    )
+    ```
+
     **IMPORTANT**: This option type is state dependent and cannot be used on its
     own, it **MUST** be registered to an SCLayer instance to be in any way
     useful.
@@ -26,8 +44,13 @@ class SCListOption(SCOption):
         key: str,
         name: str,
         group: str,
-        values: list[any] | set[any],
-        display_digits: int = 2
+        values: list[any] | set[any] | SCPagedValues,
+        display_digits: int = 2,
+        thumbnails: bool = False,
+        weights: list[float] | dict[any, float] | None = None,
+        tags: list[list[str]] | dict[any, list[str]] | None = None,
+        store_by_value: bool = False,
+        **kwargs
     ):
         """
         Initializes the new SCListOption instance with the given
@@ -45,8 +68,12 @@ class SCListOption(SCOption):
         group : str
             Group name for this option.
 
-        values : any[]
-            List of values for this option.
+        values : any[] | SCPagedValues
+            List of values for this option, or a paged value source for very
+            large catalogs that should not be held in memory.  Options using a
+            paged source are randomized independently by `SCRandomizer` and
+            may not be referenced by its constraints, and giving `weights` or
+            `tags` as dicts loads every page once while the option is created.
 
         display_digits : int
             Number of digits to display when rendering the selection index
@@ -54,11 +81,35 @@ class SCListOption(SCOption):
             this digit count.  For example, given the `display_digits` value
             `3`, when rendering the first index as a string, the returned
             string would be "001".
+
+        thumbnails : bool
+            Whether the sprite customization screen should show this option
+            as a grid of thumbnails of each value, rendered through the layer
+            the option is attached to, instead of as a pair of arrows around
+            the selection index.
+
+        weights : float[] | dict
+            Optional relative weights used when randomizing this option,
+            either as a list in the same order as `values` or as a dict keyed
+            by value.  Values without a weight default to `1.0`.
+
+        tags : str[][] | dict
+            Optional tags for each value, either as a list of tag lists in the
+            same order as `values` or as a dict of tag lists keyed by value.
+            Tags may be used to restrict randomization to matching values.
+
+        store_by_value : bool
+            Whether the selection should be recorded in the sprite state as
+            the selected value rather than as its index.  Storing by value
+            keeps saved selections intact if the value list is later
+            reordered or extended.  Selected values that are no longer in the
+            list fall back to the first value.  Paged sources must be given an
+            `index_of` function to be stored by value.
         """
-        SCOption.__init__(self, key, name, group, SC_OPTION_TYPE_VALUE_LIST)
+        SCOption.__init__(self, key, name, group, SC_OPTION_TYPE_VALUE_LIST, **kwargs)
 
-        if not (isinstance(values, list) or isinstance(values, set)):
-            raise Exception("\"values\" argument must be a list or a set")
+        if not (isinstance(values, list) or isinstance(values, set) or isinstance(values, SCPagedValues)):
+            raise Exception("\"values\" argument must be a list, a set, or an SCPagedValues instance")
 
         if len(values) < 1:
             raise Exception("\"values\" argument must contain at least one option value")
@@ -69,9 +120,101 @@ class SCListOption(SCOption):
         if display_digits < 1:
             raise Exception("\"display_digits\" argument must be greater than or equal to 1")
 
+        if not isinstance(thumbnails, bool):
+            raise Exception("\"thumbnails\" argument must be a boolean value")
+
+        if not isinstance(store_by_value, bool):
+            raise Exception("\"store_by_value\" argument must be a boolean value")
+
+        # Every read of a by-value selection looks its index up, which would
+        # page the whole source in without an index_of function.
+        if store_by_value and isinstance(values, SCPagedValues) and not values.has_index_of:
+            raise Exception("\"store_by_value\" argument requires an SCPagedValues source with an \"index_of\" function")
+
         self._display_pattern = "{{0{}d}}".format(display_digits)
+        self._thumbnails = thumbnails
+        self._store_by_value = store_by_value
+
+        self._paged = isinstance(values, SCPagedValues)
+        self._values: list[any] | SCPagedValues = values if self._paged else [value for value in values]
+
+        # Reverse lookup from value to index.  Unhashable values can't be
+        # keyed so their indices are kept aside and scanned instead.  Paged
+        # sources do their own lookups.
+        self._index_of: dict[any, int] = {}
+        self._unhashable: list[int] = []
+
+        if not self._paged:
+            for i, value in enumerate(self._values):
+                try:
+                    self._index_of.setdefault(value, i)
+                except TypeError:
+                    self._unhashable.append(i)
+
+        self._weights: list[float] | None = self._compile_weights(weights)
+        self._cumulative: list[float] | None = None
+        self._tag_index: dict[str, list[int]] = self._compile_tags(tags)
+        self._tag_sets: dict[str, frozenset[int]] = {tag: frozenset(i) for tag, i in self._tag_index.items()}
+        self._tag_tables: dict[frozenset, tuple[list[int], list[float]]] = {}
+
+        if self._weights is not None:
+            self._cumulative = self._cumulate(range(len(self._values)))
+
+        for tag in self._tag_index.keys():
+            self._tag_table(frozenset((tag,)))
+
+    @staticmethod
+    def from_files(
+        key: str,
+        name: str,
+        group: str,
+        pattern: str,
+        manifest: str | None = None,
+        **kwargs: any,
+    ) -> 'SCListOption':
+        """
+        Creates a new SCListOption instance whose values are the names of the
+        game files matching the given pattern.
+
+        ```python
+        SCListOption.from_files("hair_style", "Style", "Hair", "images/ccp/hair/*.png")
+        ```
+
+        Arguments
+        ---------
+        key : str
+            Key for this option.
 
-        self._values: list[any] = [value for value in values]
+        name : str
+            Display name for this option.
+
+        group : str
+            Group name for this option.
+
+        pattern : str
+            Game directory relative path containing a single `*` wildcard.
+            The option values will be the sorted parts of the matching file
+            paths that the wildcard stands in for.
+
+        manifest : str | None
+            Optional game directory relative path of a JSON manifest the
+            values are written to in developer mode and read from in
+            distributed builds.  See `SCFileIndex`.
+
+        kwargs : any
+            Any other `SCListOption` constructor arguments.
+
+        Returns
+        -------
+        SCListOption
+            The new option.
+        """
+        values = SCFileIndex.values(pattern, manifest)
+
+        if len(values) < 1:
+            raise Exception("no files match the pattern \"{}\" for option \"{}\"".format(pattern, key))
+
+        return SCListOption(key, name, group, values, **kwargs)
 
     # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
     #
@@ -80,10 +223,15 @@ class SCListOption(SCOption):
     # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
 
     @property
-    def values(self) -> list[any]:
+    def values(self) -> list[any] | SCValuesView:
         """
-        The list of values that are part of this option group.
+        List of the values that are part of this option group, or a read-only
+        view of them if the values come from an `SCPagedValues` source, so
+        that reading them does not load every page.
         """
+        if self._paged:
+            return SCValuesView(self._values)
+
         return self._values.copy()
 
     @property
@@ -93,22 +241,43 @@ class SCListOption(SCOption):
         """
         return len(self._values)
 
+    @property
+    def weights(self) -> list[float]:
+        """
+        The relative randomization weight of each value in this option group.
+        """
+        if self._weights is None:
+            return [1.0] * len(self._values)
+
+        return self._weights.copy()
+
+    @property
+    def tags(self) -> list[str]:
+        """
+        Sorted list of every tag used by the values in this option group.
+        """
+        return sorted(self._tag_index.keys())
+
+    @property
+    def has_thumbnails(self) -> bool:
+        """
+        Whether this option should be displayed as a grid of value thumbnails.
+        """
+        return self._thumbnails
+
     @property
     def selection_index(self) -> int:
         """
         Index of the current selection for this option group.
         """
-        if self._req_state().has_selection(self._key):
-            return self._state.get_selection(self._key)
-        else:
-            return 0
+        return self._index_for(self._req_state())
 
     @property
     def selection_value(self) -> any:
         """
         The currently selected value for this option group.
         """
-        return self._values[self.selection_index]
+        return self._value_for(self._req_state())
 
     # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
     #
@@ -116,6 +285,139 @@ class SCListOption(SCOption):
     #
     # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
 
+    def _index_for(self, state: SCState) -> int:
+        if not state.has_selection(self._key):
+            return 0
+
+        selection = state.get_selection(self._key)
+
+        if not self._store_by_value:
+            return selection
+
+        index = self.index_of(selection)
+        return 0 if index is None else index
+
+    def _selection_for(self, index: int) -> any:
+        return self._values[index] if self._store_by_value else index
+
+    def _value_for(self, state: SCState) -> any:
+        return self._values[self._index_for(state)]
+
+    def _random_domain(self) -> list[tuple[any, any]] | None:
+        if self._paged:
+            return None
+
+        return [(self._selection_for(i), self._values[i]) for i in range(len(self._values))]
+
+    def _random_weights(self) -> list[float] | None:
+        return self._weights
+
+    def _random_selection(self, rng, tags: frozenset | None = None) -> any:
+        return self._selection_for(self._random_index(rng, tags))
+
+    def _random_index(self, rng, tags: frozenset | None = None) -> int:
+        if tags:
+            indices, cumulative = self._tag_table(tags)
+
+            if len(indices) == 0:
+                raise Exception("no values of option \"{}\" match tags {}".format(self._key, sorted(tags)))
+
+            return indices[bisect_right(cumulative, rng.random() * cumulative[-1])]
+
+        if self._cumulative is None:
+            return rng.randint(0, self.value_count - 1)
+
+        # bisect_right skips zero weight values, which share their cumulative
+        # total with the value before them.
+        index = bisect_right(self._cumulative, rng.random() * self._cumulative[-1])
+        return min(index, self.value_count - 1)
+
+    def _tag_table(self, tags: frozenset) -> tuple[list[int], list[float]]:
+        table = self._tag_tables.get(tags)
+
+        if table is not None:
+            return table
+
+        indices = [
+            i for i in self.indices_with_tags(*tags)
+            if self._weights is None or self._weights[i] > 0
+        ]
+
+        # Tags whose values all have a weight of zero are valid, they only
+        # fail when a randomization actually asks for them.
+        table = (indices, self._cumulate(indices) if len(indices) > 0 else [])
+        self._tag_tables[tags] = table
+        return table
+
+    def _cumulate(self, indices) -> list[float]:
+        out = []
+        total = 0.0
+
+        for i in indices:
+            total += 1.0 if self._weights is None else self._weights[i]
+            out.append(total)
+
+        if total <= 0:
+            raise Exception("\"weights\" argument must contain at least one weight greater than zero")
+
+        return out
+
+    def _per_value(self, arg: list | dict, name: str) -> list:
+        if isinstance(arg, list):
+            if len(arg) != len(self._values):
+                raise Exception("\"{}\" list must be the same length as \"values\"".format(name))
+            return arg
+
+        if isinstance(arg, dict):
+            out = [None] * len(self._values)
+            for i, value in enumerate(self._values):
+                try:
+                    out[i] = arg.get(value)
+                except TypeError:
+                    pass
+            return out
+
+        raise Exception("\"{}\" argument must be a list or a dict".format(name))
+
+    def _compile_weights(self, weights: list | dict | None) -> list[float] | None:
+        if weights is None:
+            return None
+
+        out = []
+        for weight in self._per_value(weights, "weights"):
+            if weight is None:
+                weight = 1.0
+
+            if not isinstance(weight, (int, float)) or isinstance(weight, bool) or weight < 0:
+                raise Exception("\"weights\" argument must contain only non-negative numbers")
+
+            out.append(float(weight))
+
+        return out
+
+    def _compile_tags(self, tags: list | dict | None) -> dict[str, list[int]]:
+        index: dict[str, list[int]] = {}
+
+        if tags is None:
+            return index
+
+        for i, value_tags in enumerate(self._per_value(tags, "tags")):
+            if value_tags is None:
+                continue
+
+            if isinstance(value_tags, str) or not isinstance(value_tags, (list, tuple, set)):
+                raise Exception("\"tags\" argument must contain lists of tag strings")
+
+            for tag in value_tags:
+                if not isinstance(tag, str):
+                    raise Exception("\"tags\" argument must contain lists of tag strings")
+
+                indices = index.setdefault(tag, [])
+                if len(indices) == 0 or indices[-1] != i:
+                    indices.append(i)
+
+        return index
+
     def _clone(self):
         """
         Returns a copy of this SCListOption sans user state.
@@ -131,9 +433,23 @@ class SCListOption(SCOption):
             self._key,
             self._name,
             self._group,
-            self._values
+            self._values,
+            thumbnails=self._thumbnails,
+            store_by_value=self._store_by_value,
         )
         out._display_pattern = self._display_pattern
+
+        # The value list along with the weight and tag tables are never
+        # modified after construction so clones share them rather than
+        # rebuilding them.
+        out._values = self._values
+        out._weights = self._weights
+        out._cumulative = self._cumulative
+        out._tag_index = self._tag_index
+        out._tag_sets = self._tag_sets
+        out._tag_tables = self._tag_tables
+        out._index_of = self._index_of
+        out._unhashable = self._unhashable
         return out
 
     # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
@@ -142,6 +458,123 @@ class SCListOption(SCOption):
     #
     # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
 
+    def set_selection_index(self, index: int):
+        """
+        Selects the value at the given index in this option group.
+
+        Arguments
+        ---------
+        index : int
+            Index of the value to select.
+        """
+        if not isinstance(index, int):
+            raise Exception("\"index\" must be an int value")
+
+        if not 0 <= index < self.value_count:
+            raise Exception("\"index\" out of range for option \"{}\"".format(self._key))
+
+        self._req_state().set_selection(self._key, self._selection_for(index))
+
+    def index_of(self, value: any) -> int | None:
+        """
+        Returns the index of the given value in this option group.
+
+        Arguments
+        ---------
+        value : any
+            Value to look up.
+
+        Returns
+        -------
+        int | None
+            Index of the first occurrence of the value, or `None` if the value
+            is not part of this option group.
+        """
+        if self._paged:
+            return self._values.index_of(value)
+
+        try:
+            index = self._index_of.get(value)
+        except TypeError:
+            index = None
+
+        if index is not None:
+            return index
+
+        for i in self._unhashable:
+            if self._values[i] == value:
+                return i
+
+        return None
+
+    def set_selection_by_value(self, value: any):
+        """
+        Selects the given value in this option group.
+
+        Arguments
+        ---------
+        value : any
+            Value to select.  Must be one of this option group's values.
+        """
+        index = self.index_of(value)
+
+        if index is None:
+            raise Exception("value {!r} is not part of option \"{}\"".format(value, self._key))
+
+        self._req_state().set_selection(self._key, self._selection_for(index))
+
+    def indices_with_tags(self, *tags: str) -> list[int]:
+        """
+        Returns the indices of the values in this option group that have all
+        of the given tags.
+
+        Arguments
+        ---------
+        tags : str[]
+            One or more tags the values must have.
+
+        Returns
+        -------
+        int[]
+            Ascending list of the matching value indices.
+        """
+        if len(tags) == 0:
+            return list(range(len(self._values)))
+
+        if len(tags) == 1:
+            return [*self._tag_index.get(tags[0], [])]
+
+        indices = self._tag_sets.get(tags[0], frozenset())
+        for tag in tags[1:]:
+            indices = indices & self._tag_sets.get(tag, frozenset())
+
+        return sorted(indices)
+
+    def thumbnail(self, index: int) -> any:
+        """
+        Returns a thumbnail of the layer this option is attached to as it
+        would appear with the value at the given index selected.
+
+        Thumbnails are cached, keyed on the layer, the value, the current
+        selections of the other options on the same layer, and the state's
+        user variables, so browsing the values of an option only renders each
+        combination once.
+
+        Arguments
+        ---------
+        index : int
+            Index of the value to render a thumbnail for.
+
+        Returns
+        -------
+        Displayable
+            Thumbnail displayable for the target value.
+        """
+        if self._layer is None:
+            raise Exception("SCListOption \"{}\" is not attached to an SCLayer".format(self._key))
+
+        return self._layer._thumbnail(self._key, index, self._values[index])
+
     def inc_selection(self):
         """
         Increments the selection index for this option group, "selecting"
@@ -152,9 +585,9 @@ class SCListOption(SCOption):
         next = self.selection_index + 1
 
         if next < self.value_count:
-            self._state.set_selection(self._key, next)
+            self._state.set_selection(self._key, self._selection_for(next))
         else:
-            self._state.set_selection(self._key, 0)
+            self._state.set_selection(self._key, self._selection_for(0))
 
     def dec_selection(self):
         """
@@ -166,13 +599,21 @@ class SCListOption(SCOption):
         next = self.selection_index - 1
 
         if next < 0:
-            self._state.set_selection(self._key, self.value_count - 1)
+            self._state.set_selection(self._key, self._selection_for(self.value_count - 1))
         else:
-            self._state.set_selection(self._key, next)
+            self._state.set_selection(self._key, self._selection_for(next))
 
-    def randomize(self):
+    def randomize(self, *tags: str):
         """
         Selects a "random" option from this option group and records that
         selection in the user state.
+
+        Values are picked according to their weights.  If any tags are given,
+        only values having every one of the given tags may be picked.
+
+        Arguments
+        ---------
+        tags : str[]
+            Optional tags the picked value must have.
         """
-        self._state.set_selection(self._key, renpy.random.randint(0, self.value_count - 1))
+        self._state.set_selection(self._key, self._random_selection(renpy.random, frozenset(tags)))
@@ -1,3 +1,6 @@
+import renpy  # type: ignore
+
+from ..components.condition_ren import SCCondition
 from ..state.state_ren import SCState
 from ..utils.strings_ren import _require_key_string, _require_non_empty_string
 
@@ -5,6 +8,9 @@ from ..utils.strings_ren import _require_key_string, _require_non_empty_string
 init -2 python:
 """
 
+from typing import Callable
+
+
 # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
 #
 #   Enum Values
@@ -16,6 +22,7 @@ SC_OPTION_TYPE_VALUE_LIST = 0
 SC_OPTION_TYPE_TEXT_INPUT = 1
 SC_OPTION_TYPE_BOOLEAN = 2
 SC_OPTION_TYPE_COLOR = 3
+SC_OPTION_TYPE_RANGE = 4
 
 
 # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
@@ -30,7 +37,15 @@ class SCOption:
     Base type for Sprite Customizer option types.
     """
 
-    def __init__(self, key: str, name: str, group: str | None, option_type: int):
+    def __init__(
+        self,
+        key: str,
+        name: str,
+        group: str | None,
+        option_type: int,
+        visible_when: dict[str, any] | Callable[..., bool] | None = None,
+        enabled_when: dict[str, any] | Callable[..., bool] | None = None,
+    ):
         """
         Initializes the new SCOption instance with the given arguments.
 
@@ -48,6 +63,21 @@ class SCOption:
 
         option_type : int
             Option type indicator.
+
+        visible_when : dict | function | None
+            Optional rule deciding whether the option is shown by the sprite
+            customization screen.  Either a dict of required option values
+            keyed by option key, where a `set` matches any of its values, or
+            a function taking option values as keyword arguments and
+            returning a boolean.
+
+        enabled_when : dict | function | None
+            Optional rule, in the same form as `visible_when`, deciding
+            whether the option may be changed.  Disabled options are shown
+            but cannot be used.
+
+            Options that are hidden or disabled are skipped when the sprite is
+            randomized.
         """
 
         self._key = _require_key_string("key", key)
@@ -63,6 +93,10 @@ class SCOption:
 
         self._type = option_type
         self._state: SCState | None = None
+        self._layer = None
+        self._graph = None
+        self._visible_when = None if visible_when is None else SCCondition(visible_when)
+        self._enabled_when = None if enabled_when is None else SCCondition(enabled_when)
 
     # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
     #
@@ -100,7 +134,29 @@ class SCOption:
 
     @property
     def selection_value(self) -> any:
-        raise Exception("selection_value must be implemented by extending classes!")
+        return self._value_for(self._req_state())
+
+    @property
+    def is_visible(self) -> bool:
+        """
+        bool : Whether the option's `visible_when` rule, and the rules of any
+        options it depends on, are currently met.
+        """
+        if self._graph is None:
+            return True
+
+        return self._graph.is_visible(self._key, self._req_state())
+
+    @property
+    def is_enabled(self) -> bool:
+        """
+        bool : Whether the option's `enabled_when` rule, and the rules of any
+        options it depends on, are currently met.
+        """
+        if self._graph is None:
+            return True
+
+        return self._graph.is_enabled(self._key, self._req_state())
 
     # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
     #
@@ -111,6 +167,43 @@ class SCOption:
     def _set_state(self, state: SCState):
         self._state = state
 
+    def _set_layer(self, layer):
+        self._layer = layer
+
+    def _set_graph(self, graph):
+        self._graph = graph
+
+    def _value_for(self, state: SCState) -> any:
+        """
+        Looks up this option's selection value in the given state without
+        modifying that state.
+        """
+        raise Exception("_value_for must be implemented by extending classes!")
+
+    def _random_domain(self) -> list[tuple[any, any]] | None:
+        """
+        Returns every selection this option may be randomized to as a list of
+        `(selection, value)` pairs, where `selection` is what is stored in the
+        state and `value` is what layer providers receive.  Returns `None` if
+        the option's selections cannot be enumerated.
+        """
+        return None
+
+    def _random_weights(self) -> list[float] | None:
+        """
+        Returns the relative weight of each selection returned by
+        `_random_domain`, in the same order, or `None` if every selection is
+        equally likely.
+        """
+        return None
+
+    def _random_selection(self, rng) -> any:
+        """
+        Picks a random selection for this option using the given random
+        number generator, or returns `None` if the option is not randomizable.
+        """
+        return None
+
     def _req_state(self) -> SCState:
         if self._state is None:
             raise Exception("CustomizedSprite state is not yet set!  Did you forget to call `set_state`?")
@@ -136,5 +229,11 @@ class SCOption:
         """
         Extension point method for randomizable options to override and
         provide their own randomization logic.
+
+        By default, this records the selection returned by
+        `_random_selection`, if any.
         """
-        pass
+        selection = self._random_selection(renpy.random)
+
+        if selection is not None:
+            self._req_state().set_selection(self._key, selection)
@@ -0,0 +1,194 @@
+"""renpy
+init -1 python:
+"""
+
+from collections import OrderedDict
+from collections.abc import Sequence
+from typing import Callable
+
+
+class SCPagedValues:
+    """
+    # Sprite Customizer Paged Values
+
+    Lazily loaded value source for `SCListOption` instances with very large
+    value catalogs, such as DLC item lists.
+
+    Rather than holding every value in memory, the source knows only how many
+    values there are and how to load a range of them.  Values are loaded a
+    page at a time when first accessed, and only a small number of recently
+    used pages are kept resident.
+
+    ```python
+    SCListOption("outfit", "Outfit", "Body", SCPagedValues(5000, load_outfits))
+    ```
+    """
+
+    def __init__(
+        self,
+        count: int,
+        loader: Callable[[int, int], list[any]],
+        page_size: int = 100,
+        resident_pages: int = 4,
+        index_of: Callable[[any], int | None] | None = None,
+    ):
+        """
+        Initializes the new SCPagedValues instance with the given arguments.
+
+        Arguments
+        ---------
+        count : int
+            Total number of values in the source.
+
+        loader : callable
+            Function taking a start index and a stop index and returning the
+            list of values in that range, stop exclusive.
+
+        page_size : int
+            Number of values to load at a time.
+
+        resident_pages : int
+            Maximum number of loaded pages to keep in memory before the least
+            recently used page is dropped.
+
+        index_of : callable | None
+            Optional function taking a value and returning its index, or
+            `None` if the value is not part of the source.  When not given,
+            looking a value up scans the source page by page.
+        """
+        if not isinstance(count, int) or count < 0:
+            raise Exception('"count" must be a non-negative int value')
+
+        if not callable(loader):
+            raise Exception('"loader" must be callable')
+
+        if not isinstance(page_size, int) or page_size < 1:
+            raise Exception('"page_size" must be an int value greater than zero')
+
+        if not isinstance(resident_pages, int) or resident_pages < 1:
+            raise Exception('"resident_pages" must be an int value greater than zero')
+
+        if index_of is not None and not callable(index_of):
+            raise Exception('"index_of" must be callable')
+
+        self._count = count
+        self._loader = loader
+        self._page_size = page_size
+        self._resident_pages = resident_pages
+        self._index_of = index_of
+        self._pages: OrderedDict = OrderedDict()
+
+    @property
+    def has_index_of(self) -> bool:
+        """
+        Whether this source was given an `index_of` function, so looking a
+        value up does not have to scan the source.
+        """
+        return self._index_of is not None
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: int) -> any:
+        if not isinstance(index, int):
+            raise TypeError("SCPagedValues indices must be int values")
+
+        if index < 0:
+            index += self._count
+
+        if not 0 <= index < self._count:
+            raise IndexError("SCPagedValues index out of range")
+
+        page, offset = divmod(index, self._page_size)
+        return self._page(page)[offset]
+
+    def __iter__(self):
+        for page in range((self._count + self._page_size - 1) // self._page_size):
+            yield from self._page(page)
+
+    def index_of(self, value: any) -> int | None:
+        """
+        Returns the index of the given value, or `None` if it is not part of
+        this source.
+
+        Arguments
+        ---------
+        value : any
+            Value to look up.
+
+        Returns
+        -------
+        int | None
+            Index of the value.
+        """
+        if self._index_of is not None:
+            return self._index_of(value)
+
+        for i, candidate in enumerate(self):
+            if candidate == value:
+                return i
+
+        return None
+
+    def _page(self, page: int) -> list[any]:
+        try:
+            self._pages.move_to_end(page)
+            return self._pages[page]
+        except KeyError:
+            pass
+
+        start = page * self._page_size
+        stop = min(start + self._page_size, self._count)
+        values = list(self._loader(start, stop))
+
+        if len(values) != stop - start:
+            raise Exception("SCPagedValues loader returned {} values for range {}-{}".format(len(values), start, stop))
+
+        while len(self._pages) >= self._resident_pages:
+            self._pages.popitem(last=False)
+
+        self._pages[page] = values
+        return values
+
+
+class SCValuesView(Sequence):
+    """
+    # Sprite Customizer Values View
+
+    Read-only view over the values of an `SCListOption` backed by an
+    `SCPagedValues` source, returned by its `values` property so that reading
+    the values does not load every page.  Views compare equal to any sequence
+    holding the same values.
+    """
+
+    def __init__(self, values):
+        self._values = values
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._values[i] for i in range(*index.indices(len(self._values)))]
+
+        return self._values[index]
+
+    def __iter__(self):
+        return iter(self._values)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Sequence) or isinstance(other, str):
+            return NotImplemented
+
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    __hash__ = None
+
+    def copy(self) -> list[any]:
+        """
+        Returns a list of all the values, loading every page.
+        """
+        return list(self._values)
+
+    def __repr__(self) -> str:
+        return "SCValuesView({!r})".format(self._values)
@@ -0,0 +1,252 @@
+import renpy  # type: ignore
+from .option_ren import SCOption, SC_OPTION_TYPE_RANGE
+from ..state.state_ren import SCState
+
+"""renpy
+init -1 python:
+"""
+
+
+class SCRangeOption(SCOption):
+    """
+    Represents a numeric option whose value may be anywhere between a minimum
+    and a maximum, in increments of a fixed step.
+
+    This option is intended to be updated by a slider bar.
+
+    ```python
+    SCRangeOption("height", "Height", "Body", 0.9, 1.1, 0.05, default=1.0)
+    ```
+
+    Selections are stored as the integer number of steps above the minimum,
+    so the number of distinct values an option may take is bounded, and layer
+    providers always receive a value that falls exactly on a step.
+
+    **IMPORTANT**: This option type is state dependent and cannot be used on its
+    own, it **MUST** be registered to an SCLayer instance to be in any way
+    useful.
+    """
+
+    def __init__(
+        self,
+        key: str,
+        name: str,
+        group: str | None,
+        min: int | float,
+        max: int | float,
+        step: int | float = 1,
+        default: int | float | None = None,
+        **kwargs
+    ):
+        """
+        Initializes the new SCRangeOption instance with the given arguments.
+
+        Arguments
+        ---------
+        key : str
+            Key for this option.
+
+        name : str
+            Display name for this option.
+
+        group : str | None
+            Option group.  If this value is set to `None`, the `name` value will
+            be used as the group name.
+
+        min : int | float
+            Smallest value for this option.
+
+        max : int | float
+            Largest value for this option.  The distance between `min` and
+            `max` must be a whole number of steps.
+
+        step : int | float, optional
+            Distance between two neighbouring values.  Defaults to `1`.
+
+        default : int | float, optional
+            Value to use when no selection has yet been made by the user.  The
+            value is snapped to the nearest step.  Defaults to `min`.
+        """
+        super().__init__(key, name, group, SC_OPTION_TYPE_RANGE, **kwargs)
+
+        for arg, value in (("min", min), ("max", max), ("step", step)):
+            if not isinstance(value, (int, float)) or isinstance(value, bool):
+                raise Exception('"{}" must be an int or float value'.format(arg))
+
+        if max <= min:
+            raise Exception('"max" must be greater than "min"')
+
+        if step <= 0:
+            raise Exception('"step" must be greater than zero')
+
+        steps = (max - min) / step
+
+        if abs(steps - round(steps)) > 1e-6:
+            raise Exception('the distance between "min" and "max" must be a whole number of steps')
+
+        self._min = min
+        self._max = max
+        self._step = step
+        self._count = int(round(steps)) + 1
+
+        if default is None:
+            self._default = 0
+        elif isinstance(default, (int, float)) and not isinstance(default, bool):
+            self._default = self._index_of(default)
+        else:
+            raise Exception('"default" must be an int or float value')
+
+    # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+    #
+    #   Properties
+    #
+    # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    @property
+    def min(self) -> int | float:
+        """
+        Smallest value for this option.
+        """
+        return self._min
+
+    @property
+    def max(self) -> int | float:
+        """
+        Largest value for this option.
+        """
+        return self._max
+
+    @property
+    def step(self) -> int | float:
+        """
+        Distance between two neighbouring values of this option.
+        """
+        return self._step
+
+    @property
+    def step_count(self) -> int:
+        """
+        Number of distinct values this option may take.
+        """
+        return self._count
+
+    @property
+    def selection_index(self) -> int:
+        """
+        Number of steps the current selection is above the minimum.
+        """
+        return self._index_for(self._req_state())
+
+    @property
+    def selection_value(self) -> int | float:
+        """
+        The currently selected value for this option.
+        """
+        return self._value_for(self._req_state())
+
+    # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+    #
+    #   SC-Internal Methods
+    #
+    # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    def _clone(self):
+        out = SCRangeOption(self._key, self._name, self._group, self._min, self._max, self._step)
+        out._default = self._default
+        return out
+
+    def _index_for(self, state: SCState) -> int:
+        if state.has_selection(self._key):
+            return state.get_selection(self._key)
+
+        return self._default
+
+    def _value_for(self, state: SCState) -> int | float:
+        return self._value_at(self._index_for(state))
+
+    def _value_at(self, index: int) -> int | float:
+        value = self._min + index * self._step
+
+        # Rounding keeps float steps from drifting, so every selection of the
+        # same step gives exactly the same value.
+        return value if isinstance(value, int) else round(value, 9)
+
+    def _index_of(self, value: int | float) -> int:
+        index = int(round((value - self._min) / self._step))
+
+        if index < 0:
+            return 0
+
+        if index >= self._count:
+            return self._count - 1
+
+        return index
+
+    def _random_domain(self) -> list[tuple[any, any]]:
+        return [(i, self._value_at(i)) for i in range(self._count)]
+
+    def _random_selection(self, rng) -> int:
+        return rng.randint(0, self._count - 1)
+
+    # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+    #
+    #   Public Methods
+    #
+    # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    def set_selection_index(self, index: int):
+        """
+        Selects the value the given number of steps above the minimum.
+
+        Arguments
+        ---------
+        index : int
+            Step index of the value to select.
+        """
+        if not isinstance(index, int):
+            raise Exception('"index" must be an int value')
+
+        if not 0 <= index < self._count:
+            raise Exception('"index" out of range for option "{}"'.format(self._key))
+
+        self._req_state().set_selection(self._key, index)
+
+    def set_selection_value(self, value: int | float):
+        """
+        Selects the given value, snapped to the nearest step and clamped to
+        this option's range.
+
+        Arguments
+        ---------
+        value : int | float
+            Value to select.
+        """
+        if not isinstance(value, (int, float)) or isinstance(value, bool):
+            raise Exception('"value" must be an int or float value')
+
+        self._req_state().set_selection(self._key, self._index_of(value))
+
+    def inc_selection(self):
+        """
+        Moves the selection one step up, unless it is already at the maximum.
+        """
+        index = self.selection_index
+
+        if index < self._count - 1:
+            self._req_state().set_selection(self._key, index + 1)
+
+    def dec_selection(self):
+        """
+        Moves the selection one step down, unless it is already at the minimum.
+        """
+        index = self.selection_index
+
+        if index > 0:
+            self._req_state().set_selection(self._key, index - 1)
+
+    def randomize(self):
+        """
+        Selects a "random" step between the minimum and maximum and records
+        that selection in the user state.
+        """
+        self._req_state().set_selection(self._key, self._random_selection(renpy.random))
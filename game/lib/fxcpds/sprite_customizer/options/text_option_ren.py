@@ -1,9 +1,11 @@
 from .option_ren import SCOption, SC_OPTION_TYPE_TEXT_INPUT
+from ..state.state_ren import SCState
 
 """renpy
 init -1 python:
 """
 
+import re
 from typing import Callable
 
 
@@ -65,7 +67,7 @@ class SCTextOption(SCOption):
             **WARNING**: The max length is *NOT* enforced by this type, it must
             be enforced by the input when rendering this option.
         """
-        super().__init__(key, name, group, SC_OPTION_TYPE_TEXT_INPUT)
+        super().__init__(key, name, group, SC_OPTION_TYPE_TEXT_INPUT, **kwargs)
 
         if not isinstance(default, str):
             raise Exception('"default" must be a string')
@@ -84,6 +86,7 @@ class SCTextOption(SCOption):
 
         self._default = default
         self._current = None
+        self._current_base = None
         self._prefix = prefix
         self._suffix = suffix
         self._max_len = max_len
@@ -109,10 +112,7 @@ class SCTextOption(SCOption):
         """
         The current user selection value for this option.
         """
-        if not self._req_state().has_selection(self._key):
-            self._state.set_selection(self._key, self._default)
-
-        return self._state.get_selection(self._key)
+        return self._value_for(self._req_state())
 
     @property
     def current_value(self) -> str:
@@ -122,10 +122,14 @@ class SCTextOption(SCOption):
         before they attempted to "commit" their change to an option selection.
 
         This is primarily used by screen inputs to store the value as it is
-        being typed but before it is saved.
+        being typed but before it is saved.  Typed text is dropped once the
+        selection it was typed over changes, such as when a change is undone.
         """
-        if self._current is None:
-            self._current = self.selection_value
+        selection = self.selection_value
+
+        if self._current is None or self._current_base != selection:
+            self._current = selection
+            self._current_base = selection
 
         return self._current
 
@@ -189,6 +193,19 @@ class SCTextOption(SCOption):
     #
     # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
 
+    def _value_for(self, state: SCState) -> str:
+        if state.has_selection(self._key):
+            return state.get_selection(self._key)
+
+        return self._default
+
+    def _set_state(self, state: SCState):
+        # Text typed against another state, such as an edit session that was
+        # committed or discarded, is dropped.
+        super()._set_state(state)
+        self._current = None
+        self._current_base = None
+
     def _clone(self):
         return SCTextOption(
             self._key,
@@ -210,7 +227,7 @@ class SCTextOption(SCOption):
         """
         Commits the `current_value` of this option to the user selections.
         """
-        self._req_state().set_selection(self._key, self._current)
+        self._req_state().set_selection(self._key, self.current_value)
 
     def set_value(self, value: str):
         """
@@ -224,6 +241,7 @@ class SCTextOption(SCOption):
         if not isinstance(value, str):
             raise Exception("value must be a string")
 
+        self._current_base = self.selection_value
         self._current = value
 
 
@@ -239,6 +257,16 @@ class SCValidatableTextOption(SCTextOption):
     SCValidatableTextOption("my_option", "My Option", "My Group", validator_func, "default value")
     ```
 
+    The validator may also be given as a regular expression, which is compiled
+    once and must match the whole value.
+
+    ```python
+    SCValidatableTextOption("my_option", "My Option", "My Group", r"[a-z]{1,12}")
+    ```
+
+    Validation results are remembered for the current value and are only
+    recomputed when the value changes.
+
     **IMPORTANT**: This option type is state dependent and cannot be used on its
     own, it **MUST** be registered to an SCLayer instance to be in any way
     useful.
@@ -248,7 +276,7 @@ class SCValidatableTextOption(SCTextOption):
         key: str,
         name: str,
         group: str | None,
-        validator: Callable[[str], bool],
+        validator: Callable[[str], bool] | str | re.Pattern,
         default: str = "",
         autocommit: bool = False,
         prefix: str | None = None,
@@ -272,10 +300,11 @@ class SCValidatableTextOption(SCTextOption):
             Option group.  If this value is set to `None`, the `name` value will
             be used as the group name.
 
-        validator : callable
+        validator : callable | str | re.Pattern
             A function that should take a string value as its single argument
             and return a boolean flag indicating whether the given value was
-            valid.
+            valid, or a regular expression that valid values must match in
+            full.
 
             See `sc_validator_hex_color`.
 
@@ -303,8 +332,15 @@ class SCValidatableTextOption(SCTextOption):
         """
         super().__init__(key, name, group, default, prefix, suffix, max_len, **kwargs)
 
-        if not callable(validator):
-            raise Exception("validator must be callable")
+        if isinstance(validator, str):
+            validator = re.compile(validator)
+
+        if isinstance(validator, re.Pattern):
+            self._pattern = validator
+        elif callable(validator):
+            self._pattern = None
+        else:
+            raise Exception("validator must be callable or a regular expression")
 
         if not isinstance(autocommit, bool):
             raise Exception("autocommit must be a boolean value")
@@ -312,6 +348,10 @@ class SCValidatableTextOption(SCTextOption):
         self._validator = validator
         self._autocommit = autocommit
 
+        # Value the cached validation result belongs to.
+        self._validated = None
+        self._valid = False
+
     # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
     #
     #   Properties
@@ -324,10 +364,21 @@ class SCValidatableTextOption(SCTextOption):
         Whether the `current_value` of this option is valid against the given
         validation function.
         """
-        out = self._validator(self.current_value)
+        value = self.current_value
 
-        if not isinstance(out, bool):
-            raise Exception("SCValidatableTextOption validator returned a non-boolean value")
+        if value is self._validated or value == self._validated:
+            return self._valid
+
+        if self._pattern is not None:
+            out = self._pattern.fullmatch(value) is not None
+        else:
+            out = self._validator(value)
+
+            if not isinstance(out, bool):
+                raise Exception("SCValidatableTextOption validator returned a non-boolean value")
+
+        self._validated = value
+        self._valid = out
 
         return out
 
@@ -369,14 +420,19 @@ class SCValidatableTextOption(SCTextOption):
         Sets the `current_value` of this option to the given value.
 
         Additionally, if `autocommit` is `True` and the given value is valid, it
-        will be automatically committed to the user selections.
+        will be automatically committed to the user selections.  Values equal
+        to the current value or to the already committed selection are neither
+        re-validated nor re-committed.
 
         Arguments
         ---------
         value : str
             New current value to set.
         """
+        if value == self.current_value:
+            return
+
         super().set_value(value)
 
-        if self._autocommit and self.is_valid:
+        if self._autocommit and self.is_valid and value != self.selection_value:
             super().commit_to_selection()
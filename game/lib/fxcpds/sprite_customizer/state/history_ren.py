@@ -0,0 +1,292 @@
+"""renpy
+init -1 python:
+"""
+
+from contextlib import contextmanager
+
+
+class _SCUnsetSelection:
+    """
+    Marker recorded in history entries for selections that did not exist
+    before, or after, a change.
+    """
+    pass
+
+
+class SCHistory:
+    """
+    # Sprite Customizer History
+
+    Undo/redo history for the selections of an `SCState` instance.
+
+    The history is a journal of changes rather than a series of snapshots.
+    Each entry records only the key that changed along with its old and new
+    values, so memory use grows with the number of edits made rather than
+    with the size of the state.  Changes made inside a batch are grouped
+    into a single entry that is undone or redone as one step, and continuous
+    changes made inside a `merging` block, such as the positions of a
+    slider drag, are folded into a single step.
+
+    Histories are created via `SCState.start_history`.
+
+    ```python
+    history = my_sprite_state.start_history(50)
+    ...
+    history.undo()
+    ```
+    """
+
+    def __init__(self, state, limit: int = 100):
+        """
+        Initializes the new SCHistory instance.
+
+        Arguments
+        ---------
+        state : SCState
+            State whose selection changes will be recorded.
+
+        limit : int
+            Maximum number of undo steps to keep.  When the limit is reached,
+            the oldest steps are forgotten.
+        """
+        if not isinstance(limit, int) or limit < 1:
+            raise Exception('"limit" must be an int value greater than zero')
+
+        self._state = state
+        self._limit = limit
+        self._steps: list[list[tuple[str, any, any]]] = []
+        self._position = 0
+        self._batch: list[tuple[str, any, any]] | None = None
+        self._batch_depth = 0
+        self._applying = False
+        self._merging = False
+
+        # Key of the last step if continuous changes to that key may still be
+        # folded into it.
+        self._open_key: str | None = None
+
+    # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+    #
+    #   Properties
+    #
+    # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    @property
+    def limit(self) -> int:
+        """
+        Maximum number of undo steps kept by this history.
+        """
+        return self._limit
+
+    @property
+    def length(self) -> int:
+        """
+        Number of steps currently recorded, including steps that have been
+        undone and may be redone.
+        """
+        return len(self._steps)
+
+    @property
+    def position(self) -> int:
+        """
+        Number of recorded steps that are currently applied to the state.
+        """
+        return self._position
+
+    @property
+    def can_undo(self) -> bool:
+        """
+        Whether there is a step that may be undone.
+        """
+        return self._position > 0
+
+    @property
+    def can_redo(self) -> bool:
+        """
+        Whether there is an undone step that may be redone.
+        """
+        return self._position < len(self._steps)
+
+    # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+    #
+    #   Public Methods
+    #
+    # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    def undo(self):
+        """
+        Reverts the most recently applied step, if any.
+        """
+        if not self.can_undo:
+            return
+
+        self._open_key = None
+        self._position -= 1
+        self._apply(reversed(self._steps[self._position]), 1)
+
+    def redo(self):
+        """
+        Reapplies the most recently undone step, if any.
+        """
+        if not self.can_redo:
+            return
+
+        self._open_key = None
+        self._apply(self._steps[self._position], 2)
+        self._position += 1
+
+    def jump(self, position: int):
+        """
+        Undoes or redoes steps until the given number of steps are applied.
+
+        Only the changes recorded in the steps between the current position
+        and the target position are touched.
+
+        Arguments
+        ---------
+        position : int
+            Target position, between `0` (nothing applied) and `length`
+            (everything applied), inclusive.
+        """
+        if not isinstance(position, int) or not 0 <= position <= len(self._steps):
+            raise Exception('"position" must be an int between 0 and the history length (inclusive)')
+
+        while self._position > position:
+            self.undo()
+
+        while self._position < position:
+            self.redo()
+
+    def begin_batch(self):
+        """
+        Starts grouping changes into a single step.  Batches may be nested,
+        in which case the step is recorded when the outermost batch ends.
+        """
+        if self._batch_depth == 0:
+            self._batch = []
+
+        self._batch_depth += 1
+
+    def end_batch(self):
+        """
+        Ends the current batch, recording the grouped changes as one step.
+        """
+        if self._batch_depth == 0:
+            raise Exception("end_batch called without a matching begin_batch")
+
+        self._batch_depth -= 1
+
+        if self._batch_depth == 0:
+            batch = self._batch
+            self._batch = None
+
+            if len(batch) > 0:
+                self._push(batch)
+
+    @contextmanager
+    def batch(self):
+        """
+        Context manager grouping all the changes made inside it into a single
+        step.
+
+        ```python
+        with history.batch():
+            my_sprite.randomize()
+        ```
+        """
+        self.begin_batch()
+        try:
+            yield self
+        finally:
+            self.end_batch()
+
+    @contextmanager
+    def merging(self):
+        """
+        Context manager for continuous changes, such as the positions of a
+        slider or color picker drag.  A change made inside it to the same key
+        as the last step, when that step was also made inside a `merging`
+        block, is folded into that step rather than recorded as a new one.
+
+        Call `end_merge` when the drag ends so the next drag starts a new
+        step.
+
+        ```python
+        with history.merging():
+            option.set_selection(value)
+        ```
+        """
+        self._merging = True
+        try:
+            yield self
+        finally:
+            self._merging = False
+
+    def end_merge(self):
+        """
+        Ends the current run of continuous changes, so that the next change
+        is recorded as a new step.
+        """
+        self._open_key = None
+
+    def clear(self):
+        """
+        Forgets all recorded steps.
+        """
+        self._steps.clear()
+        self._position = 0
+        self._open_key = None
+
+    # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+    #
+    #   Internal Methods
+    #
+    # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # # #
+
+    def _record(self, key: str, old: any, new: any):
+        if self._applying or old is new:
+            return
+
+        try:
+            if old == new:
+                return
+        except Exception:
+            pass
+
+        if self._batch is not None:
+            self._batch.append((key, old, new))
+            return
+
+        if self._merging and self._open_key == key and self._position == len(self._steps):
+            # Keep the value from before the drag started as the old value.
+            self._steps[-1] = [(key, self._steps[-1][0][1], new)]
+            return
+
+        self._push([(key, old, new)])
+        self._open_key = key if self._merging else None
+
+    def _push(self, step: list[tuple[str, any, any]]):
+        # Recording a new step drops any steps that were undone.
+        del self._steps[self._position:]
+        self._open_key = None
+
+        self._steps.append(step)
+
+        if len(self._steps) > self._limit:
+            del self._steps[0]
+        else:
+            self._position += 1
+
+    def _apply(self, entries, field: int):
+        self._applying = True
+
+        try:
+            for entry in entries:
+                value = entry[field]
+
+                if value is _SCUnsetSelection:
+                    self._state._clear_selection(entry[0])
+                else:
+                    self._state.set_selection(entry[0], value)
+        finally:
+            self._applying = False
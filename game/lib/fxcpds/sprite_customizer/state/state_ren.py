@@ -1,3 +1,5 @@
+from .history_ren import SCHistory, _SCUnsetSelection
+
 """renpy
 init -1 python:
 """
@@ -17,6 +19,11 @@ class SCState:
     my_sprite.set_state(my_sprite_state)
     ```
     """
+
+    # Declared on the class so states loaded from saves made before histories
+    # existed still have the attribute.
+    _history = None
+
     def __init__(self, selections: dict | None = None, user_state: dict | None = None):
         """
         Initializes the new, blank SCState instance.
@@ -112,6 +119,9 @@ class SCState:
         value : any
             Value to set.
         """
+        if self._history is not None:
+            self._history._record(key, self._own_selection(key), value)
+
         self._selections[key] = value
 
     def has_selection(self, key: str) -> bool:
@@ -147,3 +157,135 @@ class SCState:
             Whether the state contains the target user variable.
         """
         return key in self._user_state
+
+    @property
+    def history(self) -> SCHistory | None:
+        """
+        The undo/redo history recording this state's selection changes, if
+        one has been started.
+        """
+        return self._history
+
+    def start_history(self, limit: int = 100) -> SCHistory:
+        """
+        Starts recording this state's selection changes into an undo/redo
+        history.  If a history has already been started, it is returned.
+
+        ```python
+        history = my_sprite_state.start_history()
+        ...
+        history.undo()
+        ```
+
+        Arguments
+        ---------
+        limit : int
+            Maximum number of undo steps to keep.
+
+        Returns
+        -------
+        SCHistory
+            The history recording this state's changes.
+        """
+        if self._history is None:
+            self._history = SCHistory(self, limit)
+
+        return self._history
+
+    def stop_history(self):
+        """
+        Stops recording selection changes and forgets the recorded history.
+        """
+        self._history = None
+
+    def _clear_selection(self, key: str):
+        self._selections.pop(key, None)
+
+    def _own_selection(self, key: str) -> any:
+        """
+        Returns the selection held by this state itself for the given key, or
+        `_SCUnsetSelection` if it holds none.  This is the value history
+        entries restore when a change is undone.
+        """
+        return self._selections.get(key, _SCUnsetSelection)
+
+    def _variables(self) -> dict:
+        return self._user_state
+
+
+class SCStagedState(SCState):
+    """
+    # Sprite Customizer Staged State
+
+    A copy-on-write state layered over another `SCState` instance.
+
+    Reads fall through to the base state for any key that has not been set on
+    the staged state, while writes only ever touch the staged state.  This
+    makes creating a staged state O(1) regardless of how many selections the
+    base state holds, as nothing is copied until it is changed.
+
+    Staged changes are written to the base state by `_commit`, or thrown away
+    by simply dropping the staged state.
+
+    ```python
+    staged = SCStagedState(my_sprite_state)
+    ```
+    """
+    def __init__(self, base: SCState):
+        """
+        Initializes the new, empty SCStagedState instance.
+
+        Arguments
+        ---------
+        base : SCState
+            State that reads will fall through to and that staged changes
+            will be committed to.
+        """
+        if not isinstance(base, SCState):
+            raise Exception("SCStagedState base argument must be an SCState instance.")
+
+        super().__init__()
+        self._base = base
+
+    @property
+    def base(self) -> SCState:
+        """
+        The state this staged state is layered over.
+        """
+        return self._base
+
+    def get_variable(self, key: str) -> any:
+        if key in self._user_state:
+            return self._user_state[key]
+
+        return self._base.get_variable(key)
+
+    def get_selection(self, key: str) -> any:
+        if key in self._selections:
+            return self._selections[key]
+
+        return self._base.get_selection(key)
+
+    def has_selection(self, key: str) -> bool:
+        return key in self._selections or self._base.has_selection(key)
+
+    def has_variable(self, key: str) -> bool:
+        return key in self._user_state or self._base.has_variable(key)
+
+    def _variables(self) -> dict:
+        if len(self._user_state) == 0:
+            return self._base._variables()
+
+        out = self._base._variables().copy()
+        out.update(self._user_state)
+        return out
+
+    def _commit(self):
+        for key, value in self._selections.items():
+            self._base.set_selection(key, value)
+
+        for key, value in self._user_state.items():
+            self._base.set_variable(key, value)
+
+        self._selections.clear()
+        self._user_state.clear()
@@ -2,22 +2,11 @@
 init -1 python:
 """
 
+import re
 
-def _sc_validator_hex_color_char(c: str) -> bool:
-    """
-    Tests whether the given character is a valid hex digit.
-
-    Arguments
-    ---------
-    c : str
-        Character to test.
 
-    Returns
-    -------
-    bool
-        Whether the given character was a valid hex digit.
-    """
-    return '0' <= c <= '9' or 'a' <= c <= 'f' or 'A' <= c <= 'F'
+# Matches "#rgb", "#rrggbb", and "#rrggbbaa" hex color strings.
+_sc_hex_color_pattern = re.compile(r"#(?:[0-9a-fA-F]{3}|[0-9a-fA-F]{6}|[0-9a-fA-F]{8})")
 
 
 def sc_validator_hex_color(text: str) -> bool:
@@ -38,16 +27,4 @@ def sc_validator_hex_color(text: str) -> bool:
     if not isinstance(text, str):
         return False
 
-    l = len(text)
-
-    if not (l == 4 or l == 7 or l == 9):
-        return False
-
-    if not text.startswith("#"):
-        return False
-
-    for i in range(1, l):
-        if not _sc_validator_hex_color_char(text[i]):
-            return False
-
-    return True
+    return _sc_hex_color_pattern.fullmatch(text) is not None